@@ -0,0 +1,96 @@
+"""Benchmark frontmatter parsing on large profiles.
+
+Compares the original approach (read the whole profile, split it and parse
+with the pure-Python ``yaml.safe_load``) against ``read_frontmatter``, which
+stops reading at the closing delimiter and uses libyaml when available.
+
+Usage:
+    python benchmarks/bench_frontmatter.py [--files 200] [--body-kb 512]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gitfam.frontmatter import read_frontmatter, SafeLoader  # noqa: E402
+
+FRONTMATTER = """---
+name: Margaret Smith
+birth_date: 1921-04-12
+birth_place: Columbus, Ohio
+current_residence: Dayton, Ohio
+relationships:
+  - type: child_of
+    person: john-smith-1890
+  - type: spouse_of
+    person: robert-jones-1919
+major_events:
+  - date: 1940-06-01
+    event: Graduated high school
+  - date: 1942-09-15
+    event: Married Robert
+interviews:
+  - date: 2024-11-05
+    topics: [childhood, career, family, advice]
+    video_files: [interview-part1.mp4, interview-part2.mp4]
+    notes_file: interview-2024-11-05.md
+---
+"""
+
+
+def baseline_parse(path: Path):
+    """The original parse: whole file, str.split and pure-Python YAML."""
+    content = path.read_text(encoding='utf-8')
+    parts = content.split('---', 2)
+    return yaml.safe_load(parts[1]) or {}
+
+
+def write_profiles(directory: Path, count: int, body_kb: int):
+    paragraph = "Transcript: " + "we talked about the farm and the winters. " * 24 + "\n\n"
+    body = "# Margaret Smith\n\n" + paragraph * max(1, (body_kb * 1024) // len(paragraph))
+    paths = []
+    for i in range(count):
+        path = directory / f"profile-{i}.md"
+        path.write_text(FRONTMATTER + body, encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def time_per_file(parse, paths, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            parse(path)
+        best = min(best, time.perf_counter() - start)
+    return best / len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--body-kb', type=int, default=512)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_profiles(Path(tmp), args.files, args.body_kb)
+        assert baseline_parse(paths[0]) == read_frontmatter(paths[0])
+
+        before = time_per_file(baseline_parse, paths, args.repeat)
+        after = time_per_file(read_frontmatter, paths, args.repeat)
+
+    print(f"{args.files} profiles, ~{args.body_kb} KB body each, YAML loader: {SafeLoader.__name__}")
+    print(f"  before (read all + split + safe_load): {before * 1e6:10.1f} us/file")
+    print(f"  after  (read_frontmatter):             {after * 1e6:10.1f} us/file")
+    print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
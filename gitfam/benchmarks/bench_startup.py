@@ -0,0 +1,88 @@
+"""Check CLI startup time and that commands only import what they need.
+
+Runs ``gitfam --version`` and ``gitfam --help`` in fresh interpreters and
+fails if the best time is over the budget, or if loading the CLI or running
+``gitfam metadata`` pulls in a heavy library that only other commands use.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 200] [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that only some commands need
+HEAVY_MODULES = ['jinja2', 'markdown', 'pygments', 'questionary', 'prompt_toolkit', 'numpy', 'PIL', 'yaml']
+
+# (what runs, code to run, heavy modules it is allowed to load)
+IMPORT_CHECKS = [
+    ('import gitfam.cli', 'import gitfam.cli', []),
+    ('gitfam metadata', "from gitfam.cli import main; main(['metadata', '--format', 'json', '-o', '-'], "
+                        "standalone_mode=False)", ['yaml']),
+]
+
+
+def environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get('PYTHONPATH')]))
+    return env
+
+
+def best_time(args, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'gitfam.cli'] + args, env=environment(),
+                       capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def loaded_heavy_modules(code: str, cwd: str) -> list:
+    report = f"; import sys; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules), file=sys.stderr)"
+    result = subprocess.run([sys.executable, '-c', code + report], env=environment(), cwd=cwd,
+                            capture_output=True, text=True, check=True)
+    return result.stderr.strip().splitlines()[-1].split() if result.stderr.strip() else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    for command in (['--version'], ['--help']):
+        elapsed = best_time(command, args.repeat) * 1000
+        over = elapsed > args.budget_ms
+        print(f"  gitfam {command[0]:<10} {elapsed:7.1f} ms{'  OVER BUDGET' if over else ''}")
+        if over:
+            failures.append(f"gitfam {command[0]} took {elapsed:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    with tempfile.TemporaryDirectory() as project:
+        member = Path(project) / 'families' / 'smith' / 'members' / 'john-smith-1900'
+        member.mkdir(parents=True)
+        (member / 'profile.md').write_text('---\nname: John Smith\nbirth_date: 1900\n---\n', encoding='utf-8')
+        for label, code, allowed in IMPORT_CHECKS:
+            loaded = loaded_heavy_modules(code, project)
+            unexpected = [name for name in loaded if name not in allowed]
+            print(f"  {label:<17} loads: {', '.join(loaded) or 'nothing heavy'}"
+                  f"{'  NOT ALLOWED: ' + ', '.join(unexpected) if unexpected else ''}")
+            if unexpected:
+                failures.append(f"{label} imports {', '.join(unexpected)}")
+
+    if failures:
+        print('\n' + '\n'.join(failures))
+        sys.exit(1)
+    print("\nStartup within budget")
+
+
+if __name__ == '__main__':
+    main()
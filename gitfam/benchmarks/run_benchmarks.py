@@ -0,0 +1,216 @@
+"""Benchmark scanning, metadata export and site builds on synthetic archives.
+
+For each archive size a synthetic archive is generated (see
+``synthetic_archive.py``) and these phases are timed, each as the best of
+``--repeat`` runs:
+
+- ``scan_cold`` / ``scan_warm``: refresh the family index without and with
+  its cache in ``.gitfam/index``
+- ``metadata_json`` / ``metadata_ndjson`` / ``metadata_sqlite``: ``gitfam
+  metadata`` in each format (sqlite starts from an empty database)
+- ``site_cold``: ``gitfam generate-website`` with no previous output or caches
+- ``site_noop``: a rebuild with nothing changed
+- ``site_one_edit``: a rebuild after one profile was edited
+
+Results are written as JSON. With ``--baseline`` they are compared against
+an earlier results file and the script exits with status 1 if any phase is
+slower by more than ``--threshold`` (and by more than ``--min-delta``
+seconds, so tiny timings do not flag noise).
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 100,10000,100000] [--repeat 3] [--jobs 1]
+        [--workdir DIR] [--output results.json] [--baseline baseline.json] [--threshold 0.25]
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from rich.console import Console
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gitfam import __version__  # noqa: E402
+from gitfam.commands import build_web, generate_metadata  # noqa: E402
+from gitfam.family_index import FamilyIndex  # noqa: E402
+from synthetic_archive import generate_archive  # noqa: E402
+
+PHASES = ['scan_cold', 'scan_warm', 'metadata_json', 'metadata_ndjson', 'metadata_sqlite',
+          'site_cold', 'site_noop', 'site_one_edit']
+
+
+def silence_gitfam():
+    """Quiet the rich consoles of every loaded gitfam module."""
+    for name, module in list(sys.modules.items()):
+        if name.startswith('gitfam'):
+            for value in vars(module).values():
+                if isinstance(value, Console):
+                    value.quiet = True
+
+
+def branch_count(members: int) -> int:
+    """Branches for an archive size: 5 for 100 members, 50 for 10k, 158 for 100k."""
+    return max(1, round(math.sqrt(members) / 2))
+
+
+def prepare_archive(workdir: Path, members: int, seed: int) -> Path:
+    """A synthetic archive of ``members`` members, reused if ``workdir`` already holds one."""
+    root = workdir / f'archive-{members}'
+    params_path = root / 'synthetic-archive.json'
+    if params_path.exists():
+        params = json.loads(params_path.read_text(encoding='utf-8'))
+        if params.get('members') == members and params.get('seed') == seed:
+            return root
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    print(f"Generating {members} members...", flush=True)
+    generate_archive(root, branches=branch_count(members), members=members, seed=seed)
+    return root
+
+
+def remove(*paths: Path):
+    for path in paths:
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+
+def edit_one_profile(root: Path):
+    """Append a line to the first profile, as an edit between builds would."""
+    branch = sorted((root / 'families').iterdir())[0]
+    member = sorted((branch / 'members').iterdir())[0]
+    with open(member / 'profile.md', 'a', encoding='utf-8') as f:
+        f.write(f'\nEdited at {time.time()}\n')
+
+
+def benchmark_phases(root: Path, jobs: int):
+    """``(name, setup, action)`` for each phase; only ``action`` is timed."""
+    cache = root / '.gitfam'
+    site = root / 'web'
+    metadata = root / 'metadata'
+    metadata.mkdir(exist_ok=True)
+
+    def nothing():
+        pass
+
+    def build_site():
+        build_web.generate_static_site(site, jobs=jobs)
+
+    return [
+        ('scan_cold', lambda: remove(cache / 'index'), lambda: FamilyIndex(root / 'families').refresh()),
+        ('scan_warm', nothing, lambda: FamilyIndex(root / 'families').refresh()),
+        ('metadata_json', nothing,
+         lambda: generate_metadata.generate_metadata('json', output=str(metadata / 'family-metadata.json'))),
+        ('metadata_ndjson', nothing,
+         lambda: generate_metadata.generate_metadata('ndjson', output=str(metadata / 'family-metadata.ndjson'))),
+        ('metadata_sqlite', lambda: remove(metadata / 'family-metadata.sqlite'),
+         lambda: generate_metadata.generate_metadata('sqlite', output=str(metadata / 'family-metadata.sqlite'))),
+        ('site_cold', lambda: remove(site, cache / 'cache'), build_site),
+        ('site_noop', nothing, build_site),
+        ('site_one_edit', lambda: edit_one_profile(root), build_site),
+    ]
+
+
+def run_size(workdir: Path, members: int, repeat: int, jobs: int, seed: int) -> dict:
+    root = prepare_archive(workdir, members, seed)
+    timings = {}
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        for name, setup, action in benchmark_phases(root, jobs):
+            best = float('inf')
+            for _ in range(repeat):
+                setup()
+                start = time.perf_counter()
+                action()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = round(best, 4)
+            print(f"  {members:>7} members  {name:<16} {best:9.3f}s", flush=True)
+    finally:
+        os.chdir(previous)
+    return {'members': members, 'branches': branch_count(members), 'phases': timings}
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list:
+    """Print current against baseline timings and return the regressed ``(size, phase)`` pairs."""
+    regressions = []
+    print(f"\n{'size':>7}  {'phase':<16} {'baseline':>9} {'current':>9} {'change':>8}")
+    for size, current in results['results'].items():
+        before = baseline.get('results', {}).get(size)
+        if not before:
+            continue
+        for phase, seconds in current['phases'].items():
+            old = before['phases'].get(phase)
+            if old is None:
+                continue
+            change = (seconds - old) / old if old else 0.0
+            regressed = change > threshold and seconds - old > min_delta
+            marker = '  REGRESSION' if regressed else ''
+            print(f"{size:>7}  {phase:<16} {old:8.3f}s {seconds:8.3f}s {change:+7.0%}{marker}")
+            if regressed:
+                regressions.append((size, phase))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='100,10000,100000', help='Comma-separated member counts')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--jobs', type=int, default=1, help='Render processes for site builds')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workdir', type=Path, help='Keep generated archives here between runs')
+    parser.add_argument('--output', type=Path, default=Path('benchmark-results.json'))
+    parser.add_argument('--baseline', type=Path, help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown, 0.25 = 25%%')
+    parser.add_argument('--min-delta', type=float, default=0.05, help='Ignore slowdowns under this many seconds')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8')) if args.baseline else None
+    silence_gitfam()
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'gitfam_version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': args.repeat,
+        'jobs': args.jobs,
+        'results': {},
+    }
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        workdir = contextlib.nullcontext(str(args.workdir))
+    else:
+        workdir = tempfile.TemporaryDirectory()
+    with workdir as directory:
+        for members in sizes:
+            results['results'][str(members)] = run_size(Path(directory).resolve(), members,
+                                                         args.repeat, args.jobs, args.seed)
+
+    args.output.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+    print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print(f"\n{len(regressions)} regression{'s' if len(regressions) != 1 else ''} "
+                  f"over {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == '__main__':
+    main()
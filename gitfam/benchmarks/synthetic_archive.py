@@ -0,0 +1,166 @@
+"""Generate a synthetic family archive for benchmarks.
+
+Writes ``families/<branch>/members/<slug>/`` folders in the same layout as
+``gitfam add-member``: a profile with frontmatter and a biography, a README,
+and empty or filled ``photos/``, ``interviews/videos/`` and ``documents/``
+directories. The archive is deterministic for a given seed.
+
+Usage:
+    python benchmarks/synthetic_archive.py OUTPUT_DIR [--branches 10] [--members 1000]
+        [--paragraphs 5] [--relationship-density 0.8] [--photo-ratio 0.3]
+        [--video-ratio 0.1] [--video-kb 64] [--seed 1]
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gitfam.commands.add_member import member_slug, readme_content, yaml_value  # noqa: E402
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+GIVEN_NAMES = [
+    'Margaret', 'John', 'Mary', 'William', 'Elizabeth', 'James', 'Anna', 'Thomas', 'Helen', 'George',
+    'Ruth', 'Robert', 'Dorothy', 'Charles', 'Frances', 'Joseph', 'Alice', 'Edward', 'Rose', 'Henry',
+]
+SURNAMES = [
+    'Smith', 'Jones', 'Walsh', 'Garcia', 'Murphy', 'Novak', 'Fischer', 'Rossi', 'Kowalski', 'Brennan',
+    'Olsen', 'Duarte', 'Keller', 'Moreau', 'Lindqvist', 'Okafor', 'Tanaka', 'Horvat', 'Byrne', 'Silva',
+]
+PLACES = [
+    'Columbus, Ohio', 'Dublin, Ireland', 'Chicago, Illinois', 'Krakow, Poland', 'Lisbon, Portugal',
+    'Dayton, Ohio', 'Boston, Massachusetts', 'Naples, Italy', 'Toronto, Ontario', 'Cork, Ireland',
+]
+EVENTS = ['Graduated high school', 'Married', 'Moved to a new city', 'Started a business', 'Retired']
+TOPICS = ['childhood', 'career', 'family', 'advice', 'migration', 'war', 'faith']
+PARAGRAPH = ("We talked about the farm, the long winters and the trip across the ocean. "
+             "There were stories about cousins, letters that took months to arrive and a "
+             "kitchen that was always full on Sundays. ")
+
+
+def dummy_photo() -> bytes:
+    """A small valid JPEG when Pillow is installed, otherwise placeholder bytes."""
+    if Image is None:
+        return b'\xff\xd8\xff\xe0' + b'\0' * 2048
+    buffer = io.BytesIO()
+    Image.new('RGB', (640, 480), (120, 90, 60)).save(buffer, 'JPEG', quality=80)
+    return buffer.getvalue()
+
+
+def profile_text(name: str, birth_date: str, place: str, relationships, events, interviews,
+                 paragraphs: int) -> str:
+    lines = ['---', f'name: {yaml_value(name)}', f'birth_date: {yaml_value(birth_date)}',
+             f'birth_place: {yaml_value(place)}', 'current_residence: ', 'relationships:']
+    for rel_type, person in relationships:
+        lines += [f'  - type: {rel_type}', f'    person: {person}']
+    lines.append('major_events:')
+    for event_date, event in events:
+        lines += [f'  - date: {event_date}', f'    event: {event}']
+    lines.append('interviews:')
+    for interview_date, topics, videos in interviews:
+        lines += [f'  - date: {interview_date}', f"    topics: [{', '.join(topics)}]"]
+        if videos:
+            lines.append(f"    video_files: [{', '.join(videos)}]")
+    lines += ['---', '', f'# {name}', '', '## Biography', '']
+    lines += [PARAGRAPH * 3 + '\n' for _ in range(paragraphs)]
+    return '\n'.join(lines) + '\n'
+
+
+def generate_archive(root: Path, branches: int = 10, members: int = 1000, paragraphs: int = 5,
+                     relationship_density: float = 0.8, photo_ratio: float = 0.3, video_ratio: float = 0.1,
+                     video_kb: int = 64, seed: int = 1) -> dict:
+    """Write a synthetic archive below ``root`` and return the parameters used.
+
+    ``members`` are spread evenly over ``branches``. Each member after the
+    first in a branch is the child of an earlier member with probability
+    ``relationship_density``, and married to the previous member with half
+    that probability. ``photo_ratio`` and ``video_ratio`` are the share of
+    members with a photo and an interview video.
+    """
+    rng = random.Random(seed)
+    photo = dummy_photo()
+    video = b'\0' * (video_kb * 1024)
+    params = {'branches': branches, 'members': members, 'paragraphs': paragraphs,
+              'relationship_density': relationship_density, 'photo_ratio': photo_ratio,
+              'video_ratio': video_ratio, 'video_kb': video_kb, 'seed': seed}
+
+    for number in range(branches):
+        surname = SURNAMES[number % len(SURNAMES)]
+        branch_name = f'{surname.lower()}-branch-{number}'
+        branch_path = root / 'families' / branch_name
+        (branch_path / 'members').mkdir(parents=True, exist_ok=True)
+        (branch_path / 'README.md').write_text(
+            f'# {surname} Branch {number} Family\n\n## Overview\n\nSynthetic branch for benchmarks.\n',
+            encoding='utf-8')
+
+        count = members // branches + (1 if number < members % branches else 0)
+        slugs = []
+        for position in range(count):
+            year = 1800 + (position * 200) // max(count, 1)
+            name = f'{rng.choice(GIVEN_NAMES)} {surname} {number}x{position}'
+            slug = member_slug(name, str(year))
+            birth_date = f'{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+
+            relationships = []
+            if slugs and rng.random() < relationship_density:
+                relationships.append(('child_of', rng.choice(slugs[-20:])))
+            if slugs and rng.random() < relationship_density / 2:
+                relationships.append(('spouse_of', slugs[-1]))
+            events = [(f'{year + 18 + offset * 7}-06-01', rng.choice(EVENTS)) for offset in range(rng.randint(0, 3))]
+
+            member_path = branch_path / 'members' / slug
+            (member_path / 'interviews' / 'videos').mkdir(parents=True, exist_ok=True)
+            (member_path / 'photos').mkdir(exist_ok=True)
+            (member_path / 'documents').mkdir(exist_ok=True)
+
+            videos = []
+            if rng.random() < video_ratio:
+                videos = ['interview-part1.mp4']
+                (member_path / 'interviews' / 'videos' / videos[0]).write_bytes(video)
+            if rng.random() < photo_ratio:
+                (member_path / 'photos' / 'portrait.jpg').write_bytes(photo)
+            interviews = []
+            if videos or rng.random() < 0.2:
+                interviews.append(('2024-11-05', rng.sample(TOPICS, 3), videos))
+
+            (member_path / 'profile.md').write_text(
+                profile_text(name, birth_date, rng.choice(PLACES), relationships, events, interviews, paragraphs),
+                encoding='utf-8')
+            (member_path / 'README.md').write_text(readme_content(name, str(year)), encoding='utf-8')
+            slugs.append(slug)
+
+    (root / 'synthetic-archive.json').write_text(json.dumps(params, indent=2) + '\n', encoding='utf-8')
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', type=Path)
+    parser.add_argument('--branches', type=int, default=10)
+    parser.add_argument('--members', type=int, default=1000)
+    parser.add_argument('--paragraphs', type=int, default=5, help='Biography paragraphs per profile')
+    parser.add_argument('--relationship-density', type=float, default=0.8)
+    parser.add_argument('--photo-ratio', type=float, default=0.3)
+    parser.add_argument('--video-ratio', type=float, default=0.1)
+    parser.add_argument('--video-kb', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if (args.output / 'families').exists():
+        parser.error(f'{args.output / "families"} already exists')
+    params = generate_archive(args.output, args.branches, args.members, args.paragraphs,
+                              args.relationship_density, args.photo_ratio, args.video_ratio,
+                              args.video_kb, args.seed)
+    print(f"Wrote {params['members']} members in {params['branches']} branches to {args.output / 'families'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Build manifest for incremental website generation.
+
+The manifest lives in the output directory and records, for every input file,
+template and generated page, enough information to decide on the next build
+whether a page has to be rendered again.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Any, Iterable
+
+MANIFEST_NAME = '.gitfam-manifest.json'
+MANIFEST_VERSION = 1
+
+
+def empty_manifest() -> Dict[str, Any]:
+    """Return a manifest with no recorded inputs, templates or pages."""
+    return {
+        'version': MANIFEST_VERSION,
+        'templates': {},
+        'inputs': {},
+        'pages': {}
+    }
+
+
+def load_manifest(output_path: Path) -> Dict[str, Any]:
+    """Load the manifest from a previous build, or an empty one."""
+    manifest_path = output_path / MANIFEST_NAME
+    if not manifest_path.exists():
+        return empty_manifest()
+
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return empty_manifest()
+
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return empty_manifest()
+
+    for section in ('templates', 'inputs', 'pages'):
+        manifest.setdefault(section, {})
+    return manifest
+
+
+def save_manifest(output_path: Path, manifest: Dict[str, Any]):
+    """Write the manifest next to the generated pages."""
+    manifest_path = output_path / MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+    tmp_path.replace(manifest_path)
+
+
+def sha256_bytes(data: bytes) -> str:
+    """Hex SHA-256 of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    """Hex SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_input(path: Path, previous: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Fingerprint an input file.
+
+    The content hash from the previous build is reused when size and mtime
+    are unchanged, so unchanged inputs cost a single stat.
+    """
+    stat = path.stat()
+    if (previous and previous.get('mtime_ns') == stat.st_mtime_ns
+            and previous.get('size') == stat.st_size):
+        return previous
+
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': sha256_file(path)
+    }
+
+
+def hash_templates(templates_dir: Path) -> Dict[str, str]:
+    """Content hashes of every template file."""
+    return {
+        template.name: sha256_file(template)
+        for template in sorted(templates_dir.iterdir())
+        if template.is_file()
+    }
+
+
+def page_key(*parts: Any) -> str:
+    """Stable hash of everything a page is rendered from."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return sha256_bytes(payload.encode('utf-8'))
+
+
+def remove_stale_pages(output_path: Path, previous_pages: Iterable[str], current_pages: Iterable[str]) -> int:
+    """Delete pages recorded by the previous build that are no longer generated.
+
+    Directories left empty, such as member page shards after a change of
+    layout, are removed as well.
+    """
+    current = set(current_pages)
+    removed = 0
+    for rel_path in previous_pages:
+        if rel_path in current:
+            continue
+        page_path = output_path / rel_path
+        if page_path.exists():
+            page_path.unlink()
+            removed += 1
+        for parent in page_path.parents:
+            if parent == output_path or output_path not in parent.parents:
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+    return removed
@@ -0,0 +1,52 @@
+"""Checksum manifests kept in every member folder.
+
+``gitfam verify`` records the SHA-256 of every file in a member folder in
+``.gitfam-checksums`` inside that folder. The file is meant to be committed
+with the archive and uses the ``sha256sum`` format, so it can also be
+checked without GitFam::
+
+    cd families/smith-california/members/john-smith-1945
+    sha256sum -c .gitfam-checksums
+"""
+
+from pathlib import Path
+from typing import Dict
+
+CHECKSUMS_NAME = '.gitfam-checksums'
+
+
+def read_checksums(member_path: Path) -> Dict[str, str]:
+    """``{relative path: sha256}`` from a member's manifest, empty if it has none."""
+    checksums = {}
+    try:
+        lines = (member_path / CHECKSUMS_NAME).read_text(encoding='utf-8').splitlines()
+    except (OSError, UnicodeDecodeError):
+        return checksums
+
+    for line in lines:
+        sha256, separator, rel_path = line.partition('  ')
+        if separator and len(sha256) == 64:
+            checksums[rel_path] = sha256
+    return checksums
+
+
+def write_checksums(member_path: Path, checksums: Dict[str, str]) -> bool:
+    """Write a member's manifest if its content changed; returns True if written."""
+    manifest_path = member_path / CHECKSUMS_NAME
+    if not checksums:
+        if manifest_path.exists():
+            manifest_path.unlink()
+            return True
+        return False
+
+    content = ''.join(f'{checksums[rel_path]}  {rel_path}\n' for rel_path in sorted(checksums))
+    try:
+        if manifest_path.read_text(encoding='utf-8') == content:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    tmp_path = manifest_path.with_name(CHECKSUMS_NAME + '.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    tmp_path.replace(manifest_path)
+    return True
@@ -0,0 +1,284 @@
+"""Deduplicating store for interview recordings.
+
+Packing a recording splits it into chunks at content-defined boundaries and
+stores every chunk once under ``media-store/chunks``, named by its SHA-256.
+The recording itself is replaced by a small pointer file listing its
+chunks. Because boundaries depend on the bytes around them rather than on
+their offset, a trimmed copy or a re-export that shares most of its content
+with another recording produces mostly the same chunks, and only the chunks
+that differ take up new space. Chunks never change once written, so a
+backup of the store only has to copy chunk files it does not have yet.
+
+Boundaries come from a polynomial rolling hash over the last
+``WINDOW_SIZE`` bytes: a chunk ends where the top ``BOUNDARY_BITS`` bits of
+the hash are zero, subject to ``MIN_CHUNK_SIZE`` and ``MAX_CHUNK_SIZE``.
+With numpy installed the hash is computed for a whole block at once;
+otherwise a pure-Python loop gives the same boundaries, only more slowly.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Any, BinaryIO, Iterator, Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STORE_DIR = 'media-store'
+POINTER_SUFFIX = '.gitfam-media'
+POINTER_HEADER = 'gitfam-media-pointer 1'
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.m4v', '.webm', '.mp3', '.wav', '.m4a', '.flac'}
+
+WINDOW_SIZE = 64
+BOUNDARY_BITS = 20
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+_MASK64 = (1 << 64) - 1
+# Odd, so that it has an inverse modulo 2**64
+_PRIME = 0x100000001B3
+_PRIME_INVERSE = pow(_PRIME, -1, 1 << 64)
+_PRIME_WINDOW = pow(_PRIME, WINDOW_SIZE, 1 << 64)
+_BOUNDARY_SHIFT = 64 - BOUNDARY_BITS
+
+# A fixed random value per byte; changing it would change every chunk boundary
+GEAR = [int.from_bytes(hashlib.sha256(b'gitfam-gear' + bytes([value])).digest()[:8], 'big')
+        for value in range(256)]
+
+
+def _boundary_candidates_python(block: bytes, history: bytes, state: Dict[str, Any]) -> List[int]:
+    """Offsets in ``block`` where the rolling hash marks a possible boundary.
+
+    ``history`` holds the ``WINDOW_SIZE`` bytes before the block (fewer at
+    the start of a file) and ``state['hash']`` the hash at the end of it.
+    """
+    gear = GEAR
+    h = state['hash']
+    window = history + block
+    offset = len(history)
+    candidates = []
+    for i in range(len(block)):
+        position = offset + i
+        h = (h * _PRIME + gear[window[position]]) & _MASK64
+        if position >= WINDOW_SIZE:
+            h = (h - gear[window[position - WINDOW_SIZE]] * _PRIME_WINDOW) & _MASK64
+        if h >> _BOUNDARY_SHIFT == 0:
+            candidates.append(i)
+    state['hash'] = h
+    return candidates
+
+
+_power_tables = {}
+
+
+def _powers(base: int, count: int):
+    """``base ** k`` modulo 2**64 for ``k`` in ``range(count)``, as a uint64 array."""
+    table = _power_tables.get(base)
+    if table is None or len(table) < count:
+        factors = numpy.full(count, base, dtype=numpy.uint64)
+        factors[0] = 1
+        table = _power_tables[base] = numpy.cumprod(factors, dtype=numpy.uint64)
+    return table[:count]
+
+
+def _boundary_candidates_numpy(block: bytes, history: bytes, state: Dict[str, Any]) -> List[int]:
+    """Vectorized ``_boundary_candidates_python``.
+
+    The hash at position ``i`` is ``sum(g[i - j] * P**j for j < WINDOW_SIZE)``.
+    Scaling every ``g[m]`` by ``P**-m`` turns the window sums into
+    differences of one prefix sum, which numpy computes in a single pass.
+    uint64 arithmetic wraps modulo 2**64 exactly like the Python loop.
+    """
+    # Missing history at the start of a file contributes nothing to the hash
+    padding = WINDOW_SIZE - len(history)
+    values = numpy.frombuffer(history + block, dtype=numpy.uint8)
+    gear = numpy.concatenate([numpy.zeros(padding, dtype=numpy.uint64), _GEAR_ARRAY[values]])
+
+    length = len(gear)
+    with numpy.errstate(over='ignore'):
+        prefix = numpy.cumsum(gear * _powers(_PRIME_INVERSE, length), dtype=numpy.uint64)
+        window_sums = prefix[WINDOW_SIZE:] - prefix[:-WINDOW_SIZE]
+        hashes = window_sums * _powers(_PRIME, length)[WINDOW_SIZE:]
+    return numpy.flatnonzero((hashes >> numpy.uint64(_BOUNDARY_SHIFT)) == 0).tolist()
+
+
+if numpy is not None:
+    _GEAR_ARRAY = numpy.array(GEAR, dtype=numpy.uint64)
+    boundary_candidates = _boundary_candidates_numpy
+else:
+    boundary_candidates = _boundary_candidates_python
+
+
+def iter_chunks(stream: BinaryIO, read_size: int = READ_SIZE) -> Iterator[bytes]:
+    """Split a binary stream into content-defined chunks."""
+    state = {'hash': 0}
+    history = b''
+    pending = bytearray()
+    while True:
+        block = stream.read(read_size)
+        if not block:
+            break
+
+        start = len(pending)
+        pending += block
+        cut_from = 0
+        for candidate in boundary_candidates(block, history, state):
+            end = start + candidate + 1
+            while end - cut_from > MAX_CHUNK_SIZE:
+                yield bytes(pending[cut_from:cut_from + MAX_CHUNK_SIZE])
+                cut_from += MAX_CHUNK_SIZE
+            if end - cut_from >= MIN_CHUNK_SIZE:
+                yield bytes(pending[cut_from:end])
+                cut_from = end
+        while len(pending) - cut_from > MAX_CHUNK_SIZE:
+            yield bytes(pending[cut_from:cut_from + MAX_CHUNK_SIZE])
+            cut_from += MAX_CHUNK_SIZE
+
+        del pending[:cut_from]
+        history = (history + block)[-WINDOW_SIZE:]
+
+    if pending:
+        yield bytes(pending)
+
+
+class ChunkStore:
+    """Chunk files addressed by their SHA-256, below ``root/chunks``."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.chunks_dir = root / 'chunks'
+
+    def chunk_path(self, chunk_id: str) -> Path:
+        return self.chunks_dir / chunk_id[:2] / chunk_id
+
+    def has(self, chunk_id: str) -> bool:
+        return self.chunk_path(chunk_id).exists()
+
+    def put(self, data: bytes) -> tuple:
+        """Store a chunk unless it is already present; returns ``(chunk_id, is_new)``."""
+        chunk_id = hashlib.sha256(data).hexdigest()
+        path = self.chunk_path(chunk_id)
+        if path.exists():
+            return chunk_id, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{chunk_id}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return chunk_id, True
+
+    def get(self, chunk_id: str) -> bytes:
+        """The content of a chunk, checked against its id."""
+        data = self.chunk_path(chunk_id).read_bytes()
+        if hashlib.sha256(data).hexdigest() != chunk_id:
+            raise ValueError(f"chunk {chunk_id} is corrupted")
+        return data
+
+
+def pointer_path_for(path: Path) -> Path:
+    return path.with_name(path.name + POINTER_SUFFIX)
+
+
+def write_pointer(path: Path, pointer: Dict[str, Any]):
+    """Write a pointer file: a header, the original name, size and hash, then one chunk per line."""
+    lines = [
+        POINTER_HEADER,
+        f"name {pointer['name']}",
+        f"size {pointer['size']}",
+        f"sha256 {pointer['sha256']}",
+    ]
+    lines += [f"chunk {chunk_id} {size}" for chunk_id, size in pointer['chunks']]
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    tmp_path.replace(path)
+
+
+def read_pointer(path: Path) -> Optional[Dict[str, Any]]:
+    """Parse a pointer file, or None if it is not one."""
+    try:
+        lines = path.read_text(encoding='utf-8').splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not lines or lines[0] != POINTER_HEADER:
+        return None
+
+    pointer = {'chunks': []}
+    try:
+        for line in lines[1:]:
+            key, _, value = line.partition(' ')
+            if key == 'chunk':
+                chunk_id, size = value.split(' ')
+                pointer['chunks'].append((chunk_id, int(size)))
+            elif key == 'size':
+                pointer['size'] = int(value)
+            elif key in ('name', 'sha256'):
+                pointer[key] = value
+    except ValueError:
+        return None
+
+    if not all(key in pointer for key in ('name', 'size', 'sha256')):
+        return None
+    return pointer
+
+
+def pack_file(store: ChunkStore, path: Path) -> Dict[str, Any]:
+    """Move a recording into the store and replace it with a pointer file.
+
+    Returns the recording's size and how many of its bytes were new to the
+    store.
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    new_bytes = 0
+    with open(path, 'rb') as f:
+        for chunk in iter_chunks(f):
+            digest.update(chunk)
+            chunk_id, is_new = store.put(chunk)
+            chunks.append((chunk_id, len(chunk)))
+            if is_new:
+                new_bytes += len(chunk)
+
+    size = sum(chunk_size for _, chunk_size in chunks)
+    write_pointer(pointer_path_for(path), {
+        'name': path.name,
+        'size': size,
+        'sha256': digest.hexdigest(),
+        'chunks': chunks
+    })
+    path.unlink()
+    return {'size': size, 'new_bytes': new_bytes, 'chunks': len(chunks)}
+
+
+def unpack_file(store: ChunkStore, pointer_path: Path) -> Dict[str, Any]:
+    """Rebuild a recording from its pointer file and remove the pointer.
+
+    The result is checked against the size and hash recorded when it was
+    packed; on a mismatch the pointer is kept and ``ValueError`` is raised.
+    """
+    pointer = read_pointer(pointer_path)
+    if pointer is None:
+        raise ValueError(f"{pointer_path} is not a media pointer file")
+
+    target = pointer_path.with_name(pointer['name'])
+    tmp_path = target.with_name(target.name + '.tmp')
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk_id, _ in pointer['chunks']:
+                data = store.get(chunk_id)
+                digest.update(data)
+                f.write(data)
+                size += len(data)
+        if size != pointer['size'] or digest.hexdigest() != pointer['sha256']:
+            raise ValueError(f"{pointer['name']} does not match the recorded checksum")
+    except (OSError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    tmp_path.replace(target)
+    pointer_path.unlink()
+    return {'size': size, 'chunks': len(pointer['chunks'])}
@@ -1,18 +1,16 @@
-"""GitFam CLI - Interactive family tree builder."""
+"""GitFam CLI - Interactive family tree builder.
+
+Each command imports its implementation from ``commands/`` when it runs, so
+``gitfam --help``, ``--version`` and short commands do not pay for loading
+Jinja2, Markdown, questionary or numpy.
+"""
 
 import click
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm
-import questionary
-from questionary import Style
-
-from .commands import init, add_member, add_branch, build_web, generate_metadata
 
-console = Console()
+from . import __version__, profiling
 
-custom_style = Style([
+CUSTOM_STYLE = [
     ('qmark', 'fg:#673ab7 bold'),
     ('question', 'bold'),
     ('answer', 'fg:#00bcd4 bold'),
@@ -22,25 +20,48 @@ custom_style = Style([
     ('separator', 'fg:#cc5454'),
     ('instruction', ''),
     ('text', ''),
-])
+]
+
+
+def get_console():
+    """The shared rich console, created on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+_console = None
 
 
 @click.group()
-@click.version_option()
-def main():
+@click.version_option(__version__)
+@click.option('--profile', is_flag=True, help='Print per-phase timings and counters when the command finishes')
+@click.option('--profile-trace', type=click.Path(dir_okay=False, path_type=Path),
+              help='Also write a Chrome trace-event JSON file (implies --profile)')
+@click.pass_context
+def main(ctx, profile, profile_trace):
     """
     GitFam - Preserve your family's legacy.
     
     Interactive CLI tool for building and managing your family history.
     """
-    pass
+    if profile or profile_trace:
+        profiler = profiling.start(trace=profile_trace is not None)
+        # Registered first so it runs after the command's phase has closed
+        ctx.call_on_close(lambda: profiling.report(profiler, profile_trace))
+        ctx.with_resource(profiling.phase(ctx.invoked_subcommand or 'gitfam'))
 
 
 @main.command()
 @click.option('--path', default='.', help='Path to initialize GitFam project')
 def init_project(path):
     """Initialize a new GitFam project."""
-    console.print(Panel.fit(
+    from rich.panel import Panel
+    from .commands import init
+    
+    get_console().print(Panel.fit(
         "[bold cyan]Welcome to GitFam![/bold cyan]\n\n"
         "Let's set up your family history project.",
         title="🌳 GitFam Setup"
@@ -53,34 +74,172 @@ def init_project(path):
 @click.option('--branch', help='Family branch name (e.g., smith-california)')
 def add_family_member(branch):
     """Add a new family member interactively."""
+    from .commands import add_member
     add_member.add_family_member_interactive(branch)
 
 
 @main.command()
 def create_branch():
     """Create a new family branch."""
+    from .commands import add_branch
     add_branch.create_family_branch_interactive()
 
 
+@main.command('import')
+@click.argument('source', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--branch', required=True, help='Family branch to import into')
+@click.option('--format', type=click.Choice(['gedcom', 'csv']), help='Source format (default: from the file extension)')
+@click.option('--dry-run', is_flag=True, help='Report what would be created without writing anything')
+def import_family(source, branch, format, dry_run):
+    """Create member folders for every person in a GEDCOM or CSV file."""
+    from .commands import import_members
+    if not import_members.import_members(source, branch, source_format=format, dry_run=dry_run):
+        raise SystemExit(1)
+
+
 @main.command()
 @click.option('--output', default='./web', help='Output directory for web viewer')
-def generate_website(output):
+@click.option('--full', is_flag=True, help='Rebuild every page instead of only changed ones')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=1, help='Render pages in N processes (0 = all CPUs)')
+@click.option('--low-memory', is_flag=True, help='Build one branch at a time to keep memory use flat')
+@click.option('--deploy', is_flag=True, help='Fingerprint assets, precompress text files and list changed paths')
+@click.option('--page-size', type=click.IntRange(min=0), default=200,
+              help='Members per branch page (0 = one page per branch)')
+@click.option('--member-paths', type=click.Choice(['flat', 'prefix', 'hash']), default='flat',
+              help='Put member pages in members/ or in subdirectories by slug prefix or hash')
+@click.option('--videos', is_flag=True, help='Play interview videos on member pages (links or copies them into the output)')
+@click.option('--rev', metavar='COMMIT', help='Build from a git commit instead of the working tree')
+def generate_website(output, full, jobs, low_memory, deploy, page_size, member_paths, videos, rev):
     """Generate a static website from your family tree."""
-    console.print("[cyan]Building family tree website...[/cyan]")
-    build_web.generate_static_site(Path(output))
+    from .commands import build_web
+    get_console().print("[cyan]Building family tree website...[/cyan]")
+    build_web.generate_static_site(Path(output), full=full, jobs=jobs, low_memory=low_memory,
+                                   deploy=deploy, page_size=page_size, member_paths=member_paths,
+                                   videos=videos, rev=rev)
+
+
+@main.command('serve')
+@click.option('--output', default='./web', help='Output directory for web viewer')
+@click.option('--host', default='127.0.0.1', help='Address to listen on')
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=8000, help='Port to listen on')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=1, help='Render pages in N processes (0 = all CPUs)')
+@click.option('--poll-interval', type=click.FloatRange(min=0.1), default=1.0,
+              help='Seconds between checks for changes when watchdog is not installed')
+@click.option('--page-size', type=click.IntRange(min=0), default=200,
+              help='Members per branch page (0 = one page per branch)')
+@click.option('--member-paths', type=click.Choice(['flat', 'prefix', 'hash']), default='flat',
+              help='Put member pages in members/ or in subdirectories by slug prefix or hash')
+@click.option('--videos/--no-videos', default=True, help='Play interview videos on member pages')
+def serve_website(output, host, port, jobs, poll_interval, page_size, member_paths, videos):
+    """Preview the website, rebuilding changed pages and reloading the browser."""
+    from .commands import serve
+    serve.serve_site(Path(output), host=host, port=port, jobs=jobs, poll_interval=poll_interval,
+                     page_size=page_size, member_paths=member_paths, videos=videos)
 
 
 @main.command()
-@click.option('--format', type=click.Choice(['json', 'yaml', 'summary']), default='summary', help='Output format')
+@click.option('--format', type=click.Choice(['json', 'yaml', 'ndjson', 'sqlite', 'summary']), default='summary', help='Output format')
 @click.option('--branch', help='Generate metadata for specific branch only')
-def metadata(format, branch):
+@click.option('--output', '-o', help='Output file, or - for stdout (default: family-metadata.<format>)')
+@click.option('--rev', metavar='COMMIT', help='Read the archive from a git commit instead of the working tree')
+def metadata(format, branch, output, rev):
     """Generate metadata and statistics for your family tree."""
-    generate_metadata.generate_metadata(output_format=format, branch=branch)
+    from .commands import generate_metadata
+    generate_metadata.generate_metadata(output_format=format, branch=branch, output=output, rev=rev)
+
+
+@main.command('export')
+@click.option('--format', type=click.Choice(['gedcom']), default='gedcom', help='Export format')
+@click.option('--branch', help='Export a specific branch only')
+@click.option('--output', '-o', help='Output file, or - for stdout (default: family-tree.ged)')
+def export_family(format, branch, output):
+    """Export the family tree for other genealogy software."""
+    from .commands import export
+    if not export.export_archive(output_format=format, branch=branch, output=output):
+        raise SystemExit(1)
+
+
+@main.command()
+@click.argument('slug')
+@click.option('--ancestors/--no-ancestors', default=True, help='Show ancestors')
+@click.option('--descendants/--no-descendants', default=True, help='Show descendants')
+@click.option('--depth', type=click.IntRange(min=1), help='Limit the number of generations shown')
+def tree(slug, ancestors, descendants, depth):
+    """Show a member's ancestors and descendants across all branches."""
+    from .commands import family_tree
+    family_tree.show_family_tree(slug, ancestors=ancestors, descendants=descendants, depth=depth)
+
+
+@main.command('query')
+@click.argument('filters', nargs=-1)
+@click.option('--format', type=click.Choice(['table', 'json', 'slugs']), default='table', help='Output format')
+@click.option('--no-refresh', is_flag=True, help='Use the stored indexes without checking profiles for changes')
+def query_members(filters, format, no_refresh):
+    """Find members by birth year, place, branch, media, interviews or relationships.
+
+    \b
+    Every filter must match, for example:
+      gitfam query born:1880..1920 place:ohio
+      gitfam query branch:smith-california has:videos interviews:>=2
+      gitfam query rel:spouse_of --format slugs
+    """
+    from .commands import query
+    if not query.query_members(list(filters), output_format=format, refresh=not no_refresh):
+        raise SystemExit(1)
+
+
+@main.group('media', invoke_without_command=True)
+@click.option('--branch', help='Only scan a specific branch')
+@click.option('--hash', 'with_hashes', is_flag=True, help='Compute SHA-256 hashes and report duplicate files')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=0, help='Hash files in N threads (0 = all CPUs)')
+@click.option('--format', type=click.Choice(['summary', 'json']), default='summary', help='Output format')
+@click.pass_context
+def media_inventory(ctx, branch, with_hashes, jobs, format):
+    """Report the size and types of member photos, interviews and documents."""
+    if ctx.invoked_subcommand is None:
+        from .commands import media
+        media.media_report(branch=branch, with_hashes=with_hashes, jobs=jobs, output_format=format)
+
+
+@media_inventory.command('pack')
+@click.option('--branch', help='Only pack recordings of a specific branch')
+@click.option('--member', help='Only pack recordings of one member (folder name)')
+def media_pack(branch, member):
+    """Move interview recordings into the deduplicating media store."""
+    from .commands import media
+    media.pack_media(branch=branch, member=member)
+
+
+@media_inventory.command('unpack')
+@click.option('--branch', help='Only unpack recordings of a specific branch')
+@click.option('--member', help='Only unpack recordings of one member (folder name)')
+def media_unpack(branch, member):
+    """Restore packed interview recordings from the media store."""
+    from .commands import media
+    media.unpack_media(branch=branch, member=member)
+
+
+@main.command('verify')
+@click.option('--branch', help='Only verify a specific branch')
+@click.option('--deep', is_flag=True, help='Re-read every file, even if its size and date are unchanged')
+@click.option('--update', is_flag=True, help='Accept corrupted and missing files as they are now')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=0, help='Hash files in N threads (0 = all CPUs)')
+def verify_files(branch, deep, update, jobs):
+    """Check member files for corruption against their checksum manifests."""
+    from .commands import verify
+    if not verify.verify_archive(branch=branch, deep=deep, update=update, jobs=jobs):
+        raise SystemExit(1)
 
 
 @main.command()
 def quick_start():
     """Quick start wizard - set up everything interactively."""
+    import questionary
+    from rich.panel import Panel
+    from .commands import add_branch, add_member, init
+    
+    console = get_console()
+    custom_style = questionary.Style(CUSTOM_STYLE)
     console.print(Panel.fit(
         "[bold cyan]GitFam Quick Start Wizard[/bold cyan]\n\n"
         "This wizard will help you:\n"
@@ -1,7 +1,10 @@
 """Add a new family member."""
 
+import json
+import re
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, List
 from rich.console import Console
 import questionary
 from questionary import Style
@@ -18,6 +21,185 @@ custom_style = Style([
 ])
 
 
+# Words YAML reads as something other than a string
+_YAML_WORDS = {'y', 'n', 'yes', 'no', 'true', 'false', 'on', 'off', 'null'}
+_PLAIN_TEXT = re.compile(r"[^\W\d_][\w .,'()/-]*")
+# Years and ISO dates, which YAML reads as ints and dates that print back the same
+_PLAIN_DATE = re.compile(r'[1-9]\d{3}(-\d{2}(-\d{2})?)?')
+
+
+def yaml_value(value) -> str:
+    """``value`` as a YAML scalar: as typed if YAML reads it back unchanged, else quoted."""
+    text = str(value)
+    if not text:
+        return ''
+    if _PLAIN_TEXT.fullmatch(text) and text.lower() not in _YAML_WORDS and not text.endswith(' '):
+        return text
+    if _PLAIN_DATE.fullmatch(text):
+        try:
+            if len(text) == 10:
+                date.fromisoformat(text)
+            return text
+        except ValueError:
+            pass
+    # A JSON string is also a valid double-quoted YAML string
+    return json.dumps(text, ensure_ascii=False)
+
+
+def member_slug(full_name: str, birth_year: str) -> str:
+    """Folder name of a member: their name and birth year, lowercased and hyphenated."""
+    return full_name.lower().replace(' ', '-') + '-' + birth_year
+
+
+def profile_content(full_name: str, birth_date: str, birth_place: str = '', current_residence: str = '',
+                    relationships: List[Dict[str, str]] = None, major_events: List[Dict[str, str]] = None,
+                    created: str = None, sex: str = '') -> str:
+    """The ``profile.md`` of a new member: frontmatter followed by the biography outline.
+
+    ``sex`` is only written when known, as the ``M`` or ``F`` of imported records.
+    """
+    created = created or datetime.now().strftime('%Y-%m-%d')
+    sex_line = f"sex: {yaml_value(sex)}\n" if sex else ''
+    content = f"""---
+# Basic Information
+name: {yaml_value(full_name)}
+{sex_line}birth_date: {yaml_value(birth_date)}
+birth_place: {yaml_value(birth_place)}
+current_residence: {yaml_value(current_residence)}
+
+# Family Relationships
+relationships:
+"""
+    
+    for rel in relationships or []:
+        content += f"  - type: {rel['type']}\n    person: {yaml_value(rel['person'])}\n"
+    
+    if not relationships:
+        content += "  # Add relationships here\n"
+    
+    if major_events:
+        events_content = ''.join(
+            f"  - date: {yaml_value(event['date'])}\n    event: {yaml_value(event['event'])}\n"
+            for event in major_events
+        )
+    else:
+        events_content = """  # Add important life events here
+  # - date: YYYY-MM-DD
+  #   event: Description
+"""
+    
+    content += f"""
+# Key Life Events
+major_events:
+{events_content}
+# Interviews
+interviews:
+  # Will be populated as you conduct interviews
+  # - date: YYYY-MM-DD
+  #   topics: [childhood, career, family, advice]
+  #   video_files: [interview-part1.mp4]
+  #   notes_file: interview-YYYY-MM-DD.md
+---
+
+# {full_name}
+
+## Biography
+
+[Write a brief overview of {full_name.split()[0]}'s life - a few paragraphs covering their story, what defined them, what they're known for in the family]
+
+## Early Life & Childhood
+
+[Details about their upbringing, where they grew up, childhood memories, family situation]
+
+## Education
+
+[Schools attended, areas of study, formative educational experiences]
+
+## Career & Work Life
+
+[Professional journey, jobs held, career accomplishments, work philosophy]
+
+## Family Life
+
+[Marriage(s), children, parenting approach, family values]
+
+## Interests & Hobbies
+
+[What they love to do, passions, how they spend free time]
+
+## Values & Life Philosophy
+
+[Core beliefs, what they stand for, lessons learned, advice for future generations]
+
+## Legacy & Impact
+
+[How they influenced others, what they'll be remembered for, gifts they gave to the family]
+
+## Important Dates
+
+- **Born:** {birth_date} in {birth_place if birth_place else '[location]'}
+- **Married:** [Date and place]
+- **Children:** [Names and birth years]
+
+## Photos & Media
+
+[Link to photos in the photos/ directory]
+
+## Related Documents
+
+[Links to documents in documents/ directory]
+
+## Notes & Memories
+
+[Space for family members to add their own memories and stories about this person]
+
+---
+
+*Profile created: {created}*
+"""
+    
+    return content
+
+
+def readme_content(full_name: str, birth_year: str = '') -> str:
+    """The ``README.md`` checklist of a new member."""
+    title = f"{full_name} (b. {birth_year})" if birth_year else full_name
+    return f"""# {title}
+
+## Quick Links
+- [Full Profile](profile.md)
+- [Interviews](interviews/)
+- [Photos](photos/)
+- [Documents](documents/)
+
+## Interview Status
+- [ ] Initial interview scheduled
+- [ ] Childhood & early life
+- [ ] Career & work
+- [ ] Family stories
+- [ ] Wisdom & advice
+
+## To-Do
+- [ ] Scan childhood photos
+- [ ] Record video interview
+- [ ] Get copies of important documents
+- [ ] Follow up questions from first interview
+
+## Notes
+[Add any quick notes or reminders here]
+"""
+
+
+def create_member_folder(member_path: Path, profile: str, readme: str):
+    """Create a member folder with its media directories, profile and README."""
+    member_path.mkdir(parents=True)
+    (member_path / 'interviews' / 'videos').mkdir(parents=True)
+    (member_path / 'photos').mkdir()
+    (member_path / 'documents').mkdir()
+    (member_path / 'profile.md').write_text(profile, encoding='utf-8')
+    (member_path / 'README.md').write_text(readme, encoding='utf-8')
+
+
 def add_family_member_interactive(branch_name: str = None):
     """Interactively add a new family member."""
     
@@ -113,141 +295,20 @@ def add_family_member_interactive(branch_name: str = None):
                 relationships.append({'type': rel_type, 'person': rel_person})
     
     # Create directory structure
-    member_slug = full_name.lower().replace(' ', '-') + '-' + birth_year
-    member_path = Path('families') / branch_name / 'members' / member_slug
+    slug = member_slug(full_name, birth_year)
+    member_path = Path('families') / branch_name / 'members' / slug
     
     if member_path.exists():
-        console.print(f"[red]Error: Member '{member_slug}' already exists![/red]")
+        console.print(f"[red]Error: Member '{slug}' already exists![/red]")
         return
     
-    # Create directories
-    member_path.mkdir(parents=True)
-    (member_path / 'interviews' / 'videos').mkdir(parents=True)
-    (member_path / 'photos').mkdir()
-    (member_path / 'documents').mkdir()
-    
-    # Create profile
-    profile_content = f"""---
-# Basic Information
-name: {full_name}
-birth_date: {birth_date if birth_date else birth_year}
-birth_place: {birth_place}
-current_residence: {current_residence}
-
-# Family Relationships
-relationships:
-"""
-    
-    for rel in relationships:
-        profile_content += f"  - type: {rel['type']}\n    person: {rel['person']}\n"
-    
-    if not relationships:
-        profile_content += "  # Add relationships here\n"
-    
-    profile_content += f"""
-# Key Life Events
-major_events:
-  # Add important life events here
-  # - date: YYYY-MM-DD
-  #   event: Description
-
-# Interviews
-interviews:
-  # Will be populated as you conduct interviews
-  # - date: YYYY-MM-DD
-  #   topics: [childhood, career, family, advice]
-  #   video_files: [interview-part1.mp4]
-  #   notes_file: interview-YYYY-MM-DD.md
----
-
-# {full_name}
-
-## Biography
-
-[Write a brief overview of {full_name.split()[0]}'s life - a few paragraphs covering their story, what defined them, what they're known for in the family]
-
-## Early Life & Childhood
-
-[Details about their upbringing, where they grew up, childhood memories, family situation]
-
-## Education
-
-[Schools attended, areas of study, formative educational experiences]
-
-## Career & Work Life
-
-[Professional journey, jobs held, career accomplishments, work philosophy]
-
-## Family Life
-
-[Marriage(s), children, parenting approach, family values]
-
-## Interests & Hobbies
-
-[What they love to do, passions, how they spend free time]
-
-## Values & Life Philosophy
-
-[Core beliefs, what they stand for, lessons learned, advice for future generations]
-
-## Legacy & Impact
-
-[How they influenced others, what they'll be remembered for, gifts they gave to the family]
-
-## Important Dates
-
-- **Born:** {birth_date if birth_date else birth_year} in {birth_place if birth_place else '[location]'}
-- **Married:** [Date and place]
-- **Children:** [Names and birth years]
-
-## Photos & Media
-
-[Link to photos in the photos/ directory]
-
-## Related Documents
-
-[Links to documents in documents/ directory]
-
-## Notes & Memories
-
-[Space for family members to add their own memories and stories about this person]
-
----
-
-*Profile created: {datetime.now().strftime('%Y-%m-%d')}*
-"""
-    
+    create_member_folder(
+        member_path,
+        profile_content(full_name, birth_date if birth_date else birth_year, birth_place, current_residence,
+                        relationships),
+        readme_content(full_name, birth_year)
+    )
     profile_path = member_path / 'profile.md'
-    profile_path.write_text(profile_content, encoding='utf-8')
-    
-    # Create README
-    readme_content = f"""# {full_name} (b. {birth_year})
-
-## Quick Links
-- [Full Profile](profile.md)
-- [Interviews](interviews/)
-- [Photos](photos/)
-- [Documents](documents/)
-
-## Interview Status
-- [ ] Initial interview scheduled
-- [ ] Childhood & early life
-- [ ] Career & work
-- [ ] Family stories
-- [ ] Wisdom & advice
-
-## To-Do
-- [ ] Scan childhood photos
-- [ ] Record video interview
-- [ ] Get copies of important documents
-- [ ] Follow up questions from first interview
-
-## Notes
-[Add any quick notes or reminders here]
-"""
-    
-    readme_path = member_path / 'README.md'
-    readme_path.write_text(readme_content, encoding='utf-8')
     
     console.print(f"\n[bold green]✓ Created profile for {full_name}[/bold green]")
     console.print(f"Location: {member_path}")
@@ -270,4 +331,4 @@ interviews:
         console.print("\n[dim]Remember to commit your changes:[/dim]")
         console.print(f"[dim]git add . && git commit -m 'Added family members'[/dim]")
     
-    return member_slug
+    return slug
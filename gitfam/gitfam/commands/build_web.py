@@ -1,40 +1,104 @@
 """Build static website from family tree."""
 
+import hashlib
+import json
+import math
+import os
 import re
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional, Set
 from rich.console import Console
-import yaml
+
+from ..frontmatter import parse_frontmatter
+from ..family_index import FamilyIndex, load_family_index, open_family_index
+from ..family_graph import FamilyGraph
+from ..git_objects import shared_objects
+from ..markdown_cache import MarkdownCache
+from ..search_index import SearchIndex
+from ..member_videos import MemberVideos
+from ..photo_derivatives import PhotoDerivatives
+from ..profiling import count, phase
+from .. import site_output
+from ..build_manifest import (
+    empty_manifest, load_manifest, save_manifest, hash_input, hash_templates,
+    page_key, sha256_bytes, remove_stale_pages
+)
 
 try:
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+    from markupsafe import Markup
+    import markdown as markdown_module
     from markdown import markdown
 except ImportError:
     Environment = None
+    Markup = str
     markdown = None
+    markdown_module = None
 
 console = Console()
 
+MARKDOWN_EXTENSIONS = ['extra', 'codehilite']
+
+# Members per branch page; 0 puts every member on one page
+DEFAULT_PAGE_SIZE = 200
+
+# Per-process state for parallel rendering, set up by _init_render_worker
+_worker_env = None
+_worker_data = None
+_worker_layout = None
+
+
+def branch_data_from_index(branch: Dict[str, Any]) -> Dict[str, Any]:
+    """Template data for a branch, without its members."""
+    branch_data = {
+        'name': branch['name'],
+        'display_name': branch['name'].replace('-', ' ').title(),
+        'path': branch['name'],
+        'member_count': len(branch['members'])
+    }
+    if branch['description'] is not None:
+        branch_data['description'] = branch['description']
+    return branch_data
 
-def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
-    """Parse YAML frontmatter from markdown file."""
-    if not content.startswith('---'):
-        return {}, content
-    
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return {}, content
-    
-    try:
-        frontmatter = yaml.safe_load(parts[1])
-        body = parts[2].strip()
-        return frontmatter or {}, body
-    except:
-        return {}, content
 
+def member_data_from_index(record: Dict[str, Any], graph: FamilyGraph = None) -> Dict[str, Any]:
+    """Template data for a member, without the profile body.
 
-def collect_family_data(families_path: Path) -> Dict[str, Any]:
-    """Collect all family tree data from markdown files."""
+    With a relationship graph, ``family`` lists the member's resolved
+    relatives (including relationships recorded on the other person's
+    profile) and ``generation`` their generation depth.
+    """
+    frontmatter = record['frontmatter']
+    slug = record['slug']
+    in_graph = graph is not None and graph.members.get(slug, {}).get('branch') == record['branch']
+    return {
+        'slug': record['slug'],
+        'name': frontmatter.get('name', record['slug']),
+        'birth_date': frontmatter.get('birth_date', ''),
+        'birth_place': frontmatter.get('birth_place', ''),
+        'relationships': frontmatter.get('relationships') or [],
+        'interviews': frontmatter.get('interviews') or [],
+        'branch': record['branch'],
+        'profile_path': record['profile_path'],
+        'profile_oid': record.get('profile_oid'),
+        'has_photos': record['has_photos'],
+        'has_videos': record['has_videos'],
+        'photos': [],
+        'videos': [],
+        'family': graph.relatives(slug) if in_graph else [],
+        'generation': graph.generation(slug) if in_graph else None
+    }
+
+
+def collect_family_data(families_path: Path, index: FamilyIndex = None, graph: FamilyGraph = None) -> Dict[str, Any]:
+    """Collect all family tree data from the family index.
+
+    Member records do not include the profile body; it is read with
+    ``load_profile_body`` when the member's page is rendered.
+    """
     data = {
         'branches': [],
         'members': [],
@@ -45,58 +109,22 @@ def collect_family_data(families_path: Path) -> Dict[str, Any]:
         }
     }
     
-    if not families_path.exists():
-        return data
+    if index is None:
+        if not families_path.exists():
+            return data
+        index = load_family_index(families_path)
     
-    for branch_path in families_path.iterdir():
-        if not branch_path.is_dir() or branch_path.name.startswith('.'):
-            continue
+    for branch_name in index.branch_names():
+        branch = index.branch(branch_name)
+        branch_data = branch_data_from_index(branch)
+        branch_data['members'] = []
         
-        branch_data = {
-            'name': branch_path.name,
-            'display_name': branch_path.name.replace('-', ' ').title(),
-            'path': branch_path.name,
-            'members': []
-        }
-        
-        # Read branch README if exists
-        branch_readme = branch_path / 'README.md'
-        if branch_readme.exists():
-            content = branch_readme.read_text(encoding='utf-8')
-            frontmatter, body = parse_frontmatter(content)
-            branch_data['description'] = body.split('\n')[0].replace('#', '').strip()
-        
-        # Collect members
-        members_path = branch_path / 'members'
-        if members_path.exists():
-            for member_path in members_path.iterdir():
-                if not member_path.is_dir():
-                    continue
-                
-                profile_path = member_path / 'profile.md'
-                if not profile_path.exists():
-                    continue
-                
-                content = profile_path.read_text(encoding='utf-8')
-                frontmatter, body = parse_frontmatter(content)
-                
-                member_data = {
-                    'slug': member_path.name,
-                    'name': frontmatter.get('name', member_path.name),
-                    'birth_date': frontmatter.get('birth_date', ''),
-                    'birth_place': frontmatter.get('birth_place', ''),
-                    'relationships': frontmatter.get('relationships', []),
-                    'interviews': frontmatter.get('interviews', []),
-                    'branch': branch_path.name,
-                    'profile_content': body,
-                    'has_photos': (member_path / 'photos').exists() and any((member_path / 'photos').iterdir()),
-                    'has_videos': (member_path / 'interviews' / 'videos').exists() and any((member_path / 'interviews' / 'videos').iterdir())
-                }
-                
-                branch_data['members'].append(member_data)
-                data['members'].append(member_data)
-                data['stats']['total_members'] += 1
-                data['stats']['total_interviews'] += len(member_data['interviews'])
+        for record in branch['members'].values():
+            member_data = member_data_from_index(record, graph)
+            branch_data['members'].append(member_data)
+            data['members'].append(member_data)
+            data['stats']['total_members'] += 1
+            data['stats']['total_interviews'] += len(member_data['interviews'])
         
         data['branches'].append(branch_data)
         data['stats']['total_branches'] += 1
@@ -104,8 +132,403 @@ def collect_family_data(families_path: Path) -> Dict[str, Any]:
     return data
 
 
-def generate_static_site(output_path: Path):
-    """Generate a static HTML website from the family tree."""
+def summarize_site(index: FamilyIndex) -> Dict[str, Any]:
+    """Collect the site-wide data needed by every page, one branch at a time.
+
+    The result has the same ``branches`` and ``stats`` as
+    ``collect_family_data`` but branches carry only ``member_count``, not
+    their members, so its size does not grow with the number of members.
+    """
+    site = {
+        'branches': [],
+        'stats': {
+            'total_members': 0,
+            'total_interviews': 0,
+            'total_branches': 0
+        }
+    }
+    
+    for branch in index.iter_branches():
+        site['branches'].append(branch_data_from_index(branch))
+        site['stats']['total_members'] += len(branch['members'])
+        site['stats']['total_interviews'] += sum(
+            len(record['frontmatter'].get('interviews') or []) for record in branch['members'].values()
+        )
+        site['stats']['total_branches'] += 1
+    
+    return site
+
+
+def load_profile_body(member: Dict[str, Any]) -> str:
+    """Read the Markdown body of a member's profile, from git for members of a ``--rev`` build."""
+    with phase('read profiles'):
+        if member.get('profile_oid'):
+            content = shared_objects().read(member['profile_oid'])[2].decode('utf-8')
+        else:
+            content = Path(member['profile_path']).read_text(encoding='utf-8')
+    count('files read')
+    count('bytes read', len(content))
+    _, body = parse_frontmatter(content)
+    return body
+
+
+def collect_branch_inputs(families_path: Path, branch: Dict[str, Any], previous: Dict[str, Any],
+                          from_git: bool = False, unchanged: bool = False) -> Dict[str, Any]:
+    """Fingerprint the README and member profiles of a branch.
+
+    Profiles read from git are fingerprinted by their blob id; the README
+    only matters for the branch description, which page keys already cover.
+    With ``unchanged`` the previous fingerprints are reused without
+    checking the files, for branches known not to have changed.
+    """
+    if from_git:
+        return {member['profile_path']: {'oid': member['profile_oid']} for member in branch['members']}
+    
+    inputs = {}
+    paths = [families_path / branch['name'] / 'README.md']
+    paths += [Path(member['profile_path']) for member in branch['members']]
+    for path in paths:
+        key = path.as_posix()
+        if unchanged and key in previous:
+            inputs[key] = previous[key]
+        elif path.exists():
+            inputs[key] = hash_input(path, previous.get(key))
+    return inputs
+
+
+def affected_branches(families_path: Path, changed_paths: Iterable[str]) -> Optional[Set[str]]:
+    """Names of the branches that changed files belong to.
+
+    Returns None when a file outside the branch folders changed, such as a
+    template, since that can affect every page.
+    """
+    root = families_path.resolve()
+    branches = set()
+    for path in changed_paths:
+        try:
+            parts = Path(path).resolve().relative_to(root).parts
+        except ValueError:
+            return None
+        if not parts:
+            return None
+        branches.add(parts[0])
+    return branches
+
+
+def input_hash(fingerprint: Dict[str, Any]) -> str:
+    """Content hash of an input fingerprinted by ``collect_branch_inputs``."""
+    return fingerprint.get('sha256') or fingerprint.get('oid')
+
+
+def layout_hash(templates: Dict[str, str]) -> str:
+    """Hash of the base template and the shared fragments it includes."""
+    return page_key(*(templates[name] for name in sorted(templates) if name == 'base.html' or name.startswith('_')))
+
+
+def site_navigation(site: Dict[str, Any]) -> List[Dict[str, str]]:
+    """The branch links shared by every page."""
+    return [{'path': branch['path'], 'display_name': branch['display_name']} for branch in site['branches']]
+
+
+def member_page_path(slug: str, member_paths: str = 'flat') -> str:
+    """Path of a member's page relative to the site root.
+
+    ``flat`` puts every member page in ``members/``; ``prefix`` and ``hash``
+    use subdirectories named after the first two characters of the slug or
+    of its SHA-1, so no directory grows to tens of thousands of files.
+    """
+    if member_paths == 'prefix':
+        return f'members/{slug[:2]}/{slug}.html'
+    if member_paths == 'hash':
+        return f"members/{hashlib.sha1(slug.encode('utf-8')).hexdigest()[:2]}/{slug}.html"
+    return f'members/{slug}.html'
+
+
+def branch_page_path(branch_name: str, number: int, suffix: str = '.html') -> str:
+    """Path of a page of a branch listing; the first page keeps the branch's own name."""
+    if number == 1 and suffix == '.html':
+        return f'{branch_name}.html'
+    return f'{branch_name}/page-{number}{suffix}'
+
+
+def root_prefix(path: str) -> str:
+    """Relative link from a page at ``path`` back to the site root."""
+    return '../' * path.count('/')
+
+
+def member_card(member: Dict[str, Any]) -> Dict[str, Any]:
+    """What the branch page JSON holds for a member: the fields of a member card."""
+    return {
+        'url': member['url'],
+        'name': member['name'],
+        'birth_date': member['birth_date'],
+        'birth_place': member['birth_place'],
+        'interviews': len(member['interviews']),
+        'has_photos': member['has_photos'],
+        'has_videos': member['has_videos']
+    }
+
+
+def plan_search_page(templates: Dict[str, str], nav: list) -> Dict[str, Any]:
+    """The search page; results come from the search index at view time."""
+    return {
+        'path': 'search.html',
+        'template': 'search.html',
+        'context': {'root': ''},
+        'key': page_key(layout_hash(templates), templates.get('search.html'), nav)
+    }
+
+
+def plan_index_page(site: Dict[str, Any], templates: Dict[str, str], nav: list) -> Dict[str, Any]:
+    """The index page and the key of the data it is rendered from."""
+    return {
+        'path': 'index.html',
+        'template': 'index.html',
+        'context': {'root': ''},
+        'key': page_key(
+            layout_hash(templates), templates.get('index.html'), nav, site['stats'],
+            [{key: value for key, value in branch.items() if key != 'members'} for branch in site['branches']]
+        )
+    }
+
+
+def plan_branch_pages(families_path: Path, branch: Dict[str, Any], templates: Dict[str, str],
+                      nav: list, inputs: Dict[str, Any], page_size: int = 0) -> List[Dict[str, Any]]:
+    """The pages of a branch listing followed by the pages of its members.
+
+    A branch with more than ``page_size`` members is split into pages of
+    that many members, and each page also gets a JSON file with its member
+    cards, which the branch page script uses to load the next pages as the
+    reader scrolls. Members must already have their ``url``.
+
+    Keys cover the templates a page extends, the navigation shared by all
+    pages and the page's own data; member keys use the profile hash since
+    member records do not carry the body.
+    """
+    markdown_version = getattr(markdown_module, '__version__', '')
+    readme = inputs.get((families_path / branch['name'] / 'README.md').as_posix(), {})
+    members = branch['members']
+    page_count = max(1, math.ceil(len(members) / page_size)) if page_size else 1
+    pages = []
+    for number in range(1, page_count + 1):
+        listed = members[(number - 1) * page_size:number * page_size] if page_size else members
+        path = branch_page_path(branch['name'], number)
+        pagination = {
+            'page': number,
+            'pages': page_count,
+            'previous': branch_page_path(branch['name'], number - 1) if number > 1 else None,
+            'next': branch_page_path(branch['name'], number + 1) if number < page_count else None,
+            'next_json': branch_page_path(branch['name'], number + 1, '.json') if number < page_count else None
+        }
+        branch_page = {**branch, 'members': listed}
+        pages.append({
+            'path': path,
+            'template': 'branch.html',
+            'context': {'branch': branch_page, 'pagination': pagination, 'root': root_prefix(path)},
+            'key': page_key(
+                layout_hash(templates), templates.get('branch.html'), nav,
+                branch_page, pagination, input_hash(readme)
+            )
+        })
+        if page_count > 1:
+            cards = {'branch': branch['name'], **pagination, 'members': [member_card(member) for member in listed]}
+            pages.append({
+                'path': branch_page_path(branch['name'], number, '.json'),
+                'json': cards,
+                'key': page_key(cards)
+            })
+
+    for member in members:
+        profile = inputs.get(member['profile_path'], {})
+        pages.append({
+            'path': member['url'],
+            'template': 'member.html',
+            'context': {'member': member, 'root': root_prefix(member['url'])},
+            'key': page_key(
+                layout_hash(templates), templates.get('member.html'), nav,
+                member, input_hash(profile), markdown_version
+            )
+        })
+
+    return pages
+
+
+def markdown_filter(text):
+    """Render profile Markdown to HTML."""
+    return markdown(text, extensions=MARKDOWN_EXTENSIONS)
+
+
+def cache_path(families_path: Path, name: str) -> Path:
+    """Directory of a build cache in the project that owns ``families_path``."""
+    return families_path.parent / '.gitfam' / 'cache' / name
+
+
+def create_markdown_cache(families_path: Path) -> MarkdownCache:
+    """The rendered Markdown cache of the project that owns ``families_path``."""
+    return MarkdownCache(cache_path(families_path, 'markdown'), markdown_filter, MARKDOWN_EXTENSIONS)
+
+
+def render_layout(env: 'Environment', data: Dict[str, Any]) -> Dict[str, Markup]:
+    """Render the fragments shared by every page once per build.
+
+    ``base.html`` and ``index.html`` insert these instead of rendering the
+    header, navigation, footer and stats themselves, so the cost of a page
+    depends only on its own content.
+    """
+    def fragment(name, **context):
+        return Markup(env.get_template(name).render(data=data, **context))
+    
+    # Navigation for pages at the root, one and two directories down
+    navs = {root: fragment('_nav.html', nav_prefix=root) for root in ('', '../', '../../')}
+    return {
+        'header': fragment('_header.html'),
+        'navs': navs,
+        'footer': fragment('_footer.html'),
+        'stats': fragment('_stats.html')
+    }
+
+
+def create_environment(templates_dir: Path, markdown_cache: MarkdownCache = None,
+                       bytecode_dir: Path = None, assets: Dict[str, str] = None,
+                       member_paths: str = 'flat') -> 'Environment':
+    """Create the Jinja2 environment used to render site pages.
+
+    Compiled templates are cached in ``bytecode_dir`` when it is given, so
+    later builds skip compiling templates that have not changed. Templates
+    link static files with ``asset(name)``, which gives the output path
+    recorded in ``assets``, and member pages with ``member_url(slug)``.
+    Both paths are relative to the site root; pages prefix them with
+    ``root``.
+    """
+    bytecode_cache = None
+    if bytecode_dir is not None:
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+    
+    env = Environment(
+        loader=FileSystemLoader(templates_dir),
+        autoescape=select_autoescape(['html', 'xml']),
+        bytecode_cache=bytecode_cache
+    )
+    env.filters['markdown'] = markdown_cache.render if markdown_cache else markdown_filter
+    assets = assets or {}
+    env.globals['asset'] = lambda name: assets.get(name, f'static/{name}')
+    env.globals['member_url'] = lambda slug: member_page_path(slug, member_paths)
+    return env
+
+
+def page_context(page: Dict[str, Any]) -> Dict[str, Any]:
+    """Template context of a page, reading the profile body for member pages."""
+    context = page['context']
+    if 'member' in context:
+        member = context['member']
+        context = {**context, 'member': {**member, 'profile_content': load_profile_body(member)}}
+    return context
+
+
+def render_page(env: 'Environment', page: Dict[str, Any], data: Dict[str, Any], layout: Dict[str, Markup]) -> str:
+    """Render a template page, or serialize a JSON page."""
+    if 'json' in page:
+        return json.dumps(page['json'], ensure_ascii=False, separators=(',', ':'), default=str)
+    return env.get_template(page['template']).render(data=data, layout=layout, **page_context(page))
+
+
+def _init_render_worker(templates_dir: str, data: Dict[str, Any], layout: Dict[str, Markup], families_path: str,
+                        assets: Dict[str, str], member_paths: str):
+    """Give a pool worker its own environment and a copy of the site data."""
+    global _worker_env, _worker_data, _worker_layout
+    families_path = Path(families_path)
+    _worker_env = create_environment(Path(templates_dir), create_markdown_cache(families_path),
+                                     cache_path(families_path, 'jinja'), assets, member_paths)
+    _worker_data = data
+    _worker_layout = layout
+
+
+def _render_in_worker(page: Dict[str, Any]) -> str:
+    """Render one page inside a pool worker."""
+    return render_page(_worker_env, page, _worker_data, _worker_layout)
+
+
+def render_pages(env: 'Environment', templates_dir: Path, families_path: Path, data: Dict[str, Any],
+                 layout: Dict[str, Markup], pages: Iterable[Dict[str, Any]], jobs: int = 1,
+                 assets: Dict[str, str] = None, member_paths: str = 'flat'):
+    """Render pages in order, yielding ``(page, html)`` pairs.
+
+    ``pages`` may be a generator; it is consumed lazily. With ``jobs`` > 1
+    pages are rendered in a process pool. Each worker builds its own
+    environment and receives the site data once, at most a few pages per
+    worker are in flight at a time, and results are yielded in page order so
+    the output matches a serial build.
+    """
+    if jobs <= 1:
+        for page in pages:
+            with phase('render pages'):
+                html = render_page(env, page, data, layout)
+            yield page, html
+        return
+    
+    window = jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker,
+                             initargs=(str(templates_dir), data, layout, str(families_path), assets,
+                                       member_paths)) as executor:
+        pending = deque()
+        for page in pages:
+            pending.append((page, executor.submit(_render_in_worker, page)))
+            if len(pending) >= window:
+                done_page, future = pending.popleft()
+                with phase('render pages'):
+                    html = future.result()
+                yield done_page, html
+        while pending:
+            done_page, future = pending.popleft()
+            with phase('render pages'):
+                html = future.result()
+            yield done_page, html
+
+
+def generate_static_site(output_path: Path, full: bool = False, jobs: int = 1, low_memory: bool = False,
+                         deploy: bool = False, page_size: int = DEFAULT_PAGE_SIZE, member_paths: str = 'flat',
+                         videos: bool = False, rev: str = None, changed_paths: Iterable[str] = None):
+    """Generate a static HTML website from the family tree.
+
+    By default only pages whose inputs changed since the previous build are
+    rendered, using the manifest stored in the output directory. Pass
+    ``full=True`` to ignore the manifest and render everything, and
+    ``jobs`` to render pages across that many processes (0 uses every CPU).
+
+    With ``low_memory=True`` the site is built one branch at a time: only
+    one branch's member records are loaded at once, and templates receive
+    ``data`` with branches and stats but no member lists.
+
+    Branch listings are split into pages of ``page_size`` members (0 for
+    one page per branch), and ``member_paths`` chooses between putting
+    every member page in ``members/`` (``flat``) or in subdirectories named
+    after the first two characters of the slug (``prefix``) or of its hash
+    (``hash``), which keeps directories small on large archives.
+
+    With ``rev`` the site is built from ``families/`` as it is in that
+    commit, read from the git object store (see ``RevisionIndex``). Photo
+    galleries are left out, since photo content may only exist in LFS.
+
+    Interview videos are only played on member pages with ``videos=True``,
+    which links or copies every video into ``videos/`` in the output (see
+    ``MemberVideos``). Builds without it remove videos an earlier build
+    published, so a deployed site never carries them by accident.
+
+    ``changed_paths`` lists the files changed since the previous build, as
+    reported by a file watcher. Branches without changed files then skip
+    the index stat pass, input hashing, media scans and search indexing;
+    their pages are still compared with the manifest, since they can show
+    relatives from other branches.
+
+    With ``deploy=True`` static assets get fingerprinted names, text files
+    get precompressed siblings and the paths changed by the build are listed
+    in a deploy manifest (see ``site_output``). Files whose bytes did not
+    change are never rewritten, in either mode.
+
+    Returns the paths of the pages that were rendered and how many other
+    output files changed, or None if the site could not be built.
+    """
     
     if Environment is None:
         console.print("[red]Error: Web generation requires additional dependencies.[/red]")
@@ -116,12 +539,49 @@ def generate_static_site(output_path: Path):
     
     # Collect data
     families_path = Path('families')
-    data = collect_family_data(families_path)
+    try:
+        index = open_family_index(families_path, rev)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+    if rev is not None:
+        console.print(f"Reading {rev} (commit {index.commit[:10]})")
+    unchanged = set()
+    if changed_paths is not None and rev is None:
+        affected = affected_branches(families_path, changed_paths)
+        if affected is not None:
+            unchanged = set(index.branch_names()) - affected
+            index.assume_unchanged(unchanged)
+    with phase('collect site data'):
+        if low_memory:
+            data = summarize_site(index)
+            graph = FamilyGraph.from_index(index)
+        else:
+            index.refresh()
+            graph = FamilyGraph.from_index(index)
+            data = collect_family_data(families_path, index, graph)
     
     console.print(f"Found: {data['stats']['total_members']} members across {data['stats']['total_branches']} branches")
     
     # Create output directory
     output_path.mkdir(parents=True, exist_ok=True)
+    if deploy:
+        with phase('snapshot output'):
+            before = site_output.snapshot(output_path)
+    
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    
+    # Member photos are resized and videos listed branch by branch, before the branch's pages
+    photos = PhotoDerivatives(families_path, output_path, jobs)
+    build_photos = photos.available and rev is None
+    publish_videos = videos and rev is None
+    member_videos = MemberVideos(families_path, output_path)
+    if rev is not None:
+        console.print("[dim]Photo galleries and videos are left out when building from a revision.[/dim]")
+    elif not photos.available:
+        console.print("[yellow]Pillow is not installed, so member pages will have no photo galleries.[/yellow]")
+        console.print("[cyan]Install with: uv sync --extra photos[/cyan]")
     
     # Set up Jinja2
     templates_dir = Path(__file__).parent.parent / 'web_templates'
@@ -130,48 +590,151 @@ def generate_static_site(output_path: Path):
         console.print("[yellow]Creating default templates...[/yellow]")
         create_default_templates(templates_dir)
     
-    env = Environment(
-        loader=FileSystemLoader(templates_dir),
-        autoescape=select_autoescape(['html', 'xml'])
-    )
+    assets = static_assets(fingerprint=deploy)
+    markdown_cache = create_markdown_cache(families_path)
+    env = create_environment(templates_dir, markdown_cache, cache_path(families_path, 'jinja'), assets, member_paths)
+    with phase('render layout'):
+        layout = render_layout(env, data)
+    
+    # Work out which pages changed since the last build
+    previous = load_manifest(output_path)
+    # Pages of the last build are deleted at the end if they are no longer generated
+    previous_pages = list(previous['pages'])
+    removed_compressed = 0
+    if previous.get('deploy') and not deploy:
+        removed_compressed = remove_compressed_files(output_path)
+    if full:
+        # Forget the page keys and input hashes, not which pages exist
+        previous = empty_manifest()
+    manifest = empty_manifest()
+    manifest['templates'] = hash_templates(templates_dir)
+    manifest['deploy'] = deploy
+    # Pages rendered from the reduced low-memory data are keyed separately,
+    # and every page links the static assets and member pages by path
+    nav = [site_navigation(data), 'low-memory' if low_memory else 'full', assets, member_paths]
+    
+    def branch_pages():
+        if low_memory:
+            for branch in index.iter_branches():
+                branch_data = branch_data_from_index(branch)
+                branch_data['members'] = [member_data_from_index(record, graph) for record in branch['members'].values()]
+                yield branch_data
+        else:
+            yield from data['branches']
     
-    # Add markdown filter
-    def markdown_filter(text):
-        return markdown(text, extensions=['extra', 'codehilite'])
+    search = SearchIndex(cache_path(families_path, 'search'), low_memory)
     
-    env.filters['markdown'] = markdown_filter
+    def planned_pages():
+        yield plan_index_page(data, manifest['templates'], nav)
+        yield plan_search_page(manifest['templates'], nav)
+        for branch in branch_pages():
+            rescan = branch['name'] not in unchanged
+            with phase('hash inputs'):
+                inputs = collect_branch_inputs(families_path, branch, previous['inputs'], rev is not None,
+                                               unchanged=not rescan)
+            manifest['inputs'].update(inputs)
+            if build_photos:
+                with phase('photos'):
+                    photos.build_branch(branch['name'], branch['members'], rescan)
+            if publish_videos:
+                with phase('videos'):
+                    member_videos.build_branch(branch['name'], branch['members'], rescan)
+            with phase('search index'):
+                for member in branch['members']:
+                    member['photos'] = photos.gallery(member)
+                    member['videos'] = member_videos.videos(member)
+                    member['url'] = member_page_path(member['slug'], member_paths)
+                if rescan or not search.keep_branch(branch['name']):
+                    search.add_branch(branch['name'], branch['members'], lambda member: page_key(
+                        member['name'], member['branch'], member['birth_date'], member['birth_place'],
+                        member['url'], input_hash(inputs.get(member['profile_path'], {}))
+                    ), load_profile_body)
+            with phase('plan pages'):
+                pages = plan_branch_pages(families_path, branch, manifest['templates'], nav, inputs, page_size)
+            yield from pages
     
-    # Generate index page
-    console.print("• Generating index.html")
-    index_template = env.get_template('index.html')
-    index_html = index_template.render(data=data)
-    (output_path / 'index.html').write_text(index_html, encoding='utf-8')
+    def stale_pages():
+        for page in planned_pages():
+            previous_page = previous['pages'].get(page['path'])
+            if previous_page and previous_page['key'] == page['key'] and (output_path / page['path']).exists():
+                manifest['pages'][page['path']] = previous_page
+                count('pages unchanged')
+            else:
+                yield page
     
-    # Generate branch pages
-    branch_template = env.get_template('branch.html')
-    for branch in data['branches']:
-        console.print(f"• Generating {branch['name']}.html")
-        branch_html = branch_template.render(branch=branch, data=data)
-        (output_path / f"{branch['name']}.html").write_text(branch_html, encoding='utf-8')
+    (output_path / 'members').mkdir(exist_ok=True)
     
-    # Generate member pages
-    member_template = env.get_template('member.html')
-    members_dir = output_path / 'members'
-    members_dir.mkdir(exist_ok=True)
+    if jobs > 1:
+        console.print(f"Rendering with {jobs} processes")
     
-    for member in data['members']:
-        console.print(f"• Generating members/{member['slug']}.html")
-        member_html = member_template.render(member=member, data=data)
-        (members_dir / f"{member['slug']}.html").write_text(member_html, encoding='utf-8')
+    rendered = []
+    for page, html in render_pages(env, templates_dir, families_path, data, layout, stale_pages(), jobs, assets,
+                                   member_paths):
+        console.print(f"• Generating {page['path']}")
+        content = html.encode('utf-8')
+        with phase('write pages'):
+            if site_output.write_if_changed(output_path / page['path'], content):
+                count('files written')
+                count('bytes written', len(content))
+        count('pages rendered')
+        manifest['pages'][page['path']] = {'key': page['key'], 'sha256': sha256_bytes(content)}
+        rendered.append(page['path'])
+    
+    with phase('finish build'):
+        removed = remove_stale_pages(output_path, previous_pages, manifest['pages'])
+        save_manifest(output_path, manifest)
+        markdown_cache.evict()
+        photos.close()
+        unused_photos = photos.remove_unused()
+        unused_videos = member_videos.remove_unused()
+    if build_photos:
+        console.print(f"• Photos: {photos.found} found, {photos.generated} resized, "
+                      f"{photos.copied} copied to the site, {unused_photos} removed")
+    if publish_videos:
+        console.print(f"• Videos: {member_videos.found} found, {member_videos.published} added to the site, "
+                      f"{unused_videos} removed")
+    elif unused_videos:
+        console.print(f"• Videos: {unused_videos} removed (use --videos to publish them)")
+    
+    with phase('write search index'):
+        written = search.write(output_path)
+    console.print(f"• Search index: {search.updated} members re-indexed, {written} files updated")
+    
+    total = len(manifest['pages'])
+    console.print(f"\nRendered {len(rendered)} of {total} pages ({total - len(rendered)} unchanged, {removed} removed)")
     
     # Copy static assets
     console.print("• Copying static assets")
-    create_static_assets(output_path / 'static')
+    with phase('static assets'):
+        assets_written = create_static_assets(output_path, assets)
+    
+    deployed = 0
+    if deploy:
+        with phase('precompress'):
+            after = site_output.snapshot(output_path)
+            changes = site_output.compare_snapshots(before, after)
+            compressed = site_output.precompress(output_path, after, set(changes['added'] + changes['modified']))
+            if compressed:
+                changes = site_output.compare_snapshots(before, site_output.snapshot(output_path))
+        site_output.write_deploy_manifest(output_path, changes, datetime.now().isoformat())
+        deployed = sum(len(paths) for paths in changes.values())
+        formats = ' and '.join(site_output.compression_formats())
+        console.print(f"• Deploy: {compressed} {formats} files updated; {len(changes['added'])} added, "
+                      f"{len(changes['modified'])} modified, {len(changes['removed'])} removed "
+                      f"(listed in {output_path / site_output.DEPLOY_MANIFEST_NAME})")
+        if site_output.brotli is None:
+            console.print("[dim]Install brotli for .br files as well: uv sync --extra deploy[/dim]")
     
     console.print(f"\n[bold green]✓ Website generated at: {output_path.absolute()}[/bold green]")
     console.print(f"\n[bold]To view:[/bold]")
     console.print(f"  Open: [cyan]{(output_path / 'index.html').absolute()}[/cyan]")
-    console.print(f"  Or serve: [cyan]python -m http.server 8000 --directory {output_path}[/cyan]")
+    console.print(f"  Or preview with live reload: [cyan]gitfam serve --output {output_path}[/cyan]")
+    
+    return {
+        'rendered': rendered,
+        'changed_files': (removed + photos.copied + unused_photos + member_videos.published + unused_videos + written
+                          + assets_written + deployed + removed_compressed)
+    }
 
 
 def create_default_templates(templates_dir: Path):
@@ -182,9 +745,57 @@ def create_default_templates(templates_dir: Path):
     pass
 
 
-def create_static_assets(static_dir: Path):
-    """Create CSS and other static assets."""
+def static_assets(fingerprint: bool = False) -> Dict[str, str]:
+    """Output paths of the bundled scripts and other static assets, keyed by file name.
+
+    With ``fingerprint`` the paths carry a hash of the content, so a
+    changed asset gets a new URL and the old one can be cached forever.
+    """
+    source_dir = Path(__file__).parent.parent / 'web_static'
+    if not source_dir.exists():
+        return {}
+    
+    assets = {}
+    for source in sorted(source_dir.iterdir()):
+        if source.is_file():
+            name = site_output.fingerprinted_name(source.name, source.read_bytes()) if fingerprint else source.name
+            assets[source.name] = f'static/{name}'
+    return assets
+
+
+def create_static_assets(output_path: Path, assets: Dict[str, str]) -> int:
+    """Copy the static assets to their output paths, skipping unchanged files.
+
+    Copies of an asset under an earlier fingerprint, or under its plain
+    name after switching to fingerprints, are removed. Returns the number
+    of files written or removed.
+    """
+    static_dir = output_path / 'static'
     static_dir.mkdir(parents=True, exist_ok=True)
+    source_dir = Path(__file__).parent.parent / 'web_static'
     
-    # Will be created in next step
-    pass
+    written = 0
+    for name, rel_path in assets.items():
+        written += site_output.write_if_changed(output_path / rel_path, (source_dir / name).read_bytes())
+    
+    current = {Path(rel_path).name for rel_path in assets.values()}
+    patterns = [re.compile(re.escape(stem) + r'(\.[0-9a-f]{10})?' + re.escape(suffix) + '$')
+                for stem, suffix in (os.path.splitext(name) for name in assets)]
+    for entry in static_dir.iterdir():
+        if entry.name not in current and any(pattern.match(entry.name) for pattern in patterns):
+            entry.unlink()
+            written += 1
+    return written
+
+
+def remove_compressed_files(output_path: Path) -> int:
+    """Delete the precompressed files and deploy manifest of an earlier ``--deploy`` build."""
+    removed = 0
+    for rel_path in site_output.snapshot(output_path):
+        if rel_path.endswith(('.gz', '.br')):
+            (output_path / rel_path).unlink()
+            removed += 1
+    deploy_manifest = output_path / site_output.DEPLOY_MANIFEST_NAME
+    if deploy_manifest.exists():
+        deploy_manifest.unlink()
+    return removed
@@ -0,0 +1,133 @@
+"""Export the family archive for other genealogy software."""
+
+import contextlib
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from rich.console import Console
+
+from .. import __version__
+from ..family_graph import FamilyGraph
+from ..family_index import FamilyIndex
+from ..genealogy import family_record, gedcom_date, gedcom_header, individual_record
+from ..profiling import phase
+
+console = Console()
+error_console = Console(stderr=True)
+
+DEFAULT_OUTPUT_FILES = {
+    'gedcom': 'family-tree.ged'
+}
+
+
+def member_sex(frontmatter: Dict) -> str:
+    """``M`` or ``F`` from an optional ``sex`` or ``gender`` frontmatter field."""
+    value = str(frontmatter.get('sex') or frontmatter.get('gender') or '').strip().upper()[:1]
+    return value if value in ('M', 'F') else ''
+
+
+def family_units(graph: FamilyGraph, included: Set[str]) -> List[Tuple[Tuple[str, ...], List[str]]]:
+    """Families as ``(partner slugs, child slugs)``, one per set of parents or couple.
+
+    Children are grouped by their known parents; couples without children
+    in the archive still get a family. GEDCOM families have at most two
+    partners, so only the first two parents by slug are used.
+    """
+    families: Dict[Tuple[str, ...], List[str]] = {}
+    for slug in graph.members:
+        if slug not in included:
+            continue
+        parents = tuple(sorted(parent for parent in graph.parents(slug) if parent in included))[:2]
+        if parents:
+            families.setdefault(parents, []).append(slug)
+        for spouse in graph.edges[slug]['spouse_of']:
+            if spouse in included:
+                families.setdefault(tuple(sorted((slug, spouse))), [])
+    return sorted(families.items())
+
+
+def write_gedcom(stream, index: FamilyIndex, graph: FamilyGraph, branch: str = None, log: Console = console) -> Dict[str, int]:
+    """Write a GEDCOM 5.5.1 file, one branch of member records at a time.
+
+    Only the relationship graph is built up front, to number individuals
+    and families; profile frontmatter is read and written branch by branch.
+    """
+    included = {slug for slug, member in graph.members.items() if branch is None or member['branch'] == branch}
+    individual_ids = {slug: f'@I{number}@' for number, slug in enumerate(
+        (slug for slug in graph.members if slug in included), start=1)}
+
+    families = family_units(graph, included)
+    family_ids = {}
+    child_of = {}
+    spouse_of: Dict[str, List[str]] = {}
+    for number, (partners, children) in enumerate(families, start=1):
+        family_id = f'@F{number}@'
+        family_ids[partners] = family_id
+        for child in children:
+            child_of[child] = family_id
+        for partner in partners:
+            spouse_of.setdefault(partner, []).append(family_id)
+
+    stream.write('\n'.join(gedcom_header(__version__, gedcom_date(datetime.now().date().isoformat()))) + '\n')
+
+    sexes = {}
+    branch_records = [index.branch(branch)] if branch else index.iter_branches()
+    for branch_record in branch_records:
+        log.print(f"• Exporting {branch_record['name']}...")
+        for record in branch_record['members'].values():
+            slug = record['slug']
+            # Duplicate slugs in later branches are not part of the graph
+            if slug not in included or graph.members[slug]['branch'] != branch_record['name']:
+                continue
+            frontmatter = record.get('frontmatter') or {}
+            sex = member_sex(frontmatter)
+            if sex:
+                sexes[slug] = sex
+            lines = individual_record(individual_ids[slug], slug, frontmatter, sex,
+                                      child_of.get(slug), spouse_of.get(slug, []))
+            stream.write('\n'.join(lines) + '\n')
+
+    for partners, children in families:
+        lines = family_record(family_ids[partners],
+                              [(individual_ids[partner], sexes.get(partner, '')) for partner in partners],
+                              [individual_ids[child] for child in children])
+        stream.write('\n'.join(lines) + '\n')
+    stream.write('0 TRLR\n')
+
+    return {'individuals': len(individual_ids), 'families': len(families)}
+
+
+def export_archive(output_format: str = 'gedcom', branch: str = None, output: str = None) -> bool:
+    """Export all branches, or one branch, to ``output`` (``-`` for stdout)."""
+    log = error_console if output == '-' else console
+    log.print("\n[bold cyan]Exporting Family Archive[/bold cyan]\n")
+
+    families_path = Path('families')
+    if not families_path.exists():
+        log.print("[red]Error: No families directory found.[/red]")
+        return False
+    if branch and not (families_path / branch).exists():
+        log.print(f"[red]Error: Branch '{branch}' not found.[/red]")
+        return False
+
+    output = output or DEFAULT_OUTPUT_FILES[output_format]
+    index = FamilyIndex(families_path)
+    # Relationships are resolved across all branches, even for a one-branch export
+    with phase('build graph'):
+        graph = FamilyGraph.from_index(index)
+
+    if output == '-':
+        target = contextlib.nullcontext(sys.stdout)
+    else:
+        target = open(output, 'w', encoding='utf-8', newline='\n')
+    with phase('write gedcom'), target as stream:
+        totals = write_gedcom(stream, index, graph, branch, log)
+
+    destination = 'stdout' if output == '-' else output
+    log.print(f"\n[bold green]✓ {totals['individuals']} individuals and {totals['families']} families "
+              f"written to: {destination}[/bold green]")
+    if graph.duplicates:
+        log.print(f"[yellow]Skipped {len(graph.duplicates)} members whose folder name is used in "
+                  f"more than one branch: {', '.join(sorted(set(graph.duplicates))[:5])}[/yellow]")
+    return True
@@ -0,0 +1,79 @@
+"""Show the ancestors and descendants of a family member."""
+
+from pathlib import Path
+from rich.console import Console
+from rich.markup import escape
+from rich.tree import Tree
+
+from ..family_index import load_family_index
+from ..family_graph import FamilyGraph
+
+console = Console()
+
+
+def _label(graph: FamilyGraph, slug: str) -> str:
+    member = graph.members[slug]
+    return f"[bold]{escape(str(member['name']))}[/bold] [dim]({escape(slug)}, {escape(member['branch'])})[/dim]"
+
+
+def _add_lineage(graph: FamilyGraph, node: Tree, slug: str, step, max_depth: int, seen: set):
+    """Add the members reached through ``step`` below ``node``, each only once.
+
+    Walks depth first with an explicit stack, so lineages of any length fit
+    within the recursion limit.
+    """
+    stack = [(node, iter(sorted(step(slug))), 0)]
+    while stack:
+        parent, others, depth = stack[-1]
+        other = next(others, None)
+        if other is None:
+            stack.pop()
+            continue
+        if other in seen:
+            parent.add(f"{_label(graph, other)} [dim]↑ shown above[/dim]")
+            continue
+        seen.add(other)
+        child = parent.add(_label(graph, other))
+        if max_depth is None or depth + 1 < max_depth:
+            stack.append((child, iter(sorted(step(other))), depth + 1))
+
+
+def show_family_tree(slug: str, ancestors: bool = True, descendants: bool = True, depth: int = None):
+    """Print the lineage of a member across all branches."""
+    families_path = Path('families')
+    if not families_path.exists():
+        console.print("[red]Error: No families directory found.[/red]")
+        return
+
+    graph = FamilyGraph.from_index(load_family_index(families_path))
+
+    resolved = graph.resolve(slug)
+    if resolved is None:
+        console.print(f"[red]Error: Member '{escape(slug)}' not found.[/red]")
+        return
+    slug = resolved
+
+    generation = graph.generation(slug)
+    generation_str = f"generation {generation}" if generation is not None else "generation unknown (cycle)"
+    tree = Tree(f"🌳 {_label(graph, slug)} · {generation_str}")
+
+    relatives = [rel for rel in graph.relatives(slug) if rel['type'] in ('spouse_of', 'sibling_of')]
+    if relatives:
+        family = tree.add("[cyan]Spouses & siblings[/cyan]")
+        for rel in relatives:
+            label = _label(graph, rel['slug']) if rel['slug'] else f"{escape(rel['name'])} [yellow](not in archive)[/yellow]"
+            family.add(f"{rel['type'].replace('_', ' ')}: {label}")
+
+    if ancestors:
+        node = tree.add(f"[cyan]Ancestors[/cyan] [dim]({len(graph.ancestors(slug, depth))})[/dim]")
+        _add_lineage(graph, node, slug, graph.parents, depth, {slug})
+
+    if descendants:
+        node = tree.add(f"[cyan]Descendants[/cyan] [dim]({len(graph.descendants(slug, depth))})[/dim]")
+        _add_lineage(graph, node, slug, graph.children, depth, {slug})
+
+    console.print(tree)
+
+    unresolved = [rel for rel in graph.unresolved.get(slug, []) if rel['type'] in ('child_of', 'parent_of')]
+    for rel in unresolved:
+        console.print(f"[yellow]Note: {rel['type'].replace('_', ' ')} '{escape(rel['person'])}' does not match any member.[/yellow]")
@@ -1,33 +1,30 @@
 """Generate metadata and statistics for family branches."""
 
+import contextlib
 import json
+import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, TextIO
 from rich.console import Console
 from rich.table import Table
-import yaml
 
-console = Console()
+from ..family_index import FamilyIndex, load_family_index, open_family_index
+from ..frontmatter import dump_yaml
+from ..metadata_db import write_database
+from ..profiling import count, phase
 
+console = Console()
+error_console = Console(stderr=True)
 
-def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
-    """Parse YAML frontmatter from markdown file."""
-    if not content.startswith('---'):
-        return {}, content
-    
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return {}, content
-    
-    try:
-        frontmatter = yaml.safe_load(parts[1])
-        body = parts[2].strip()
-        return frontmatter or {}, body
-    except:
-        return {}, content
+DEFAULT_OUTPUT_FILES = {
+    'json': 'family-metadata.json',
+    'yaml': 'family-metadata.yaml',
+    'ndjson': 'family-metadata.ndjson',
+    'sqlite': 'family-metadata.sqlite'
+}
 
 
-def collect_branch_metadata(branch_path: Path) -> Dict[str, Any]:
+def collect_branch_metadata(branch_path: Path, index: FamilyIndex = None) -> Dict[str, Any]:
     """Collect all metadata for a single family branch."""
     metadata = {
         'branch_name': branch_path.name,
@@ -42,23 +39,21 @@ def collect_branch_metadata(branch_path: Path) -> Dict[str, Any]:
         'relationships': []
     }
     
-    members_path = branch_path / 'members'
-    if not members_path.exists():
-        return metadata
+    if index is None:
+        if not (branch_path / 'members').exists():
+            return metadata
+        index = load_family_index(branch_path.parent, [branch_path.name])
     
     birth_years = []
     
-    for member_path in members_path.iterdir():
-        if not member_path.is_dir():
-            continue
-        
-        profile_path = member_path / 'profile.md'
-        if not profile_path.exists():
-            continue
+    for record in index.members(branch_path.name):
+        slug = record['slug']
         
         try:
-            content = profile_path.read_text(encoding='utf-8')
-            frontmatter, _ = parse_frontmatter(content)
+            if record.get('error'):
+                raise ValueError(record['error'])
+            
+            frontmatter = record['frontmatter']
             
             # Extract birth year for statistics
             birth_date = frontmatter.get('birth_date', '')
@@ -70,8 +65,8 @@ def collect_branch_metadata(branch_path: Path) -> Dict[str, Any]:
                     pass
             
             # Check for media
-            has_photos = (member_path / 'photos').exists() and any((member_path / 'photos').iterdir())
-            has_videos = (member_path / 'interviews' / 'videos').exists() and any((member_path / 'interviews' / 'videos').iterdir())
+            has_photos = record['has_photos']
+            has_videos = record['has_videos']
             
             if has_photos:
                 metadata['statistics']['members_with_photos'] += 1
@@ -79,36 +74,36 @@ def collect_branch_metadata(branch_path: Path) -> Dict[str, Any]:
                 metadata['statistics']['members_with_videos'] += 1
             
             # Count interviews
-            interviews = frontmatter.get('interviews', [])
+            interviews = frontmatter.get('interviews') or []
             metadata['statistics']['total_interviews'] += len(interviews)
             
             # Member data
             member_data = {
-                'slug': member_path.name,
-                'name': frontmatter.get('name', member_path.name),
+                'slug': slug,
+                'name': frontmatter.get('name', slug),
                 'birth_date': frontmatter.get('birth_date', ''),
                 'birth_place': frontmatter.get('birth_place', ''),
                 'current_residence': frontmatter.get('current_residence', ''),
-                'relationships': frontmatter.get('relationships', []),
+                'relationships': frontmatter.get('relationships') or [],
                 'interviews': interviews,
                 'has_photos': has_photos,
                 'has_videos': has_videos,
-                'major_events': frontmatter.get('major_events', [])
+                'major_events': frontmatter.get('major_events') or []
             }
             
             metadata['members'].append(member_data)
             metadata['statistics']['total_members'] += 1
             
             # Collect relationships for graph
-            for rel in frontmatter.get('relationships', []):
+            for rel in member_data['relationships']:
                 metadata['relationships'].append({
-                    'from': member_path.name,
+                    'from': slug,
                     'to': rel.get('person', ''),
                     'type': rel.get('type', '')
                 })
         
         except Exception as e:
-            console.print(f"[yellow]Warning: Could not parse {member_path.name}: {e}[/yellow]")
+            error_console.print(f"[yellow]Warning: Could not parse {slug}: {e}[/yellow]")
             continue
     
     # Calculate birth year range
@@ -122,14 +117,108 @@ def collect_branch_metadata(branch_path: Path) -> Dict[str, Any]:
     return metadata
 
 
-def generate_metadata(output_format: str = 'json', branch: str = None):
-    """Generate metadata for all branches or a specific branch."""
+def open_output(output: str):
+    """The file to export to, or stdout for ``-``."""
+    if output == '-':
+        return contextlib.nullcontext(sys.stdout)
+    return open(output, 'w', encoding='utf-8')
+
+
+def write_member_records(branches: Iterable[Dict[str, Any]], families_path: Path, index: FamilyIndex,
+                         stream: TextIO, log: Console) -> Dict[str, int]:
+    """Write one JSON line per member, a branch at a time.
+
+    Only the branch being written is held in memory, so the export of any
+    size of tree runs in constant memory.
+    """
+    totals = {'branches': 0, 'members': 0}
+    for branch_record in branches:
+        name = branch_record['name']
+        log.print(f"• Processing {name}...")
+        with phase('collect metadata'):
+            branch_metadata = collect_branch_metadata(families_path / name, index)
+        with phase('write ndjson'):
+            for member in branch_metadata['members']:
+                line = json.dumps({'branch': name, **member}, ensure_ascii=False, default=str) + '\n'
+                stream.write(line)
+                count('bytes written', len(line))
+            stream.flush()
+        totals['branches'] += 1
+        totals['members'] += branch_metadata['statistics']['total_members']
+    return totals
+
+
+def generate_metadata(output_format: str = 'json', branch: str = None, output: str = None, rev: str = None):
+    """Generate metadata for all branches or a specific branch.
+
+    ``output`` is the file to write for the json, yaml, ndjson and sqlite
+    formats, ``-`` for stdout; it defaults to ``family-metadata.<format>``.
+    An existing sqlite file is updated in place, rewriting only the branches
+    that changed. With ``rev`` the archive is read from that commit instead
+    of the working tree.
+    """
+    # Keep stdout clean for the export itself when it is written there
+    log = error_console if output == '-' else console
     
-    console.print("\n[bold cyan]Generating Family Metadata[/bold cyan]\n")
+    log.print("\n[bold cyan]Generating Family Metadata[/bold cyan]\n")
     
     families_path = Path('families')
-    if not families_path.exists():
-        console.print("[red]Error: No families directory found.[/red]")
+    if rev is None and not families_path.exists():
+        log.print("[red]Error: No families directory found.[/red]")
+        return
+    
+    try:
+        index = open_family_index(families_path, rev)
+    except ValueError as e:
+        log.print(f"[red]Error: {e}[/red]")
+        return
+    if rev is not None:
+        if not index.branch_names():
+            log.print(f"[red]Error: No families directory found in {rev}.[/red]")
+            return
+        log.print(f"Reading {rev} (commit {index.commit[:10]})")
+    
+    if branch and branch not in index.branch_names():
+        log.print(f"[red]Error: Branch '{branch}' not found.[/red]")
+        return
+    
+    if output is None and output_format in DEFAULT_OUTPUT_FILES:
+        output = DEFAULT_OUTPUT_FILES[output_format]
+    
+    if output_format == 'ndjson':
+        branches = [index.branch(branch)] if branch else index.iter_branches()
+        with open_output(output) as stream:
+            totals = write_member_records(branches, families_path, index, stream, log)
+        destination = 'stdout' if output == '-' else output
+        log.print(f"\n[bold green]✓ {totals['members']} members from {totals['branches']} branches "
+                  f"written to: {destination}[/bold green]")
+        return
+    
+    if output_format == 'sqlite':
+        if output == '-':
+            log.print("[red]Error: The sqlite format cannot be written to stdout.[/red]")
+            return
+        
+        from datetime import datetime
+        branch_records = [index.branch(branch)] if branch else index.iter_branches()
+        
+        def branches():
+            for branch_record in branch_records:
+                log.print(f"• Processing {branch_record['name']}...")
+                with phase('collect metadata'):
+                    branch_metadata = collect_branch_metadata(families_path / branch_record['name'], index)
+                yield branch_metadata
+        
+        # A single-branch export leaves the other branches in the database alone
+        with phase('write sqlite'):
+            try:
+                counts = write_database(Path(output), branches(), datetime.now().isoformat(), prune=not branch)
+            except ValueError as e:
+                log.print(f"[red]Error: {e}[/red]")
+                return
+        log.print(f"\n[bold green]✓ Metadata saved to: {output}[/bold green] "
+                  f"[dim]({counts['written']} branches written, {counts['unchanged']} unchanged, "
+                  f"{counts['removed']} removed)[/dim]")
         return
     
     all_metadata = {
@@ -150,17 +239,16 @@ def generate_metadata(output_format: str = 'json', branch: str = None):
     # Collect metadata for each branch
     branches = []
     if branch:
-        branch_path = families_path / branch
-        if not branch_path.exists():
-            console.print(f"[red]Error: Branch '{branch}' not found.[/red]")
-            return
-        branches = [branch_path]
+        branches = [families_path / branch]
+        index.refresh([branch])
     else:
-        branches = [d for d in families_path.iterdir() if d.is_dir() and not d.name.startswith('.')]
+        index.refresh()
+        branches = [families_path / name for name in index.branch_names()]
     
     for branch_path in branches:
-        console.print(f"• Processing {branch_path.name}...")
-        branch_metadata = collect_branch_metadata(branch_path)
+        log.print(f"• Processing {branch_path.name}...")
+        with phase('collect metadata'):
+            branch_metadata = collect_branch_metadata(branch_path, index)
         all_metadata['branches'].append(branch_metadata)
         
         # Update global stats
@@ -175,23 +263,27 @@ def generate_metadata(output_format: str = 'json', branch: str = None):
     
     # Output based on format
     if output_format == 'json':
-        output_file = Path('family-metadata.json')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_metadata, f, indent=2, ensure_ascii=False)
-        console.print(f"\n[bold green]✓ Metadata saved to: {output_file}[/bold green]")
+        with phase('write json'), open_output(output) as f:
+            json.dump(all_metadata, f, indent=2, ensure_ascii=False, default=str)
+            if output != '-':
+                count('bytes written', f.tell())
+        if output != '-':
+            log.print(f"\n[bold green]✓ Metadata saved to: {output}[/bold green]")
     
     elif output_format == 'yaml':
-        output_file = Path('family-metadata.yaml')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            yaml.dump(all_metadata, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
-        console.print(f"\n[bold green]✓ Metadata saved to: {output_file}[/bold green]")
+        with phase('write yaml'), open_output(output) as f:
+            dump_yaml(all_metadata, f)
+            if output != '-':
+                count('bytes written', f.tell())
+        if output != '-':
+            log.print(f"\n[bold green]✓ Metadata saved to: {output}[/bold green]")
     
     elif output_format == 'summary':
         # Display summary in terminal
         display_summary(all_metadata)
     
     else:
-        console.print(f"[red]Unknown format: {output_format}[/red]")
+        log.print(f"[red]Unknown format: {output_format}[/red]")
 
 
 def display_summary(metadata: Dict[str, Any]):
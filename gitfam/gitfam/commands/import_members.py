@@ -0,0 +1,173 @@
+"""Create member folders in bulk from a GEDCOM or CSV file."""
+
+import re
+import time
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from ..genealogy import read_csv, read_gedcom, year_of
+from .add_member import create_member_folder, profile_content, readme_content
+
+console = Console()
+
+FORMATS_BY_SUFFIX = {
+    '.ged': 'gedcom',
+    '.gedcom': 'gedcom',
+    '.csv': 'csv'
+}
+
+_NON_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def slugify(text: str) -> str:
+    """Lowercase ASCII words joined by hyphens."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _NON_SLUG.sub('-', text).strip('-')
+
+
+def plan_import(people: Dict[str, Dict[str, Any]], members_path: Path) -> List[Dict[str, Any]]:
+    """Choose a folder for every person and work out their relationships.
+
+    Slugs follow ``add-family-member``: the name and birth year. A slug
+    that already exists in the branch is taken to be the same person from
+    an earlier import and is left alone; a second person with the same slug
+    within the file gets a numbered suffix.
+    """
+    existing = set()
+    if members_path.exists():
+        existing = {path.name for path in members_path.iterdir() if path.is_dir()}
+
+    taken = set()
+    slugs = {}
+    plan = []
+    for person_id, person in people.items():
+        base = '-'.join(part for part in (slugify(person['name']) or 'unknown', year_of(person['birth_date'])) if part)
+        slug = base
+        number = 2
+        while slug in taken:
+            slug = f'{base}-{number}'
+            number += 1
+        taken.add(slug)
+        slugs[person_id] = slug
+        plan.append({
+            'slug': slug,
+            'person': person,
+            'status': 'exists' if slug in existing else ('renamed' if slug != base else 'new')
+        })
+
+    for entry in plan:
+        person = entry['person']
+        entry['relationships'] = (
+            [{'type': 'child_of', 'person': slugs[other]} for other in person['parents']] +
+            [{'type': 'spouse_of', 'person': slugs[other]} for other in person['spouses']] +
+            [{'type': 'parent_of', 'person': slugs[other]} for other in person['children']]
+        )
+    return plan
+
+
+def write_members(plan: List[Dict[str, Any]], members_path: Path) -> int:
+    """Create the folders of every planned member that does not exist yet."""
+    created = datetime.now().strftime('%Y-%m-%d')
+    count = 0
+    for entry in plan:
+        if entry['status'] == 'exists':
+            continue
+        person = entry['person']
+        name = person['name'] or 'Unknown'
+        create_member_folder(
+            members_path / entry['slug'],
+            profile_content(name, person['birth_date'], person['birth_place'], person['current_residence'],
+                            entry['relationships'], person['events'], created=created, sex=person['sex']),
+            readme_content(name, year_of(person['birth_date']))
+        )
+        count += 1
+    return count
+
+
+def import_members(source: Path, branch: str, source_format: str = None, dry_run: bool = False) -> bool:
+    """Import every individual in ``source`` into ``branch``. Returns False on errors."""
+    console.print("\n[bold cyan]Importing Family Members[/bold cyan]\n")
+
+    families_path = Path('families')
+    if not families_path.exists():
+        console.print("[red]Error: No families directory found. Run 'gitfam init-project' first.[/red]")
+        return False
+    if not (families_path / branch).exists():
+        console.print(f"[red]Error: Branch '{branch}' not found. Create it first with 'gitfam create-branch'.[/red]")
+        return False
+
+    source_format = source_format or FORMATS_BY_SUFFIX.get(source.suffix.lower())
+    if source_format is None:
+        console.print(f"[red]Error: Cannot tell the format of {source.name}; use --format gedcom or --format csv.[/red]")
+        return False
+
+    started = time.perf_counter()
+    reader = read_gedcom if source_format == 'gedcom' else read_csv
+    with open(source, encoding='utf-8-sig', errors='replace', newline='') as stream:
+        people, family_count, warnings = reader(stream)
+
+    members_path = families_path / branch / 'members'
+    plan = plan_import(people, members_path)
+    for entry in plan:
+        if not entry['person']['name']:
+            warnings.append(f"'{entry['person']['id']}' has no name; imported as {entry['slug']}")
+
+    written = 0
+    if not dry_run:
+        members_path.mkdir(parents=True, exist_ok=True)
+        written = write_members(plan, members_path)
+    elapsed = time.perf_counter() - started
+
+    display_import_report(plan, family_count, warnings, written, elapsed, dry_run)
+    return True
+
+
+def display_import_report(plan: List[Dict[str, Any]], family_count: int, warnings: List[str],
+                          written: int, elapsed: float, dry_run: bool):
+    """Summarize what an import did, or would do with ``dry_run``."""
+    counts = {status: sum(1 for entry in plan if entry['status'] == status) for status in ('new', 'renamed', 'exists')}
+
+    if dry_run:
+        table = Table(show_header=True, title="Members to create (first 20)")
+        table.add_column("Slug", style="cyan")
+        table.add_column("Name", style="bold")
+        table.add_column("Born", style="green")
+        table.add_column("Relationships", justify="right")
+        table.add_column("Events", justify="right")
+        for entry in [entry for entry in plan if entry['status'] != 'exists'][:20]:
+            person = entry['person']
+            table.add_row(escape(entry['slug']), escape(person['name']), escape(person['birth_date']),
+                          str(len(entry['relationships'])), str(len(person['events'])))
+        console.print(table)
+
+    summary = Table(show_header=False, box=None)
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", style="bold green", justify="right")
+    summary.add_row("Individuals read", str(len(plan)))
+    summary.add_row("Family records", str(family_count))
+    summary.add_row("Would create" if dry_run else "Created", str(counts['new'] + counts['renamed'] if dry_run else written))
+    summary.add_row("Numbered to avoid duplicate folders", str(counts['renamed']))
+    summary.add_row("Already in branch (skipped)", str(counts['exists']))
+    summary.add_row("Relationships", str(sum(len(entry['relationships']) for entry in plan)))
+    summary.add_row("Warnings", str(len(warnings)))
+    console.print()
+    console.print(summary)
+
+    for warning in warnings[:10]:
+        console.print(f"[yellow]Warning: {escape(warning)}[/yellow]")
+    if len(warnings) > 10:
+        console.print(f"[yellow]... and {len(warnings) - 10} more warnings[/yellow]")
+
+    rate = f" ({len(plan) / elapsed:,.0f} individuals/s)" if elapsed > 0 and plan else ""
+    console.print(f"\n[dim]Processed in {elapsed:.2f}s{rate}[/dim]")
+    if dry_run:
+        console.print("[yellow]Dry run: no files were written. Run again without --dry-run to import.[/yellow]")
+    else:
+        console.print("[bold green]✓ Import complete[/bold green]")
+        console.print("[dim]Remember to commit your changes: git add . && git commit -m 'Imported family members'[/dim]")
@@ -36,6 +36,7 @@ def initialize_project(project_path: Path):
 *.avi filter=lfs diff=lfs merge=lfs -text
 *.mkv filter=lfs diff=lfs merge=lfs -text
 *.pdf filter=lfs diff=lfs merge=lfs -text
+media-store/chunks/** filter=lfs diff=lfs merge=lfs -text
 """
     
     gitattributes_path = project_path / '.gitattributes'
@@ -55,6 +56,7 @@ __pycache__/
 venv/
 node_modules/
 web/
+.gitfam/
 """
     
     gitignore_path = project_path / '.gitignore'
@@ -0,0 +1,309 @@
+"""Report the photos, interviews and documents stored for each member."""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+from rich.console import Console
+from rich.progress import Progress, BarColumn, DownloadColumn, TimeRemainingColumn
+from rich.table import Table
+
+from ..media_inventory import MEDIA_CATEGORIES, MediaHashCache, scan_media, walk_files
+
+console = Console()
+
+
+def format_bytes(size: int) -> str:
+    """Human-readable size, e.g. ``1.4 GB``."""
+    value = float(size)
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if value < 1024 or unit == 'TB':
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def collect_media_inventory(families_path: Path, branch: str = None) -> Dict[str, Any]:
+    """Per-member, per-branch and archive-wide media totals from one walk of ``families/``."""
+    inventory = {
+        'members': [],
+        'branches': {},
+        'types': {},
+        'totals': {category: {'files': 0, 'bytes': 0} for category in MEDIA_CATEGORIES}
+    }
+
+    for member in scan_media(families_path, [branch] if branch else None):
+        inventory['members'].append(member)
+        branch_totals = inventory['branches'].setdefault(member['branch'], {
+            'members': 0,
+            'members_with_media': 0,
+            'categories': {category: {'files': 0, 'bytes': 0} for category in MEDIA_CATEGORIES}
+        })
+        branch_totals['members'] += 1
+        if member['files']:
+            branch_totals['members_with_media'] += 1
+
+        for category, totals in member['categories'].items():
+            for key in ('files', 'bytes'):
+                branch_totals['categories'][category][key] += totals[key]
+                inventory['totals'][category][key] += totals[key]
+
+        for file_type, totals in member['types'].items():
+            type_totals = inventory['types'].setdefault(file_type, {'files': 0, 'bytes': 0})
+            type_totals['files'] += totals['files']
+            type_totals['bytes'] += totals['bytes']
+
+    return inventory
+
+
+def hash_media(inventory: Dict[str, Any], families_path: Path, jobs: int = 0) -> Dict[str, Any]:
+    """Add a ``sha256`` to every file of the inventory and report duplicates."""
+    cache = MediaHashCache(families_path.parent / '.gitfam' / 'cache' / 'media')
+
+    files = []
+    for member in inventory['members']:
+        for media_file in member['files']:
+            files.append((f"{member['path']}/{media_file['path']}", media_file['size'], media_file['mtime_ns']))
+
+    uncached = sum(size for path, size, mtime_ns in files if cache.lookup(path, size, mtime_ns) is None)
+
+    started = time.perf_counter()
+    with Progress("[progress.description]{task.description}", BarColumn(), DownloadColumn(),
+                  TimeRemainingColumn(), console=console, transient=True, disable=uncached == 0) as progress:
+        task = progress.add_task("Hashing media", total=uncached)
+        hashes = cache.hash_files(files, jobs=jobs, progress=lambda size: progress.advance(task, size))
+    elapsed = time.perf_counter() - started
+
+    cache.prune()
+    cache.save()
+
+    by_hash: Dict[str, List[str]] = {}
+    sizes = {}
+    for member in inventory['members']:
+        for media_file in member['files']:
+            path = f"{member['path']}/{media_file['path']}"
+            media_file['sha256'] = hashes.get(path)
+            if media_file['sha256'] and media_file['size']:
+                by_hash.setdefault(media_file['sha256'], []).append(path)
+                sizes[media_file['sha256']] = media_file['size']
+
+    duplicates = [{'sha256': sha256, 'size': sizes[sha256], 'paths': paths}
+                  for sha256, paths in by_hash.items() if len(paths) > 1]
+    duplicates.sort(key=lambda group: -group['size'] * (len(group['paths']) - 1))
+
+    return {
+        'hashed': cache.misses,
+        'cached': cache.hits,
+        'unreadable': len(files) - len(hashes),
+        'seconds': round(elapsed, 3),
+        'duplicates': duplicates
+    }
+
+
+def media_report(branch: str = None, with_hashes: bool = False, jobs: int = 0, output_format: str = 'summary'):
+    """Inventory member media and optionally hash it."""
+    console.print("\n[bold cyan]Scanning Family Media[/bold cyan]\n")
+
+    families_path = Path('families')
+    if not families_path.exists():
+        console.print("[red]Error: No families directory found.[/red]")
+        return
+
+    if branch and not (families_path / branch).exists():
+        console.print(f"[red]Error: Branch '{branch}' not found.[/red]")
+        return
+
+    inventory = collect_media_inventory(families_path, branch)
+    if with_hashes:
+        inventory['hashes'] = hash_media(inventory, families_path, jobs=jobs)
+
+    if output_format == 'json':
+        output_file = Path('media-inventory.json')
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(inventory, f, indent=2, ensure_ascii=False)
+        console.print(f"[bold green]✓ Media inventory saved to: {output_file}[/bold green]")
+    else:
+        display_media_summary(inventory)
+
+
+def display_media_summary(inventory: Dict[str, Any]):
+    """Display media totals per branch and file type in the terminal."""
+    table = Table(title="Media by Branch")
+    table.add_column("Branch", style="cyan")
+    table.add_column("Members", justify="right")
+    table.add_column("With Media", justify="right")
+    for category in MEDIA_CATEGORIES:
+        table.add_column(category.capitalize(), justify="right")
+    table.add_column("Size", justify="right", style="bold green")
+
+    for name, totals in inventory['branches'].items():
+        categories = totals['categories']
+        table.add_row(
+            name,
+            str(totals['members']),
+            str(totals['members_with_media']),
+            *[str(categories[c]['files']) for c in MEDIA_CATEGORIES],
+            format_bytes(sum(categories[c]['bytes'] for c in MEDIA_CATEGORIES))
+        )
+    console.print(table)
+
+    types = sorted(inventory['types'].items(), key=lambda item: -item[1]['bytes'])
+    if types:
+        types_table = Table(title="File Types")
+        types_table.add_column("Type", style="cyan")
+        types_table.add_column("Files", justify="right")
+        types_table.add_column("Size", justify="right", style="bold green")
+        for file_type, totals in types[:15]:
+            types_table.add_row(file_type, str(totals['files']), format_bytes(totals['bytes']))
+        if len(types) > 15:
+            types_table.add_row(f"... {len(types) - 15} more", "", "")
+        console.print(types_table)
+
+    total_files = sum(totals['files'] for totals in inventory['totals'].values())
+    total_bytes = sum(totals['bytes'] for totals in inventory['totals'].values())
+    console.print(f"\n[bold]{total_files}[/bold] media files, [bold]{format_bytes(total_bytes)}[/bold]")
+
+    hashes = inventory.get('hashes')
+    if hashes is None:
+        return
+
+    console.print(f"Hashed {hashes['hashed']} files in {hashes['seconds']:.1f}s "
+                  f"({hashes['cached']} unchanged since the last run)")
+    if hashes['unreadable']:
+        console.print(f"[yellow]{hashes['unreadable']} files could not be read[/yellow]")
+
+    duplicates = hashes['duplicates']
+    if duplicates:
+        wasted = sum(group['size'] * (len(group['paths']) - 1) for group in duplicates)
+        console.print(f"\n[yellow]{len(duplicates)} files are stored more than once "
+                      f"({format_bytes(wasted)} in extra copies):[/yellow]")
+        for group in duplicates[:10]:
+            paths = group['paths']
+            more = f" and {len(paths) - 2} more" if len(paths) > 2 else ""
+            console.print(f"  {format_bytes(group['size'])} × {len(paths)}: {', '.join(paths[:2])}{more}")
+        if len(duplicates) > 10:
+            console.print(f"  ... and {len(duplicates) - 10} more (see --format json)")
+
+
+def recording_dirs(families_path: Path, branch: str = None, member: str = None) -> List[Path]:
+    """The ``interviews/videos`` folders of the selected members."""
+    branches = [branch] if branch else sorted(
+        path.name for path in families_path.iterdir() if path.is_dir() and not path.name.startswith('.')
+    )
+    dirs = []
+    for branch_name in branches:
+        members_path = families_path / branch_name / 'members'
+        if not members_path.exists():
+            continue
+        for member_path in sorted(members_path.iterdir()):
+            if member and member_path.name != member:
+                continue
+            videos_path = member_path / 'interviews' / 'videos'
+            if videos_path.is_dir():
+                dirs.append(videos_path)
+    return dirs
+
+
+def _find_files(dirs: List[Path], select) -> List[Path]:
+    files = []
+    for videos_path in dirs:
+        for rel_parts, entry in walk_files(str(videos_path)):
+            if select(entry.name):
+                files.append(videos_path.joinpath(*rel_parts))
+    return files
+
+
+def _check_selection(families_path: Path, branch: str = None) -> bool:
+    if not families_path.exists():
+        console.print("[red]Error: No families directory found.[/red]")
+        return False
+    if branch and not (families_path / branch).exists():
+        console.print(f"[red]Error: Branch '{branch}' not found.[/red]")
+        return False
+    return True
+
+
+def pack_media(branch: str = None, member: str = None):
+    """Replace interview recordings with pointers into the chunk store."""
+    # numpy is only needed for packing, so it is not loaded for a media report
+    from ..chunk_store import STORE_DIR, VIDEO_EXTENSIONS, ChunkStore, pack_file, numpy
+
+    console.print("\n[bold cyan]Packing Interview Recordings[/bold cyan]\n")
+
+    families_path = Path('families')
+    if not _check_selection(families_path, branch):
+        return
+
+    recordings = _find_files(
+        recording_dirs(families_path, branch, member),
+        lambda name: Path(name).suffix.lower() in VIDEO_EXTENSIONS
+    )
+    if not recordings:
+        console.print("[yellow]No unpacked recordings found.[/yellow]")
+        return
+
+    if numpy is None:
+        console.print("[yellow]numpy is not installed; packing will be slow.[/yellow]")
+        console.print("[cyan]Install with: uv sync --extra media[/cyan]")
+
+    store = ChunkStore(families_path.parent / STORE_DIR)
+    total = sum(path.stat().st_size for path in recordings)
+    packed_bytes = 0
+    new_bytes = 0
+    with Progress("[progress.description]{task.description}", BarColumn(), DownloadColumn(),
+                  TimeRemainingColumn(), console=console, transient=True) as progress:
+        task = progress.add_task("Packing", total=total)
+        for path in recordings:
+            progress.update(task, description=f"Packing {path.name}")
+            try:
+                result = pack_file(store, path)
+            except OSError as e:
+                console.print(f"[yellow]Warning: Could not pack {path}: {e}[/yellow]")
+                continue
+            console.print(f"• {path}: {format_bytes(result['size'])}, "
+                          f"{format_bytes(result['new_bytes'])} new in {result['chunks']} chunks")
+            packed_bytes += result['size']
+            new_bytes += result['new_bytes']
+            progress.advance(task, result['size'])
+
+    console.print(f"\n[bold green]✓ Packed {format_bytes(packed_bytes)} of recordings; "
+                  f"the store grew by {format_bytes(new_bytes)}[/bold green]")
+    if packed_bytes > new_bytes:
+        console.print(f"  {format_bytes(packed_bytes - new_bytes)} was already stored by other recordings")
+    console.print(f"  Chunks are in [cyan]{store.root}[/cyan]; back it up together with the pointer files.")
+
+
+def unpack_media(branch: str = None, member: str = None):
+    """Restore recordings from their pointer files."""
+    from ..chunk_store import STORE_DIR, POINTER_SUFFIX, ChunkStore, unpack_file
+
+    console.print("\n[bold cyan]Unpacking Interview Recordings[/bold cyan]\n")
+
+    families_path = Path('families')
+    if not _check_selection(families_path, branch):
+        return
+
+    pointers = _find_files(
+        recording_dirs(families_path, branch, member),
+        lambda name: name.endswith(POINTER_SUFFIX)
+    )
+    if not pointers:
+        console.print("[yellow]No packed recordings found.[/yellow]")
+        return
+
+    store = ChunkStore(families_path.parent / STORE_DIR)
+    restored = 0
+    failed = 0
+    for pointer_path in pointers:
+        try:
+            result = unpack_file(store, pointer_path)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]✗ {pointer_path}: {e}[/red]")
+            failed += 1
+            continue
+        console.print(f"• {pointer_path.with_name(pointer_path.name[:-len(POINTER_SUFFIX)])}: "
+                      f"{format_bytes(result['size'])}")
+        restored += result['size']
+
+    console.print(f"\n[bold green]✓ Restored {format_bytes(restored)} of recordings[/bold green]")
+    if failed:
+        console.print(f"[red]{failed} recordings could not be restored; their pointer files were kept.[/red]")
@@ -0,0 +1,94 @@
+"""Find family members matching a set of filters."""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from ..family_index import FamilyIndex
+from ..profiling import phase
+from ..query_index import FILTERS, QueryIndex, parse_query
+
+console = Console()
+error_console = Console(stderr=True)
+
+
+def query_members(terms: List[str], output_format: str = 'table', refresh: bool = True) -> bool:
+    """Print the members matching every filter in ``terms``.
+
+    With ``refresh`` off the stored indexes are used as they are, without
+    checking profiles for changes. Returns False if the query could not be
+    run.
+    """
+    # Keep stdout clean for json and slug output
+    log = console if output_format == 'table' else error_console
+
+    try:
+        filters = parse_query(terms)
+    except ValueError as e:
+        log.print(f"[red]Error: {escape(str(e))}[/red]")
+        log.print("\nFilters:")
+        for field, description in FILTERS.items():
+            log.print(f"  [cyan]{field}[/cyan]  {escape(description)}")
+        return False
+
+    families_path = Path('families')
+    if not families_path.exists():
+        log.print("[red]Error: No families directory found.[/red]")
+        return False
+
+    started = time.perf_counter()
+    with phase('load query index'):
+        query_index = QueryIndex(families_path)
+        if refresh or not query_index.branches:
+            query_index.refresh(FamilyIndex(families_path))
+    loaded = time.perf_counter()
+    with phase('search'):
+        results = query_index.search(filters)
+    elapsed = time.perf_counter() - loaded
+
+    if output_format == 'json':
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    elif output_format == 'slugs':
+        for member in results:
+            print(member['slug'])
+    else:
+        display_results(results)
+
+    total = sum(len(branch['index']['members']) for branch in query_index.branches.values())
+    log.print(f"[dim]{len(results)} of {total} members matched in {elapsed * 1000:.1f} ms "
+              f"(indexes loaded in {(loaded - started) * 1000:.0f} ms, "
+              f"{query_index.rebuilt} branches re-indexed)[/dim]")
+    return True
+
+
+def display_results(results: List[Dict[str, Any]]):
+    """Show matching members as a table."""
+    if not results:
+        console.print("[yellow]No members match.[/yellow]")
+        return
+
+    table = Table(show_header=True)
+    table.add_column("Name", style="bold")
+    table.add_column("Slug", style="dim")
+    table.add_column("Branch", style="cyan")
+    table.add_column("Born", style="green")
+    table.add_column("Birth Place")
+    table.add_column("Interviews", justify="right", style="yellow")
+    table.add_column("Media", style="magenta")
+
+    for member in results:
+        media = ', '.join(kind for kind in ('photos', 'videos') if member[f'has_{kind}'])
+        table.add_row(
+            escape(member['name']),
+            escape(member['slug']),
+            escape(member['branch']),
+            escape(member['birth_date']),
+            escape(member['birth_place']),
+            str(member['interviews']),
+            media
+        )
+    console.print(table)
@@ -0,0 +1,82 @@
+"""Preview the website locally, rebuilding it as files change."""
+
+import time
+from pathlib import Path
+from rich.console import Console
+
+from ..preview_server import ChangeWatcher, ReloadNotifier, start_server
+from . import build_web
+
+console = Console()
+
+
+def rebuild(output_path: Path, jobs: int, notifier: ReloadNotifier, changed_paths=None, **options) -> bool:
+    """Bring the site up to date and reload open pages if anything changed.
+
+    With ``changed_paths`` only the branches those files belong to are
+    scanned again. Returns False if the build failed.
+    """
+    started = time.perf_counter()
+    try:
+        result = build_web.generate_static_site(output_path, jobs=jobs, changed_paths=changed_paths, **options)
+    except Exception as e:
+        # Keep serving the last good build while a profile or template is broken
+        console.print(f"[red]Rebuild failed: {e}[/red]")
+        return False
+    if result is None:
+        return False
+
+    elapsed = time.perf_counter() - started
+    if result['rendered'] or result['changed_files']:
+        notifier.notify()
+        console.print(f"[bold green]✓ Rebuilt in {elapsed:.2f}s; reloading open pages[/bold green]")
+    else:
+        console.print(f"[dim]Nothing changed ({elapsed:.2f}s)[/dim]")
+    return True
+
+
+def serve_site(output_path: Path, host: str = '127.0.0.1', port: int = 8000, jobs: int = 1,
+               poll_interval: float = 1.0, page_size: int = build_web.DEFAULT_PAGE_SIZE,
+               member_paths: str = 'flat', videos: bool = True):
+    """Build the site, serve it, and rebuild it whenever the archive or templates change."""
+    families_path = Path('families')
+    if not families_path.exists():
+        console.print("[red]Error: No families directory found.[/red]")
+        return
+
+    notifier = ReloadNotifier()
+    options = {'page_size': page_size, 'member_paths': member_paths, 'videos': videos}
+    rebuild(output_path, jobs, notifier, **options)
+    if not (output_path / 'index.html').exists():
+        return
+
+    package_dir = Path(__file__).parent.parent
+    watcher = ChangeWatcher([families_path, package_dir / 'web_templates', package_dir / 'web_static'],
+                            poll_interval=poll_interval)
+    try:
+        server = start_server(output_path, host, port, notifier)
+    except OSError as e:
+        console.print(f"[red]Error: Cannot listen on {host}:{port}: {e}[/red]")
+        return
+    watcher.start()
+
+    mode = "file system events" if watcher.uses_watchdog else f"polling every {poll_interval:g}s"
+    console.print(f"\n[bold green]Serving {output_path} at http://{host}:{port}/[/bold green]")
+    console.print(f"[dim]Watching families/ and the website templates ({mode}). Press Ctrl+C to stop.[/dim]")
+    if not watcher.uses_watchdog:
+        console.print("[dim]Install watchdog for instant change detection: uv sync --extra serve[/dim]")
+
+    # Changes are kept until a rebuild succeeds, so a failed one is not forgotten
+    pending = set()
+    try:
+        while True:
+            changed = watcher.wait_for_changes()
+            pending |= changed
+            console.print(f"\n[cyan]{len(changed)} file{'s' if len(changed) != 1 else ''} changed, rebuilding...[/cyan]")
+            if rebuild(output_path, jobs, notifier, changed_paths=pending, **options):
+                pending = set()
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped.[/dim]")
+    finally:
+        watcher.stop()
+        server.shutdown()
@@ -0,0 +1,241 @@
+"""Detect corrupted and missing files in member folders."""
+
+import time
+from pathlib import Path
+from typing import Dict, List
+from rich.console import Console
+from rich.progress import Progress, BarColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
+from rich.table import Table
+
+from ..checksum_manifest import CHECKSUMS_NAME, read_checksums, write_checksums
+from ..media_inventory import MediaHashCache, walk_files
+from ..profiling import count, phase
+from .media import format_bytes
+
+console = Console()
+
+STATUSES = ['ok', 'new', 'modified', 'corrupted', 'missing']
+
+
+def member_folders(families_path: Path, branch: str = None) -> List[Path]:
+    """Every member folder of the selected branches."""
+    branches = [branch] if branch else sorted(
+        path.name for path in families_path.iterdir() if path.is_dir() and not path.name.startswith('.')
+    )
+    folders = []
+    for branch_name in branches:
+        members_path = families_path / branch_name / 'members'
+        if members_path.exists():
+            folders += sorted(path for path in members_path.iterdir() if path.is_dir() and not path.name.startswith('.'))
+    return folders
+
+
+def classify(expected: str, current: str, known: bool, unchanged: bool) -> str:
+    """Status of a file from its recorded and current checksums.
+
+    ``known`` means this machine has verified the file before and
+    ``unchanged`` that its size and mtime are the same as back then. A file
+    whose content changed while its size and mtime did not, or that differs
+    from the manifest without ever having been seen here, is treated as
+    corrupted; only a change with a new size or mtime counts as an edit.
+    """
+    if expected is None:
+        return 'new'
+    if current == expected:
+        return 'ok'
+    if known and not unchanged:
+        return 'modified'
+    return 'corrupted'
+
+
+def chunk_status(store, chunk_id: str, size: int, deep: bool, hashes: Dict[str, str]) -> str:
+    """``ok``, ``missing`` or ``corrupted`` for one chunk of the media store.
+
+    Without ``deep`` only the size is checked; with it the content must
+    also hash to the chunk id (``hashes`` are from the hashing pass).
+    """
+    path = store.chunk_path(chunk_id)
+    try:
+        if path.stat().st_size != size:
+            return 'corrupted'
+    except FileNotFoundError:
+        return 'missing'
+    except OSError:
+        return 'corrupted'
+    if deep and hashes.get(path.as_posix()) != chunk_id:
+        return 'corrupted'
+    return 'ok'
+
+
+def verify_archive(branch: str = None, deep: bool = False, update: bool = False, jobs: int = 0) -> bool:
+    """Check every member file against its manifest and keep manifests current.
+
+    New and edited files are added to the manifests. Corrupted and missing
+    files are only reported, unless ``update`` accepts the files as they
+    are now. Returns False if any file is corrupted or missing.
+
+    A recording packed by ``gitfam media pack`` is checked through its
+    pointer file, which records the recording's checksum, and through the
+    chunks it lists in the media store: their sizes on every run, and their
+    content against their ids with ``deep``. Damaged chunks cannot be
+    accepted with ``update``.
+    """
+    from ..chunk_store import POINTER_SUFFIX, STORE_DIR, ChunkStore, read_pointer
+    console.print("\n[bold cyan]Verifying Family Archive[/bold cyan]\n")
+
+    families_path = Path('families')
+    if not families_path.exists():
+        console.print("[red]Error: No families directory found.[/red]")
+        return False
+    if branch and not (families_path / branch).exists():
+        console.print(f"[red]Error: Branch '{branch}' not found.[/red]")
+        return False
+
+    cache = MediaHashCache(families_path.parent / '.gitfam' / 'cache' / 'media')
+
+    # Stat everything first so all files are hashed in one parallel pass
+    members = []
+    files = []
+    chunks = {}
+    for member_path in member_folders(families_path, branch):
+        member_files = {}
+        member_pointers = {}
+        for rel_parts, entry in walk_files(str(member_path)):
+            path = member_path.joinpath(*rel_parts).as_posix()
+            if entry.name.endswith(POINTER_SUFFIX):
+                pointer = read_pointer(Path(path))
+                if pointer is not None:
+                    # A packed recording, listed under its own name
+                    member_pointers['/'.join(rel_parts)[:-len(POINTER_SUFFIX)]] = (path, pointer)
+                    chunks.update(pointer['chunks'])
+                    continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            member_files['/'.join(rel_parts)] = path
+            files.append((path, stat.st_size, stat.st_mtime_ns))
+        members.append((member_path, member_files, member_pointers))
+
+    store = ChunkStore(families_path.parent / STORE_DIR)
+    if deep:
+        for chunk_id, size in chunks.items():
+            path = store.chunk_path(chunk_id)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((path.as_posix(), stat.st_size, stat.st_mtime_ns))
+
+    count("files stat'd", len(files))
+    known = {path: path in cache.entries for path, _, _ in files}
+    unchanged = {path: cache.lookup(path, size, mtime_ns) is not None for path, size, mtime_ns in files}
+    to_read = sum(size for path, size, mtime_ns in files if deep or not unchanged[path])
+    count('bytes read', to_read)
+    count('hash cache hits', 0 if deep else sum(unchanged.values()))
+
+    started = time.perf_counter()
+    with Progress("[progress.description]{task.description}", BarColumn(), DownloadColumn(),
+                  TransferSpeedColumn(), TimeRemainingColumn(), console=console, transient=True,
+                  disable=to_read == 0) as progress:
+        task = progress.add_task("Hashing", total=to_read)
+        with phase('hash files'):
+            hashes = cache.hash_files(files, jobs=jobs, refresh=deep, progress=lambda size: progress.advance(task, size))
+    elapsed = time.perf_counter() - started
+    cache.prune()
+    cache.save()
+
+    chunk_statuses = {chunk_id: chunk_status(store, chunk_id, size, deep, hashes) for chunk_id, size in chunks.items()}
+    damaged_chunks = 0
+
+    counts = {status: 0 for status in STATUSES}
+    problems = []
+    manifests_written = 0
+    for member_path, member_files, member_pointers in members:
+        checksums = read_checksums(member_path)
+        updated = dict(checksums)
+
+        for rel_path, (path, pointer) in member_pointers.items():
+            if rel_path in member_files:
+                # Unpacked again while the pointer stayed behind; the recording counts
+                continue
+            damaged = sorted({chunk_statuses[chunk_id] for chunk_id, _ in pointer['chunks']} - {'ok'})
+            if sum(size for _, size in pointer['chunks']) != pointer['size']:
+                damaged.append('corrupted')
+            if damaged:
+                status = 'missing' if damaged == ['missing'] else 'corrupted'
+                problems.append((status, f"{path} (media store chunks)"))
+                damaged_chunks += 1
+            else:
+                # The pointer records the recording's checksum, and the pointer itself changes with it
+                status = classify(checksums.get(rel_path), pointer['sha256'], True, False)
+                if status == 'modified':
+                    problems.append((status, path))
+            counts[status] += 1
+            if status in ('new', 'modified') or update:
+                updated[rel_path] = pointer['sha256']
+
+        for rel_path, path in member_files.items():
+            current = hashes.get(path)
+            if current is None:
+                problems.append(('unreadable', path))
+                counts['corrupted'] += 1
+                continue
+            status = classify(checksums.get(rel_path), current, known[path], unchanged[path])
+            counts[status] += 1
+            if status in ('modified', 'corrupted'):
+                problems.append((status, path))
+            if status in ('new', 'modified') or update:
+                updated[rel_path] = current
+
+        for rel_path in checksums:
+            if rel_path.endswith(POINTER_SUFFIX) and rel_path[:-len(POINTER_SUFFIX)] in member_pointers:
+                # Recorded by an older verify; the recording's own entry replaces it
+                del updated[rel_path]
+                continue
+            if rel_path not in member_files and rel_path not in member_pointers:
+                counts['missing'] += 1
+                problems.append(('missing', f"{member_path.as_posix()}/{rel_path}"))
+                if update:
+                    del updated[rel_path]
+
+        if updated != checksums and write_checksums(member_path, updated):
+            manifests_written += 1
+
+    display_verify_summary(counts, problems, len(members), to_read, elapsed, manifests_written, update)
+    if damaged_chunks:
+        console.print(f"[bold red]✗ {damaged_chunks} packed recording{'s' if damaged_chunks != 1 else ''} "
+                      f"{'have' if damaged_chunks != 1 else 'has'} missing or damaged chunks in {STORE_DIR}/.[/bold red] "
+                      f"Restore {STORE_DIR}/ from a backup.")
+    return not damaged_chunks and (update or not (counts['corrupted'] or counts['missing']))
+
+
+def display_verify_summary(counts: Dict[str, int], problems: List[tuple], member_count: int,
+                           bytes_read: int, elapsed: float, manifests_written: int, update: bool):
+    """Print the verification result and every file that needs attention."""
+    styles = {'modified': 'yellow', 'corrupted': 'bold red', 'unreadable': 'bold red', 'missing': 'bold red'}
+    for status, path in problems:
+        console.print(f"[{styles[status]}]{status:>10}[/{styles[status]}]  {path}")
+
+    table = Table(show_header=False, box=None)
+    table.add_column("Status", style="cyan")
+    table.add_column("Files", style="bold green", justify="right")
+    for status in STATUSES:
+        table.add_row(status.capitalize(), str(counts[status]))
+    console.print()
+    console.print(table)
+
+    speed = f", {format_bytes(bytes_read / elapsed)}/s" if elapsed > 0 and bytes_read else ""
+    console.print(f"\nChecked {sum(counts.values())} files in {member_count} member folders; "
+                  f"read {format_bytes(bytes_read)} in {elapsed:.1f}s{speed}")
+    if manifests_written:
+        console.print(f"Updated {manifests_written} {CHECKSUMS_NAME} files")
+
+    if update:
+        console.print("[bold green]✓ Manifests now match the files on disk[/bold green]")
+    elif counts['corrupted'] or counts['missing']:
+        console.print("\n[bold red]✗ Some files are corrupted or missing.[/bold red] "
+                      "Restore them from a backup, or run [cyan]gitfam verify --update[/cyan] "
+                      "to accept the files as they are now.")
+    else:
+        console.print("[bold green]✓ All files match their checksums[/bold green]")
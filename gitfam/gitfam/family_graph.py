@@ -0,0 +1,174 @@
+"""Resolved relationship graph across all family branches.
+
+Profiles record relationships as free-form ``person`` values next to a
+``type`` (``child_of``, ``parent_of``, ``spouse_of``, ``sibling_of``). The
+graph resolves those values to member slugs, stores every edge in both
+directions and answers lineage questions in time linear in the number of
+members and relationships involved.
+"""
+
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+from .family_index import FamilyIndex
+
+# The relationship a member has to us when we have ``type`` to them
+INVERSE_RELATIONSHIPS = {
+    'child_of': 'parent_of',
+    'parent_of': 'child_of',
+    'spouse_of': 'spouse_of',
+    'sibling_of': 'sibling_of'
+}
+
+RELATIONSHIP_ORDER = ['child_of', 'spouse_of', 'sibling_of', 'parent_of']
+
+
+def normalize_person(person: Any) -> str:
+    """Turn a free-form ``person`` value into slug form."""
+    return str(person).strip().lower().replace(' ', '-')
+
+
+class FamilyGraph:
+    """Members keyed by slug with resolved, bidirectional relationship edges.
+
+    ``edges[slug][type]`` lists the slugs that ``slug`` has relationship
+    ``type`` to, so ``edges[a]['child_of']`` are the parents of ``a``.
+    Relationships whose ``person`` does not match any member are kept in
+    ``unresolved``.
+    """
+
+    def __init__(self):
+        self.members: Dict[str, Dict[str, Any]] = {}
+        self.edges: Dict[str, Dict[str, List[str]]] = {}
+        self.unresolved: Dict[str, List[Dict[str, str]]] = {}
+        self.duplicates: List[str] = []
+        self._generations = None
+
+    @classmethod
+    def from_index(cls, index: FamilyIndex) -> 'FamilyGraph':
+        """Build the graph from every branch of a family index."""
+        graph = cls()
+        relationships = []
+        for branch in index.iter_branches():
+            for record in branch['members'].values():
+                frontmatter = record['frontmatter']
+                if graph.add_member(record['slug'], frontmatter.get('name', record['slug']), branch['name']):
+                    relationships.append((record['slug'], frontmatter.get('relationships') or []))
+
+        for slug, rels in relationships:
+            for rel in rels:
+                if isinstance(rel, dict):
+                    graph.add_relationship(slug, rel.get('type', ''), rel.get('person', ''))
+        return graph
+
+    def add_member(self, slug: str, name: str, branch: str) -> bool:
+        """Add a member; returns False if the slug is already taken."""
+        if slug in self.members:
+            # Slugs are global; the first branch in name order wins
+            self.duplicates.append(slug)
+            return False
+        self.members[slug] = {'slug': slug, 'name': name, 'branch': branch}
+        self.edges[slug] = {rel_type: [] for rel_type in INVERSE_RELATIONSHIPS}
+        self._generations = None
+        return True
+
+    def resolve(self, person: Any) -> Optional[str]:
+        """The slug a ``person`` value refers to, if any member matches."""
+        if isinstance(person, str) and person in self.members:
+            return person
+        slug = normalize_person(person)
+        return slug if slug in self.members else None
+
+    def add_relationship(self, slug: str, rel_type: str, person: Any):
+        """Record ``slug`` having ``rel_type`` to ``person`` and its inverse."""
+        other = self.resolve(person)
+        if rel_type not in INVERSE_RELATIONSHIPS or other is None or other == slug:
+            self.unresolved.setdefault(slug, []).append({'type': rel_type, 'person': str(person)})
+            return
+
+        self._link(slug, rel_type, other)
+        self._link(other, INVERSE_RELATIONSHIPS[rel_type], slug)
+        self._generations = None
+
+    def _link(self, slug: str, rel_type: str, other: str):
+        targets = self.edges[slug][rel_type]
+        if other not in targets:
+            targets.append(other)
+
+    def parents(self, slug: str) -> List[str]:
+        return self.edges[slug]['child_of']
+
+    def children(self, slug: str) -> List[str]:
+        return self.edges[slug]['parent_of']
+
+    def relatives(self, slug: str) -> List[Dict[str, Any]]:
+        """Every relationship of a member, resolved ones first, for display."""
+        relatives = []
+        for rel_type in RELATIONSHIP_ORDER:
+            for other in sorted(self.edges[slug][rel_type]):
+                member = self.members[other]
+                relatives.append({'type': rel_type, 'slug': other, 'name': member['name'], 'branch': member['branch']})
+        for rel in self.unresolved.get(slug, []):
+            relatives.append({'type': rel['type'], 'slug': None, 'name': rel['person'], 'branch': None})
+        return relatives
+
+    def _walk(self, slug: str, step, max_depth: int = None) -> List[tuple]:
+        """Breadth-first walk returning ``(slug, depth)`` pairs, each member once."""
+        seen = {slug}
+        found = []
+        queue = deque([(slug, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for other in sorted(step(current)):
+                if other in seen:
+                    continue
+                seen.add(other)
+                found.append((other, depth + 1))
+                queue.append((other, depth + 1))
+        return found
+
+    def ancestors(self, slug: str, max_depth: int = None) -> List[tuple]:
+        """``(slug, generations up)`` for every ancestor, nearest first."""
+        return self._walk(slug, self.parents, max_depth)
+
+    def descendants(self, slug: str, max_depth: int = None) -> List[tuple]:
+        """``(slug, generations down)`` for every descendant, nearest first."""
+        return self._walk(slug, self.children, max_depth)
+
+    def generations(self) -> Dict[str, Optional[int]]:
+        """Generation depth of every member: 0 for members with no known parents.
+
+        A member's generation is one more than their deepest parent's.
+        Computed for the whole graph in one topological pass; members caught
+        in a parent/child cycle, and their descendants, get ``None``.
+        """
+        if self._generations is not None:
+            return self._generations
+
+        pending = {slug: len(self.parents(slug)) for slug in self.members}
+        generations = {slug: None for slug in self.members}
+        queue = deque(slug for slug, count in pending.items() if count == 0)
+        for slug in queue:
+            generations[slug] = 0
+
+        while queue:
+            slug = queue.popleft()
+            for child in self.children(slug):
+                generations[child] = max(generations[child] or 0, generations[slug] + 1)
+                pending[child] -= 1
+                if pending[child] == 0:
+                    queue.append(child)
+
+        # Members whose parents never all resolved are in a cycle or descend from one
+        for slug, count in pending.items():
+            if count:
+                generations[slug] = None
+
+        self._generations = generations
+        return generations
+
+    def generation(self, slug: str) -> Optional[int]:
+        return self.generations().get(slug)
+
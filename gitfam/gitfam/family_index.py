@@ -0,0 +1,379 @@
+"""Persistent index of family branches and member profiles.
+
+Both ``generate-website`` and ``metadata`` need the frontmatter of every
+profile and whether each member has photos or videos. The index keeps that
+information on disk under ``.gitfam/index`` together with the size and mtime
+of every file it was read from, so later runs only stat the tree and
+re-parse the profiles that actually changed. Only the frontmatter of a
+profile is ever read here; bodies are left to the commands that render them.
+
+``RevisionIndex`` builds the same records from a commit instead of the
+working tree, keyed by git object ids rather than size and mtime.
+"""
+
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from .frontmatter import parse_frontmatter, read_frontmatter
+from .git_objects import GitObjects, resolve_commit, shared_objects
+from .profiling import count, phase
+
+INDEX_VERSION = 2
+
+
+def _signature(path: Path) -> Optional[tuple]:
+    """(mtime_ns, size) of a path, or None if it does not exist."""
+    count("files stat'd")
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _has_entries(path: Path) -> bool:
+    """True if ``path`` is a directory with at least one entry."""
+    try:
+        with os.scandir(path) as entries:
+            return any(True for _ in entries)
+    except OSError:
+        return False
+
+
+def _subdirectories(path: Path) -> List[str]:
+    """Sorted names of the visible subdirectories of ``path``."""
+    try:
+        with os.scandir(path) as entries:
+            names = [entry.name for entry in entries if entry.is_dir() and not entry.name.startswith('.')]
+    except OSError:
+        return []
+    return sorted(names)
+
+
+class FamilyIndex:
+    """Cached view of ``families/`` that is refreshed with a stat pass.
+
+    Branch records hold the branch name, the description taken from its
+    README and a dict of member records keyed by slug. Member records hold
+    the parsed frontmatter plus ``has_photos``/``has_videos`` flags; the
+    profile body is not kept and has to be read from ``profile_path`` by
+    commands that need it.
+
+    Each branch is stored in its own file and loaded on first access, so a
+    caller can walk a large archive one branch at a time with
+    ``iter_branches`` instead of holding every record in memory.
+    """
+
+    def __init__(self, families_path: Path = Path('families'), cache_dir: Path = None):
+        self.families_path = families_path
+        self.cache_dir = cache_dir or families_path.parent / '.gitfam' / 'index'
+        self.branches: Dict[str, Dict[str, Any]] = {}
+        self.parsed = 0
+        self._names = None
+        self._fresh = set()
+        self._dirty = False
+
+    def _shard_path(self, name: str) -> Path:
+        return self.cache_dir / 'branches' / f'{name}.pickle'
+
+    def _load_shard(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read a persisted branch record, or None if it is missing or stale."""
+        try:
+            with open(self._shard_path(name), 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+
+        if isinstance(stored, dict) and stored.get('version') == INDEX_VERSION:
+            return stored['branch']
+        return None
+
+    def _save_shard(self, branch: Dict[str, Any]):
+        shard_path = self._shard_path(branch['name'])
+        shard_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = shard_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'branch': branch}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(shard_path)
+
+    def stored_signature(self, name: str) -> Optional[tuple]:
+        """(mtime_ns, size) of a branch's stored record, which is rewritten whenever the branch changes."""
+        return _signature(self._shard_path(name))
+
+    def branch(self, name: str) -> Dict[str, Any]:
+        """The up-to-date record of a branch, loading and refreshing it on first use."""
+        branch = self.branches.get(name)
+        if branch is not None:
+            return branch
+
+        stored = self._load_shard(name)
+        branch = stored or {'name': name, 'readme': None, 'description': None, 'members': {}}
+        # A released branch was already refreshed and saved by this instance
+        if name not in self._fresh or stored is None:
+            self._dirty = False
+            with phase('scan index'):
+                self._refresh_branch(branch)
+            if self._dirty:
+                self._save_shard(branch)
+            self._fresh.add(name)
+        self.branches[name] = branch
+        return branch
+
+    def assume_unchanged(self, branch_names: Iterable[str]):
+        """Use the stored records of these branches without a stat pass.
+
+        For callers that know, for example from a file watcher, that nothing
+        below the branches changed since the records were saved. Branches
+        without a stored record are still scanned.
+        """
+        self._fresh.update(branch_names)
+
+    def release(self, name: str):
+        """Drop a branch record from memory; it is reloaded on next access."""
+        self.branches.pop(name, None)
+
+    def refresh(self, branch_names: Iterable[str] = None) -> 'FamilyIndex':
+        """Bring the index up to date with the files on disk and save it.
+
+        Only the given branches are refreshed when ``branch_names`` is passed;
+        otherwise every branch is, and branches that no longer exist are
+        dropped.
+        """
+        if branch_names is None:
+            branch_names = self.branch_names()
+            self._prune(branch_names)
+
+        for name in branch_names:
+            self.branch(name)
+        return self
+
+    def _prune(self, branch_names: List[str]):
+        """Delete stored records of branches that no longer exist."""
+        shards_dir = self.cache_dir / 'branches'
+        if not shards_dir.exists():
+            return
+        keep = set(branch_names)
+        for shard_path in shards_dir.glob('*.pickle'):
+            if shard_path.stem not in keep:
+                shard_path.unlink()
+
+    def iter_branches(self) -> Iterator[Dict[str, Any]]:
+        """Yield every branch record in name order, releasing each after use."""
+        names = self.branch_names()
+        self._prune(names)
+        for name in names:
+            loaded = name in self.branches
+            yield self.branch(name)
+            if not loaded:
+                self.release(name)
+
+    def _refresh_branch(self, branch: Dict[str, Any]):
+        branch_path = self.families_path / branch['name']
+        readme_path = branch_path / 'README.md'
+        readme_signature = _signature(readme_path)
+        if readme_signature != branch['readme']:
+            branch['readme'] = readme_signature
+            branch['description'] = None
+            if readme_signature is not None:
+                _, body = parse_frontmatter(readme_path.read_text(encoding='utf-8'))
+                branch['description'] = body.split('\n')[0].replace('#', '').strip()
+            self._dirty = True
+
+        members = branch['members']
+        slugs = [slug for slug in _subdirectories(branch_path / 'members')
+                 if (branch_path / 'members' / slug / 'profile.md').exists()]
+        for slug in set(members) - set(slugs):
+            del members[slug]
+            self._dirty = True
+
+        for slug in slugs:
+            self._refresh_member(branch, slug)
+
+        # Keep members in slug order so consumers see a stable ordering
+        if list(members) != slugs:
+            branch['members'] = {slug: members[slug] for slug in slugs}
+
+    def _refresh_member(self, branch: Dict[str, Any], slug: str):
+        member_path = self.families_path / branch['name'] / 'members' / slug
+        profile_path = member_path / 'profile.md'
+        photos_path = member_path / 'photos'
+        videos_path = member_path / 'interviews' / 'videos'
+
+        profile_signature = _signature(profile_path)
+        photos_signature = _signature(photos_path)
+        videos_signature = _signature(videos_path)
+
+        record = branch['members'].get(slug)
+        if record is None:
+            record = {
+                'slug': slug,
+                'branch': branch['name'],
+                'profile_path': profile_path.as_posix(),
+                'profile': None,
+                'photos': None,
+                'videos': None,
+                'has_photos': False,
+                'has_videos': False
+            }
+            branch['members'][slug] = record
+
+        if record['profile'] != profile_signature:
+            record['profile'] = profile_signature
+            record['error'] = None
+            try:
+                frontmatter = read_frontmatter(profile_path)
+                record['frontmatter'] = frontmatter if isinstance(frontmatter, dict) else {}
+            except (OSError, UnicodeDecodeError) as e:
+                record['frontmatter'] = {}
+                record['error'] = str(e)
+            self.parsed += 1
+            self._dirty = True
+        else:
+            count('index cache hits')
+
+        # A directory's mtime changes whenever entries are added or removed
+        if record['photos'] != photos_signature:
+            record['photos'] = photos_signature
+            record['has_photos'] = _has_entries(photos_path)
+            self._dirty = True
+
+        if record['videos'] != videos_signature:
+            record['videos'] = videos_signature
+            record['has_videos'] = _has_entries(videos_path)
+            self._dirty = True
+
+    def branch_names(self) -> List[str]:
+        """Names of all branches on disk in sorted order."""
+        if self._names is None:
+            self._names = _subdirectories(self.families_path)
+        return self._names
+
+    def members(self, branch_name: str) -> List[Dict[str, Any]]:
+        """Member records of a branch in slug order."""
+        return list(self.branch(branch_name)['members'].values())
+
+
+class RevisionIndex(FamilyIndex):
+    """``FamilyIndex`` of ``families/`` as it is in the commit ``rev``.
+
+    Trees and profiles are read from the object store through
+    ``GitObjects``, so the commit does not have to be checked out. Records
+    store the object ids they were built from where the working tree index
+    stores sizes and mtimes: a branch or member whose tree id is unchanged
+    is skipped without reading anything below it, and a profile is only
+    parsed again when its blob id changed. Photos and videos are detected
+    from tree entries alone, so media kept in Git LFS is never downloaded.
+
+    Member records also carry ``profile_oid``, the blob to read the profile
+    body from. Records are stored apart from the working tree index and
+    shared by all revisions.
+    """
+
+    def __init__(self, rev: str, families_path: Path = Path('families'), objects: GitObjects = None):
+        super().__init__(families_path, families_path.parent / '.gitfam' / 'index' / 'git')
+        self.objects = objects or shared_objects()
+        self.rev = rev
+        self.commit = resolve_commit(self.objects, rev)
+        self.families = self.objects.tree(f'{self.commit}:./{families_path.as_posix()}')
+
+    def branch_names(self) -> List[str]:
+        """Names of all branches in the commit in sorted order."""
+        if self._names is None:
+            self._names = sorted(name for name, (is_tree, _) in self.families.items()
+                                 if is_tree and not name.startswith('.'))
+        return self._names
+
+    def _refresh_branch(self, branch: Dict[str, Any]):
+        tree_oid = self.families.get(branch['name'], (False, None))[1]
+        if branch.get('tree') == tree_oid:
+            count('index cache hits', len(branch['members']))
+            return
+        branch['tree'] = tree_oid
+        self._dirty = True
+
+        entries = self.objects.tree(tree_oid)
+        readme_oid = entries.get('README.md', (False, None))[1]
+        if readme_oid != branch['readme']:
+            branch['readme'] = readme_oid
+            branch['description'] = None
+            if readme_oid is not None:
+                _, body = parse_frontmatter(self._read_text(readme_oid))
+                branch['description'] = body.split('\n')[0].replace('#', '').strip()
+
+        is_tree, members_oid = entries.get('members', (False, None))
+        member_trees = self.objects.tree(members_oid) if is_tree else {}
+        members = branch['members']
+        refreshed = {}
+        for slug in sorted(member_trees):
+            is_tree, member_oid = member_trees[slug]
+            if not is_tree or slug.startswith('.'):
+                continue
+            record = members.get(slug)
+            if record is not None and record['tree'] == member_oid:
+                count('index cache hits')
+            else:
+                record = self._refresh_member_tree(branch, slug, member_oid, record)
+            if record is not None:
+                refreshed[slug] = record
+        branch['members'] = refreshed
+
+    def _refresh_member_tree(self, branch: Dict[str, Any], slug: str, tree_oid: str,
+                             record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The record of a member whose tree changed, or None if it has no profile."""
+        entries = self.objects.tree(tree_oid)
+        profile = entries.get('profile.md')
+        if profile is None or profile[0]:
+            return None
+        profile_oid = profile[1]
+
+        if record is None:
+            record = {
+                'slug': slug,
+                'branch': branch['name'],
+                'profile_path': (self.families_path / branch['name'] / 'members' / slug / 'profile.md').as_posix(),
+                'profile': None
+            }
+        record['tree'] = tree_oid
+
+        if record['profile'] != profile_oid:
+            record['profile'] = record['profile_oid'] = profile_oid
+            record['error'] = None
+            try:
+                frontmatter, _ = parse_frontmatter(self._read_text(profile_oid))
+                record['frontmatter'] = frontmatter if isinstance(frontmatter, dict) else {}
+            except UnicodeDecodeError as e:
+                record['frontmatter'] = {}
+                record['error'] = str(e)
+            self.parsed += 1
+        else:
+            count('index cache hits')
+
+        # git does not store empty directories, so a tree always has entries
+        photos = entries.get('photos', (False, None))
+        record['photos'] = photos[1]
+        record['has_photos'] = photos[0]
+        interviews = entries.get('interviews', (False, None))
+        videos = self.objects.tree(interviews[1]).get('videos', (False, None)) if interviews[0] else (False, None)
+        record['videos'] = videos[1]
+        record['has_videos'] = videos[0]
+        return record
+
+    def _read_text(self, oid: str) -> str:
+        content = self.objects.read(oid)[2]
+        count('files read')
+        count('bytes read', len(content))
+        return content.decode('utf-8')
+
+
+def open_family_index(families_path: Path = Path('families'), rev: str = None) -> FamilyIndex:
+    """The index of the working tree, or of the commit ``rev`` when one is given."""
+    if rev is not None:
+        return RevisionIndex(rev, families_path)
+    return FamilyIndex(families_path)
+
+
+def load_family_index(families_path: Path = Path('families'), branch_names: Iterable[str] = None) -> FamilyIndex:
+    """Load the persisted index for ``families_path`` and refresh it."""
+    return FamilyIndex(families_path).refresh(branch_names)
@@ -0,0 +1,75 @@
+"""YAML frontmatter parsing and YAML output shared by all commands."""
+
+from pathlib import Path
+from typing import Dict, Any, TextIO
+import yaml
+
+from .profiling import count, phase
+
+# libyaml's C loader and dumper are several times faster than the pure-Python ones
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+Dumper = getattr(yaml, 'CDumper', yaml.Dumper)
+
+DELIMITER = '---'
+
+
+def load_yaml(text: str) -> Any:
+    """Safely load a YAML document, using libyaml when it is available."""
+    count('yaml parses')
+    with phase('parse yaml'):
+        return yaml.load(text, Loader=SafeLoader)
+
+
+def dump_yaml(data: Any, stream: TextIO):
+    """Write ``data`` as block-style YAML, using libyaml when it is available."""
+    yaml.dump(data, stream, Dumper=Dumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+
+def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
+    """Parse YAML frontmatter from markdown file."""
+    if not content.startswith(DELIMITER):
+        return {}, content
+
+    parts = content.split(DELIMITER, 2)
+    if len(parts) < 3:
+        return {}, content
+
+    try:
+        frontmatter = load_yaml(parts[1])
+        body = parts[2].strip()
+        return frontmatter or {}, body
+    except:
+        return {}, content
+
+
+def read_frontmatter(path: Path) -> Dict[str, Any]:
+    """Read only the frontmatter of a markdown file.
+
+    The file is read line by line up to the closing delimiter, so the body
+    of long profiles is never loaded. Gives the same result as the
+    frontmatter returned by ``parse_frontmatter`` for the whole file.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if not first.startswith(DELIMITER):
+            return {}
+
+        lines = []
+        line = first[len(DELIMITER):]
+        while line:
+            end = line.find(DELIMITER)
+            if end != -1:
+                lines.append(line[:end])
+                break
+            lines.append(line)
+            line = f.readline()
+        else:
+            # No closing delimiter
+            return {}
+    count('files read')
+    count('bytes read', len(first) + sum(len(line) for line in lines))
+
+    try:
+        return load_yaml(''.join(lines)) or {}
+    except:
+        return {}
@@ -0,0 +1,466 @@
+"""Read and write GEDCOM files, and read people from CSV files.
+
+Both readers return the same shape: a dict of person records keyed by the
+id used in the source file, in file order, with ``parents``, ``spouses``
+and ``children`` lists holding the ids of related people. ``gitfam import``
+turns these records into member folders.
+
+GEDCOM files are parsed one line at a time and one level-0 record at a
+time, so only the compact person records are held in memory, never the
+whole file. Files older than GEDCOM 5.5.1 may be ANSEL-encoded; only
+UTF-8 and ASCII are decoded faithfully here, other bytes are replaced.
+
+The writing side turns member frontmatter into GEDCOM lines one record at a
+time for ``gitfam export``; files are written as GEDCOM 5.5.1, the first
+version that allows UTF-8, which they always use.
+"""
+
+import csv
+import re
+from typing import Dict, List, Any, Iterable, Iterator, Optional, TextIO, Tuple
+
+MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+}
+
+# Individual events and attributes kept as major events, with their labels
+INDIVIDUAL_EVENTS = {
+    'BAPM': 'Baptized',
+    'CHR': 'Christened',
+    'CONF': 'Confirmed',
+    'DEAT': 'Died',
+    'BURI': 'Buried',
+    'CREM': 'Cremated',
+    'EMIG': 'Emigrated',
+    'IMMI': 'Immigrated',
+    'NATU': 'Naturalized',
+    'GRAD': 'Graduated',
+    'RETI': 'Retired',
+    'OCCU': 'Occupation',
+    'EVEN': 'Event'
+}
+
+FAMILY_EVENTS = {
+    'MARR': 'Married',
+    'DIV': 'Divorced'
+}
+
+_LINE = re.compile(r'\s*(\d+)\s+(?:(@[^@]+@)\s+)?(\S+)(?: (.*))?')
+_ISO_DATE = re.compile(r'\d{4}(-\d{2}(-\d{2})?)?')
+_YEAR = re.compile(r'\b(\d{3,4})\b')
+
+
+def new_person(person_id: str) -> Dict[str, Any]:
+    return {
+        'id': person_id,
+        'name': '',
+        'sex': '',
+        'birth_date': '',
+        'birth_place': '',
+        'current_residence': '',
+        'events': [],
+        'parents': [],
+        'spouses': [],
+        'children': []
+    }
+
+
+def normalize_date(text: str) -> str:
+    """A ``YYYY-MM-DD``, ``YYYY-MM`` or ``YYYY`` date from an ISO or GEDCOM date.
+
+    GEDCOM dates such as ``12 MAR 1901`` become ``1901-03-12``. Approximate
+    dates (``ABT 1900``, ``BET 1900 AND 1905``) keep only the year of their
+    first date. Returns an empty string if no year can be found.
+    """
+    text = (text or '').strip()
+    if _ISO_DATE.fullmatch(text):
+        return text
+
+    words = text.upper().split()
+    if len(words) == 3 and words[0].isdigit() and words[1] in MONTHS and words[2].isdigit():
+        return f'{int(words[2]):04d}-{MONTHS[words[1]]:02d}-{int(words[0]):02d}'
+    if len(words) == 2 and words[0] in MONTHS and words[1].isdigit():
+        return f'{int(words[1]):04d}-{MONTHS[words[0]]:02d}'
+
+    match = _YEAR.search(text)
+    return match.group(1) if match else ''
+
+
+def year_of(date: str) -> str:
+    return date.split('-')[0] if date else ''
+
+
+def iter_gedcom_records(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield every level-0 record of a GEDCOM file as a tree of nodes.
+
+    Nodes are dicts with ``tag``, ``xref``, ``value`` and ``children``;
+    ``CONT`` and ``CONC`` lines are folded into the value they continue.
+    """
+    record = None
+    stack: List[Dict[str, Any]] = []
+    for line in stream:
+        match = _LINE.match(line)
+        if not match:
+            continue
+        level = int(match.group(1))
+        value = (match.group(4) or '').replace('@@', '@')
+        node = {'tag': match.group(3).upper(), 'xref': match.group(2), 'value': value, 'children': []}
+
+        if level == 0:
+            if record is not None:
+                yield record
+            record = node
+            stack = [node]
+            continue
+        if record is None or level > len(stack):
+            continue
+
+        del stack[level:]
+        parent = stack[-1]
+        if node['tag'] == 'CONT':
+            parent['value'] += '\n' + node['value']
+        elif node['tag'] == 'CONC':
+            parent['value'] += node['value']
+        else:
+            parent['children'].append(node)
+            stack.append(node)
+
+    if record is not None:
+        yield record
+
+
+def _child(node: Dict[str, Any], tag: str) -> Optional[Dict[str, Any]]:
+    for child in node['children']:
+        if child['tag'] == tag:
+            return child
+    return None
+
+
+def _child_value(node: Dict[str, Any], tag: str) -> str:
+    child = _child(node, tag)
+    return child['value'].strip() if child else ''
+
+
+def gedcom_name(node: Dict[str, Any]) -> str:
+    """``John /Smith/ Jr.`` as ``John Smith Jr.``, falling back to GIVN and SURN."""
+    name = ' '.join(node['value'].replace('/', ' ').split())
+    if not name:
+        name = ' '.join(part for part in (_child_value(node, 'GIVN'), _child_value(node, 'SURN')) if part)
+    return name
+
+
+def _event_text(label: str, node: Dict[str, Any]) -> str:
+    value = node['value'].strip()
+    if node['tag'] == 'EVEN' and _child_value(node, 'TYPE'):
+        label = _child_value(node, 'TYPE')
+    text = f'{label}: {value}' if value and value.upper() != 'Y' else label
+    place = _child_value(node, 'PLAC')
+    return f'{text} in {place}' if place else text
+
+
+def _read_individual(record: Dict[str, Any]) -> Dict[str, Any]:
+    person = new_person(record['xref'])
+    for node in record['children']:
+        tag = node['tag']
+        if tag == 'NAME' and not person['name']:
+            person['name'] = gedcom_name(node)
+        elif tag == 'SEX':
+            person['sex'] = node['value'].strip().upper()[:1]
+        elif tag == 'BIRT' and not person['birth_date']:
+            person['birth_date'] = normalize_date(_child_value(node, 'DATE'))
+            person['birth_place'] = _child_value(node, 'PLAC')
+        elif tag == 'RESI':
+            person['current_residence'] = _child_value(node, 'PLAC') or ' '.join(_child_value(node, 'ADDR').split())
+        elif tag in INDIVIDUAL_EVENTS:
+            person['events'].append({
+                'date': normalize_date(_child_value(node, 'DATE')),
+                'event': _event_text(INDIVIDUAL_EVENTS[tag], node)
+            })
+    return person
+
+
+def read_gedcom(stream: TextIO) -> Tuple[Dict[str, Dict[str, Any]], int, List[str]]:
+    """People of a GEDCOM file, the number of family records and any warnings."""
+    people: Dict[str, Dict[str, Any]] = {}
+    families = []
+    for record in iter_gedcom_records(stream):
+        if record['tag'] == 'INDI' and record['xref']:
+            people[record['xref']] = _read_individual(record)
+        elif record['tag'] == 'FAM':
+            family = {'partners': [], 'children': [], 'events': []}
+            for node in record['children']:
+                if node['tag'] in ('HUSB', 'WIFE'):
+                    family['partners'].append(node['value'].strip())
+                elif node['tag'] == 'CHIL':
+                    family['children'].append(node['value'].strip())
+                elif node['tag'] in FAMILY_EVENTS:
+                    family['events'].append((FAMILY_EVENTS[node['tag']], normalize_date(_child_value(node, 'DATE')),
+                                             _child_value(node, 'PLAC')))
+            families.append(family)
+
+    warnings = []
+    for family in families:
+        partners = [person_id for person_id in family['partners'] if person_id in people]
+        children = [person_id for person_id in family['children'] if person_id in people]
+        missing = [person_id for person_id in family['partners'] + family['children'] if person_id not in people]
+        if missing:
+            warnings.append(f"Family refers to unknown individuals: {', '.join(missing)}")
+
+        for partner in partners:
+            for other in partners:
+                if other != partner:
+                    _add_link(people[partner], 'spouses', other)
+                    for label, date, place in family['events']:
+                        event = f"{label} {people[other]['name'] or 'unknown'}"
+                        people[partner]['events'].append({'date': date, 'event': f'{event} in {place}' if place else event})
+            for child in children:
+                _add_link(people[partner], 'children', child)
+                _add_link(people[child], 'parents', partner)
+
+    return people, len(families), warnings
+
+
+def _add_link(person: Dict[str, Any], field: str, other_id: str):
+    if other_id not in person[field]:
+        person[field].append(other_id)
+
+
+CSV_COLUMNS = {
+    'id': 'id',
+    'name': 'name',
+    'full_name': 'name',
+    'given_name': 'given_name',
+    'surname': 'surname',
+    'sex': 'sex',
+    'gender': 'sex',
+    'birth_date': 'birth_date',
+    'birth_place': 'birth_place',
+    'current_residence': 'current_residence',
+    'residence': 'current_residence',
+    'death_date': 'death_date',
+    'death_place': 'death_place',
+    'father': 'father',
+    'mother': 'mother',
+    'parents': 'parents',
+    'spouse': 'spouses',
+    'spouses': 'spouses'
+}
+
+
+def _split_ids(value: str) -> List[str]:
+    return [part.strip() for part in re.split(r'[;|]', value or '') if part.strip()]
+
+
+def read_csv(stream: TextIO) -> Tuple[Dict[str, Dict[str, Any]], int, List[str]]:
+    """People of a CSV file with one row per person.
+
+    Columns are matched by name, ignoring case: ``id``, ``name`` (or
+    ``given_name`` and ``surname``), ``sex``, ``birth_date``,
+    ``birth_place``, ``current_residence``, ``death_date``, ``death_place``,
+    and ``father``, ``mother``, ``parents`` and ``spouses`` holding ids of
+    other rows, several separated by ``;``. Rows without an ``id`` column
+    are numbered from 1. Returns the people, 0 families and any warnings.
+    """
+    reader = csv.DictReader(stream)
+    columns = {}
+    for column in reader.fieldnames or []:
+        key = column.strip().lower().replace(' ', '_')
+        if key in CSV_COLUMNS:
+            columns[column] = CSV_COLUMNS[key]
+
+    people: Dict[str, Dict[str, Any]] = {}
+    links = []
+    warnings = []
+    for row_number, row in enumerate(reader, start=1):
+        values = {field: (row.get(column) or '').strip() for column, field in columns.items()}
+        person_id = values.get('id') or str(row_number)
+        if person_id in people:
+            warnings.append(f"Row {row_number}: duplicate id '{person_id}' skipped")
+            continue
+
+        person = new_person(person_id)
+        person['name'] = values.get('name') or ' '.join(
+            part for part in (values.get('given_name'), values.get('surname')) if part
+        )
+        person['sex'] = values.get('sex', '')[:1].upper()
+        person['birth_date'] = normalize_date(values.get('birth_date', ''))
+        person['birth_place'] = values.get('birth_place', '')
+        person['current_residence'] = values.get('current_residence', '')
+        if values.get('death_date') or values.get('death_place'):
+            place = values.get('death_place')
+            person['events'].append({
+                'date': normalize_date(values.get('death_date', '')),
+                'event': f'Died in {place}' if place else 'Died'
+            })
+        people[person_id] = person
+
+        parents = [values.get('father'), values.get('mother')] + _split_ids(values.get('parents'))
+        links += [(person_id, 'parents', parent) for parent in parents if parent]
+        links += [(person_id, 'spouses', spouse) for spouse in _split_ids(values.get('spouses'))]
+
+    for person_id, field, other_id in links:
+        if other_id not in people:
+            warnings.append(f"'{person_id}' refers to unknown id '{other_id}'")
+            continue
+        _add_link(people[person_id], field, other_id)
+        if field == 'parents':
+            _add_link(people[other_id], 'children', person_id)
+        else:
+            _add_link(people[other_id], 'spouses', person_id)
+
+    return people, 0, warnings
+
+
+# Longest value written on one line before it is continued with CONC
+MAX_LINE_VALUE = 200
+
+MONTH_NAMES = {number: name for name, number in MONTHS.items()}
+
+# Event labels written by ``gitfam import``, mapped back to their GEDCOM tags
+EVENT_TAGS = {label: tag for tag, label in INDIVIDUAL_EVENTS.items() if tag != 'EVEN'}
+
+
+def gedcom_date(value: Any) -> str:
+    """A GEDCOM date from a frontmatter date: ``1901-03-12`` becomes ``12 MAR 1901``.
+
+    Values that are not ISO dates or years are written as a date phrase in
+    parentheses, which GEDCOM readers keep as text.
+    """
+    text = str(value or '').strip()
+    if not text:
+        return ''
+    if _ISO_DATE.fullmatch(text):
+        parts = text.split('-')
+        if len(parts) == 3:
+            return f'{int(parts[2])} {MONTH_NAMES.get(int(parts[1]), parts[1])} {parts[0]}'
+        if len(parts) == 2:
+            return f'{MONTH_NAMES.get(int(parts[1]), parts[1])} {parts[0]}'
+        return parts[0]
+    return f'({text})'
+
+
+def gedcom_lines(level: int, tag: str, value: Any = '') -> List[str]:
+    """The lines of one GEDCOM tag, with CONT and CONC lines for long or multi-line values."""
+    prefix = f'{level} {tag}'
+    text = str(value if value is not None else '')
+    lines = []
+    for number, part in enumerate(text.split('\n')):
+        tag_prefix = prefix if number == 0 else f'{level + 1} CONT'
+        # Split before escaping so that an escaped @@ is never cut in half
+        chunks = [part[i:i + MAX_LINE_VALUE].replace('@', '@@')
+                  for i in range(0, len(part), MAX_LINE_VALUE)] or ['']
+        lines.append(f'{tag_prefix} {chunks[0]}'.rstrip())
+        lines += [f'{level + 1} CONC {chunk}' for chunk in chunks[1:]]
+    return lines
+
+
+def pointer_line(level: int, tag: str, xref: str) -> str:
+    """A line whose value is a pointer to another record, such as ``1 FAMC @F1@``."""
+    return f'{level} {tag} {xref}'
+
+
+def gedcom_header(source_version: str, date: str) -> List[str]:
+    """HEAD and SUBM records of an exported file."""
+    return [
+        '0 HEAD',
+        '1 SOUR GITFAM',
+        f'2 VERS {source_version}',
+        '2 NAME GitFam',
+        f'1 DATE {date}',
+        '1 SUBM @SUBM@',
+        '1 GEDC',
+        '2 VERS 5.5.1',
+        '2 FORM LINEAGE-LINKED',
+        '1 CHAR UTF-8',
+        '0 @SUBM@ SUBM',
+        '1 NAME GitFam'
+    ]
+
+
+def gedcom_personal_name(name: str) -> str:
+    """``John Smith`` as ``John /Smith/``, taking the last word as the surname."""
+    words = name.split()
+    if len(words) < 2:
+        return name
+    return f"{' '.join(words[:-1])} /{words[-1]}/"
+
+
+def _event_lines(event: Dict[str, Any]) -> List[str]:
+    text = str(event.get('event') or '').strip()
+    date = gedcom_date(event.get('date'))
+
+    tag, value, place = 'EVEN', '', ''
+    for label, label_tag in EVENT_TAGS.items():
+        if text == label or text.startswith(label + ' in ') or text.startswith(label + ': '):
+            tag = label_tag
+            rest = text[len(label):]
+            if rest.startswith(': '):
+                value, _, place = rest[2:].partition(' in ')
+            elif rest.startswith(' in '):
+                place = rest[4:]
+            break
+
+    lines = gedcom_lines(1, tag, value)
+    if tag == 'EVEN':
+        lines += gedcom_lines(2, 'TYPE', text)
+    if date:
+        lines += gedcom_lines(2, 'DATE', date)
+    if place:
+        lines += gedcom_lines(2, 'PLAC', place)
+    return lines
+
+
+def individual_record(xref: str, slug: str, frontmatter: Dict[str, Any], sex: str,
+                      child_of: Optional[str], spouse_of: Iterable[str]) -> List[str]:
+    """The INDI record of one member, linked to the families they belong to."""
+    lines = [f'0 {xref} INDI']
+    name = str(frontmatter.get('name') or slug)
+    lines += gedcom_lines(1, 'NAME', gedcom_personal_name(name))
+    if sex:
+        lines += gedcom_lines(1, 'SEX', sex)
+
+    birth_date = gedcom_date(frontmatter.get('birth_date'))
+    birth_place = str(frontmatter.get('birth_place') or '').strip()
+    if birth_date or birth_place:
+        lines += gedcom_lines(1, 'BIRT')
+        if birth_date:
+            lines += gedcom_lines(2, 'DATE', birth_date)
+        if birth_place:
+            lines += gedcom_lines(2, 'PLAC', birth_place)
+
+    residence = str(frontmatter.get('current_residence') or '').strip()
+    if residence:
+        lines += gedcom_lines(1, 'RESI')
+        lines += gedcom_lines(2, 'PLAC', residence)
+
+    for event in frontmatter.get('major_events') or []:
+        if isinstance(event, dict) and event.get('event'):
+            lines += _event_lines(event)
+
+    if child_of:
+        lines.append(pointer_line(1, 'FAMC', child_of))
+    for family in spouse_of:
+        lines.append(pointer_line(1, 'FAMS', family))
+    lines += gedcom_lines(1, 'REFN', slug)
+    return lines
+
+
+def family_record(xref: str, partners: List[Tuple[str, str]], children: List[str]) -> List[str]:
+    """A FAM record; ``partners`` are ``(xref, sex)`` pairs.
+
+    A partner recorded as female is the WIFE; otherwise the first partner
+    is the HUSB and the second the WIFE, since GEDCOM 5.5.1 has no other
+    roles.
+    """
+    lines = [f'0 {xref} FAM']
+    if len(partners) == 2 and partners[0][1] == 'F' and partners[1][1] != 'F':
+        partners = [partners[1], partners[0]]
+    if len(partners) == 1 and partners[0][1] == 'F':
+        lines.append(pointer_line(1, 'WIFE', partners[0][0]))
+    else:
+        for tag, (partner, _) in zip(('HUSB', 'WIFE'), partners):
+            lines.append(pointer_line(1, tag, partner))
+    for child in children:
+        lines.append(pointer_line(1, 'CHIL', child))
+    return lines
@@ -0,0 +1,110 @@
+"""Reading trees and blobs straight from the git object store.
+
+``--rev`` builds read the archive as it was at a commit without checking it
+out. Every object goes through one long-running ``git cat-file --batch``
+process per Python process, so listing a tree or reading a profile costs a
+pipe round trip instead of a new git process. Only the objects asked for
+are read; media files are seen as tree entries, so LFS content is never
+fetched.
+"""
+
+import atexit
+import os
+import subprocess
+from typing import Dict, Optional, Tuple
+
+from .profiling import count, phase
+
+TREE_MODE = b'40000'
+
+_shared = None
+
+
+class GitObjects:
+    """A ``git cat-file --batch`` process for the repository containing ``cwd``."""
+
+    def __init__(self, cwd: str = '.'):
+        try:
+            self.process = subprocess.Popen(
+                ['git', 'cat-file', '--batch'], cwd=cwd,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            raise ValueError(f"Cannot run git: {e}")
+        self.pid = os.getpid()
+
+    def read(self, spec: str) -> Optional[Tuple[str, str, bytes]]:
+        """``(object id, type, content)`` of an object, or None if it does not exist.
+
+        ``spec`` is anything ``git rev-parse`` accepts, such as an object id
+        or ``<rev>:./families``, where ``./`` is relative to ``cwd``.
+        """
+        if '\n' in spec:
+            return None
+        with phase('read git objects'):
+            try:
+                self.process.stdin.write(spec.encode('utf-8') + b'\n')
+                self.process.stdin.flush()
+                header = self.process.stdout.readline()
+            except OSError:
+                header = b''
+            if not header:
+                # git exited, for example outside a repository
+                message = self.process.stderr.read().decode('utf-8', 'replace').strip()
+                raise ValueError(message.removeprefix('fatal: ') or "git cat-file exited")
+
+            fields = header.split()
+            # "<spec> missing" or "<spec> ambiguous"
+            if len(fields) != 3:
+                return None
+            oid, object_type, size = fields
+            content = self.process.stdout.read(int(size))
+            self.process.stdout.read(1)
+        count('git objects read')
+        count('git bytes read', len(content))
+        return oid.decode('ascii'), object_type.decode('ascii'), content
+
+    def tree(self, spec: str) -> Dict[str, Tuple[bool, str]]:
+        """Entries of a tree as ``{name: (is_tree, object id)}``; empty if it is missing or not a tree."""
+        found = self.read(spec)
+        if found is None or found[1] != 'tree':
+            return {}
+        oid, _, content = found
+        # Object ids in a tree are raw bytes: 20 for SHA-1 repositories, 32 for SHA-256
+        oid_size = len(oid) // 2
+        entries = {}
+        position = 0
+        while position < len(content):
+            space = content.index(b' ', position)
+            nul = content.index(b'\0', space)
+            mode = content[position:space]
+            name = content[space + 1:nul].decode('utf-8', 'surrogateescape')
+            entries[name] = (mode == TREE_MODE, content[nul + 1:nul + 1 + oid_size].hex())
+            position = nul + 1 + oid_size
+        return entries
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+def shared_objects() -> GitObjects:
+    """The reader of this process, started on first use.
+
+    Worker processes forked from a process that already has a reader start
+    their own instead of sharing its pipes.
+    """
+    global _shared
+    if _shared is None or _shared.pid != os.getpid():
+        _shared = GitObjects()
+        atexit.register(_shared.close)
+    return _shared
+
+
+def resolve_commit(objects: GitObjects, rev: str) -> str:
+    """Object id of the commit ``rev`` names."""
+    found = objects.read(f'{rev}^{{commit}}')
+    if found is None:
+        raise ValueError(f"Unknown revision '{rev}'")
+    return found[0]
@@ -0,0 +1,117 @@
+"""On-disk cache of rendered profile Markdown.
+
+Rendered HTML is stored under a hash of the Markdown source, the extensions
+used and the versions of Markdown and Pygments, so a profile whose text has
+not changed never goes through the Markdown pipeline again, even after a
+full rebuild or when the output directory is deleted. The cache is bounded
+in size; least recently used entries are evicted first.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Sequence
+
+from .profiling import count, phase
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _library_versions() -> str:
+    versions = []
+    for name in ('markdown', 'pygments'):
+        try:
+            module = __import__(name)
+        except ImportError:
+            continue
+        versions.append(f"{name}={getattr(module, '__version__', '')}")
+    return ';'.join(versions)
+
+
+class MarkdownCache:
+    """Content-addressed store of Markdown rendered to HTML.
+
+    Entries live in ``cache_dir`` as ``<hash[:2]>/<hash>.html``. Reading an
+    entry refreshes its mtime, which ``evict`` uses as the LRU order. Writes
+    go through a temporary file so several processes can share the cache.
+    """
+
+    def __init__(self, cache_dir: Path, render: Callable[[str], str], extensions: Sequence[str],
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self._render = render
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._salt = f"{_library_versions()};extensions={','.join(extensions)}\n".encode('utf-8')
+
+    def _entry_path(self, text: str) -> Path:
+        digest = hashlib.sha256(self._salt + text.encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f'{digest}.html'
+
+    def render(self, text: str) -> str:
+        """Rendered HTML for ``text``, from the cache when possible."""
+        entry_path = self._entry_path(text)
+        try:
+            html = entry_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            pass
+        else:
+            self.hits += 1
+            count('markdown cache hits')
+            try:
+                os.utime(entry_path)
+            except OSError:
+                pass
+            return html
+
+        self.misses += 1
+        count('markdown cache misses')
+        with phase('render markdown'):
+            html = self._render(text)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(f'{entry_path.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(html, encoding='utf-8')
+            tmp_path.replace(entry_path)
+        except OSError:
+            # A cache that cannot be written only costs speed
+            pass
+        return html
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits ``max_bytes``.
+
+        Returns the number of entries removed.
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        entries = []
+        total = 0
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,237 @@
+"""Inventory and content hashes of member media.
+
+Media lives in each member's folder under ``photos/``, ``interviews/``
+(with recordings in ``interviews/videos/``) and ``documents/``. The
+inventory is taken in a single ``os.scandir`` walk of ``families/`` that
+records the size, modification time and type of every file.
+
+Hashing is optional because archives can hold hundreds of gigabytes of
+interview video. Files are hashed in a thread pool through memory-mapped
+reads (``hashlib`` releases the GIL while it hashes large buffers), and
+every hash is cached under ``.gitfam/cache/media`` with the size and mtime
+it was computed for, so only new or modified files are read again.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+HASH_CACHE_VERSION = 1
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+MEDIA_CATEGORIES = ['photos', 'videos', 'interviews', 'documents', 'other']
+
+
+def media_category(rel_parts: tuple) -> Optional[str]:
+    """Category of a file from its path parts relative to the member folder.
+
+    Files directly in the member folder (``profile.md``) are not media.
+    """
+    if len(rel_parts) < 2:
+        return None
+    top = rel_parts[0]
+    if top == 'interviews' and len(rel_parts) > 2 and rel_parts[1] == 'videos':
+        return 'videos'
+    if top in ('photos', 'interviews', 'documents'):
+        return top
+    return 'other'
+
+
+def file_type(name: str) -> str:
+    """Lowercase extension of a file name, or ``(none)``."""
+    _, ext = os.path.splitext(name)
+    return ext[1:].lower() if ext else '(none)'
+
+
+def walk_files(root: str, rel_parts: tuple = ()) -> Iterator[tuple]:
+    """``(rel_parts, os.DirEntry)`` of every visible file below ``root``."""
+    try:
+        with os.scandir(root) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith('.'):
+            continue
+        parts = rel_parts + (entry.name,)
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_files(entry.path, parts)
+        elif entry.is_file():
+            yield parts, entry
+
+
+def scan_member(member_path: Path, branch: str) -> Dict[str, Any]:
+    """Inventory of one member folder."""
+    inventory = {
+        'branch': branch,
+        'slug': member_path.name,
+        'path': member_path.as_posix(),
+        'files': [],
+        'categories': {category: {'files': 0, 'bytes': 0} for category in MEDIA_CATEGORIES},
+        'types': {}
+    }
+
+    for rel_parts, entry in walk_files(str(member_path)):
+        category = media_category(rel_parts)
+        if category is None:
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+
+        inventory['files'].append({
+            'path': '/'.join(rel_parts),
+            'category': category,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        })
+        totals = inventory['categories'][category]
+        totals['files'] += 1
+        totals['bytes'] += stat.st_size
+        types = inventory['types'].setdefault(file_type(entry.name), {'files': 0, 'bytes': 0})
+        types['files'] += 1
+        types['bytes'] += stat.st_size
+
+    return inventory
+
+
+def scan_media(families_path: Path, branch_names: Iterable[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the inventory of every member folder, branch by branch in name order."""
+    if branch_names is None:
+        try:
+            with os.scandir(families_path) as entries:
+                branch_names = sorted(entry.name for entry in entries
+                                      if entry.is_dir() and not entry.name.startswith('.'))
+        except OSError:
+            return
+
+    for branch in branch_names:
+        members_path = families_path / branch / 'members'
+        try:
+            with os.scandir(members_path) as entries:
+                slugs = sorted(entry.name for entry in entries
+                               if entry.is_dir() and not entry.name.startswith('.'))
+        except OSError:
+            continue
+        for slug in slugs:
+            yield scan_member(members_path / slug, branch)
+
+
+def sha256_mapped(path: str) -> str:
+    """Hex SHA-256 of a file, read through a memory map."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Some filesystems cannot be mapped; fall back to plain reads
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+            return digest.hexdigest()
+
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(view), HASH_BLOCK_SIZE):
+                    digest.update(view[offset:offset + HASH_BLOCK_SIZE])
+            finally:
+                view.release()
+    return digest.hexdigest()
+
+
+def _try_sha256(path: str) -> Optional[str]:
+    try:
+        return sha256_mapped(path)
+    except OSError:
+        return None
+
+
+class MediaHashCache:
+    """SHA-256 hashes of media files keyed by path, valid for one (size, mtime)."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.entries: Dict[str, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_dir / 'hashes.pickle', 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return
+        if isinstance(stored, dict) and stored.get('version') == HASH_CACHE_VERSION:
+            self.entries = stored['entries']
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_path = self.cache_dir / 'hashes.pickle'
+        tmp_path = cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': HASH_CACHE_VERSION, 'entries': self.entries}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(cache_path)
+        self._dirty = False
+
+    def lookup(self, path: str, size: int, mtime_ns: int) -> Optional[str]:
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime_ns:
+            return entry[2]
+        return None
+
+    def store(self, path: str, size: int, mtime_ns: int, sha256: str):
+        self.entries[path] = (size, mtime_ns, sha256)
+        self._dirty = True
+
+    def prune(self):
+        """Forget hashes of files that no longer exist."""
+        for path in [path for path in self.entries if not os.path.exists(path)]:
+            del self.entries[path]
+            self._dirty = True
+
+    def hash_files(self, files: List[tuple], jobs: int = 0, progress=None, refresh: bool = False) -> Dict[str, str]:
+        """Hashes of ``(path, size, mtime_ns)`` files, reading only uncached ones.
+
+        With ``refresh`` every file is read, whatever the cache says.
+        Uncached files are hashed in ``jobs`` threads (0 = one per CPU).
+        ``progress`` is called with the size of every file hashed. Files that
+        cannot be read are left out of the result.
+        """
+        hashes = {}
+        pending = []
+        for path, size, mtime_ns in files:
+            cached = None if refresh else self.lookup(path, size, mtime_ns)
+            if cached is None:
+                pending.append((path, size, mtime_ns))
+            else:
+                hashes[path] = cached
+                self.hits += 1
+
+        if not pending:
+            return hashes
+
+        # Start with the largest files so one long video does not finish last
+        pending.sort(key=lambda item: -item[1])
+        workers = min(jobs or os.cpu_count() or 1, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (path, size, mtime_ns), sha256 in zip(pending, pool.map(_try_sha256, (item[0] for item in pending))):
+                self.misses += 1
+                if sha256 is not None:
+                    hashes[path] = sha256
+                    self.store(path, size, mtime_ns, sha256)
+                if progress is not None:
+                    progress(size)
+        return hashes
@@ -0,0 +1,139 @@
+"""Interview videos of members, published with the generated website.
+
+Videos are only published on request (``generate-website --videos``) and
+by ``gitfam serve``, since they usually outweigh the rest of the site.
+
+Recordings in ``interviews/videos/`` are played on member pages straight
+from ``videos/<slug>/`` in the output directory, where browsers (and the
+``gitfam serve`` preview, which answers ``Range`` requests) can seek in
+them. Videos are large, so each one is hard-linked into the site when the
+output is on the same file system and copied otherwise, and a published
+copy is left alone while its size and modification time match the
+original.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Any
+
+from .media_inventory import walk_files
+
+VIDEO_EXTENSIONS = {'.mp4', '.m4v', '.webm', '.ogv', '.mov'}
+
+
+def video_title(name: str) -> str:
+    """Caption from a video file name, e.g. ``2019-kitchen-interview.mp4``."""
+    stem = os.path.splitext(name)[0]
+    return stem.replace('-', ' ').replace('_', ' ').strip()
+
+
+def _same_file(source: os.stat_result, target: os.stat_result) -> bool:
+    return (source.st_ino == target.st_ino and source.st_dev == target.st_dev) or (
+        source.st_size == target.st_size and source.st_mtime_ns == target.st_mtime_ns)
+
+
+class MemberVideos:
+    """Publishes the interview videos of a build's members into the site.
+
+    ``build_branch`` lists the videos of one branch's members, and
+    ``videos`` returns the template data for one of those members while
+    linking or copying their files into the output directory. The lists are
+    saved under ``.gitfam/cache/videos/branches`` for builds that skip
+    unchanged branches. ``remove_unused`` deletes videos no page plays.
+    """
+
+    def __init__(self, families_path: Path, output_path: Path):
+        self.families_path = families_path
+        self.output_path = output_path
+        self.cache_dir = families_path.parent / '.gitfam' / 'cache' / 'videos'
+        self.videos_by_member: Dict[str, List[List[str]]] = {}
+        self.found = 0
+        self.published = 0
+        self._used = set()
+
+    def build_branch(self, name: str, members: Iterable[Dict[str, Any]], rescan: bool = True):
+        """List the videos of a branch's members.
+
+        With ``rescan=False`` the list saved by the last build of the branch
+        is used instead of walking the video folders again.
+        """
+        listing_path = self.cache_dir / 'branches' / f'{name}.json'
+        if not rescan:
+            try:
+                self.videos_by_member = json.loads(listing_path.read_text(encoding='utf-8'))
+                self.found += sum(len(videos) for videos in self.videos_by_member.values())
+                return
+            except (OSError, ValueError):
+                pass
+
+        self.videos_by_member = {}
+        for member in members:
+            if not member['has_videos']:
+                continue
+            videos_path = Path(member['profile_path']).parent / 'interviews' / 'videos'
+            videos = [[(videos_path / '/'.join(rel_parts)).as_posix(), '/'.join(rel_parts)]
+                      for rel_parts, entry in walk_files(str(videos_path))
+                      if os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS]
+            if videos:
+                self.videos_by_member[member['profile_path']] = videos
+                self.found += len(videos)
+
+        listing_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = listing_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.videos_by_member), encoding='utf-8')
+        tmp_path.replace(listing_path)
+
+    def videos(self, member: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Template data for a member's videos, paths relative to the site root."""
+        videos = []
+        for source, rel_path in self.videos_by_member.get(member['profile_path'], []):
+            path = f"videos/{member['slug']}/{rel_path}"
+            if self._publish(source, path):
+                videos.append({'path': path, 'title': video_title(os.path.basename(rel_path))})
+        return videos
+
+    def _publish(self, source: str, rel_path: str) -> bool:
+        """Link or copy a video into the site unless it is already there; False if it is gone."""
+        if rel_path in self._used:
+            return True
+        try:
+            source_stat = os.stat(source)
+        except OSError:
+            return False
+        self._used.add(rel_path)
+
+        target = self.output_path / rel_path
+        try:
+            if _same_file(source_stat, target.stat()):
+                return True
+            target.unlink()
+        except FileNotFoundError:
+            target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+        self.published += 1
+        return True
+
+    def remove_unused(self) -> int:
+        """Delete videos in the site that no page plays anymore."""
+        videos_dir = self.output_path / 'videos'
+        if not videos_dir.exists():
+            return 0
+
+        removed = 0
+        for rel_parts, entry in walk_files(str(videos_dir)):
+            if 'videos/' + '/'.join(rel_parts) not in self._used:
+                os.unlink(entry.path)
+                removed += 1
+        for dirpath, _, _ in os.walk(videos_dir, topdown=False):
+            if dirpath != str(videos_dir):
+                try:
+                    os.rmdir(dirpath)
+                except OSError:
+                    # Still holds videos
+                    pass
+        return removed
@@ -0,0 +1,240 @@
+"""SQLite export of family metadata.
+
+``gitfam metadata --format sqlite`` writes the records produced by
+``collect_branch_metadata`` into normalized tables so they can be queried
+with SQL instead of loading a whole JSON or YAML export:
+
+- ``branches`` - one row per branch with its statistics
+- ``members`` - one row per member, keyed by ``(branch, slug)``
+- ``relationships``, ``interviews``, ``events`` - rows belonging to a member
+
+Every branch row stores a fingerprint of the metadata it was written from.
+When the database from a previous export is reused, branches whose
+fingerprint is unchanged are left alone and only changed branches are
+deleted and written again, each in a single transaction.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional
+
+from .family_graph import normalize_person
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE branches (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    total_members INTEGER NOT NULL,
+    total_interviews INTEGER NOT NULL,
+    members_with_photos INTEGER NOT NULL,
+    members_with_videos INTEGER NOT NULL,
+    earliest_birth_year INTEGER,
+    latest_birth_year INTEGER
+);
+
+CREATE TABLE members (
+    branch TEXT NOT NULL REFERENCES branches(name) ON DELETE CASCADE,
+    slug TEXT NOT NULL,
+    name TEXT,
+    birth_date TEXT,
+    birth_year INTEGER,
+    birth_place TEXT,
+    current_residence TEXT,
+    has_photos INTEGER NOT NULL,
+    has_videos INTEGER NOT NULL,
+    interview_count INTEGER NOT NULL,
+    PRIMARY KEY (branch, slug)
+);
+
+CREATE TABLE relationships (
+    branch TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    type TEXT,
+    person TEXT,
+    person_slug TEXT,
+    FOREIGN KEY (branch, slug) REFERENCES members(branch, slug) ON DELETE CASCADE
+);
+
+CREATE TABLE interviews (
+    branch TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    date TEXT,
+    topics TEXT,
+    FOREIGN KEY (branch, slug) REFERENCES members(branch, slug) ON DELETE CASCADE
+);
+
+CREATE TABLE events (
+    branch TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    date TEXT,
+    event TEXT,
+    FOREIGN KEY (branch, slug) REFERENCES members(branch, slug) ON DELETE CASCADE
+);
+
+CREATE INDEX members_birth_year ON members(birth_year);
+CREATE INDEX members_birth_place ON members(birth_place);
+CREATE INDEX members_slug ON members(slug);
+CREATE INDEX relationships_member ON relationships(branch, slug);
+CREATE INDEX relationships_person ON relationships(person_slug);
+CREATE INDEX interviews_member ON interviews(branch, slug);
+CREATE INDEX events_member ON events(branch, slug);
+"""
+
+
+def _text(value: Any) -> Optional[str]:
+    """Column value for free-form YAML data; dates and numbers become text."""
+    if value is None or value == '':
+        return None
+    return str(value)
+
+
+def _birth_year(birth_date: Any) -> Optional[int]:
+    try:
+        return int(str(birth_date).split('-')[0])
+    except ValueError:
+        return None
+
+
+def branch_fingerprint(branch_metadata: Dict[str, Any]) -> str:
+    """Hash of everything a branch contributes to the database."""
+    canonical = json.dumps(branch_metadata, sort_keys=True, default=str)
+    return hashlib.sha256(f'{SCHEMA_VERSION}\n{canonical}'.encode('utf-8')).hexdigest()
+
+
+def _stored_version(conn: sqlite3.Connection) -> Optional[str]:
+    """Schema version of a gitfam export; '' for an empty database, None for anything else.
+
+    Raises ``sqlite3.DatabaseError`` if the file is not an SQLite database.
+    """
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not tables:
+        return ''
+    if 'meta' not in tables:
+        return None
+    row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+    return str(row[0]) if row else None
+
+
+def open_database(path: Path) -> sqlite3.Connection:
+    """Open an export database, creating the schema if it is new or outdated.
+
+    A database written by an older gitfam is deleted and created again.
+    Any other existing file is left alone and ``ValueError`` is raised, so
+    a mistyped output path cannot destroy unrelated data.
+    """
+    conn = sqlite3.connect(str(path))
+    conn.execute('PRAGMA foreign_keys = ON')
+    try:
+        version = _stored_version(conn)
+    except sqlite3.DatabaseError:
+        conn.close()
+        raise ValueError(f"{path} exists and is not an SQLite database; choose another output file")
+
+    if version == str(SCHEMA_VERSION):
+        return conn
+    if version is None or (version and not (version.isdigit() and int(version) < SCHEMA_VERSION)):
+        conn.close()
+        raise ValueError(f"{path} is not a gitfam metadata database of a supported version; "
+                         f"choose another output file")
+
+    if version:
+        # An export from an older gitfam; its tables are rebuilt from scratch
+        conn.close()
+        path.unlink()
+        conn = sqlite3.connect(str(path))
+        conn.execute('PRAGMA foreign_keys = ON')
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+    return conn
+
+
+def _insert_branch(conn: sqlite3.Connection, branch_metadata: Dict[str, Any], fingerprint: str):
+    name = branch_metadata['branch_name']
+    stats = branch_metadata['statistics']
+    year_range = stats.get('birth_year_range') or {}
+    conn.execute(
+        'INSERT INTO branches VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (name, fingerprint, stats['total_members'], stats['total_interviews'],
+         stats['members_with_photos'], stats['members_with_videos'],
+         year_range.get('earliest'), year_range.get('latest'))
+    )
+
+    members = []
+    relationships = []
+    interviews = []
+    events = []
+    for member in branch_metadata['members']:
+        slug = member['slug']
+        members.append((
+            name, slug, _text(member['name']), _text(member['birth_date']), _birth_year(member['birth_date']),
+            _text(member['birth_place']), _text(member['current_residence']),
+            int(bool(member['has_photos'])), int(bool(member['has_videos'])), len(member['interviews'])
+        ))
+        for rel in member['relationships']:
+            if isinstance(rel, dict):
+                person = rel.get('person', '')
+                relationships.append((name, slug, _text(rel.get('type')), _text(person),
+                                      normalize_person(person) if person else None))
+        for position, interview in enumerate(member['interviews']):
+            if isinstance(interview, dict):
+                topics = interview.get('topics') or []
+                interviews.append((name, slug, position, _text(interview.get('date')),
+                                   json.dumps(topics, ensure_ascii=False, default=str)))
+        for position, event in enumerate(member['major_events']):
+            if isinstance(event, dict):
+                events.append((name, slug, position, _text(event.get('date')), _text(event.get('event'))))
+
+    conn.executemany('INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', members)
+    conn.executemany('INSERT INTO relationships VALUES (?, ?, ?, ?, ?)', relationships)
+    conn.executemany('INSERT INTO interviews VALUES (?, ?, ?, ?, ?)', interviews)
+    conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?)', events)
+
+
+def write_database(path: Path, branches: Iterable[Dict[str, Any]], generated_at: str,
+                   prune: bool = True) -> Dict[str, int]:
+    """Bring the database at ``path`` up to date with ``branches``.
+
+    ``branches`` yields ``collect_branch_metadata`` results and may be a
+    generator. With ``prune``, branches in the database that were not
+    yielded are deleted. Returns how many branches were written, left
+    unchanged and removed.
+    """
+    conn = open_database(path)
+    try:
+        stored = dict(conn.execute('SELECT name, fingerprint FROM branches'))
+        counts = {'written': 0, 'unchanged': 0, 'removed': 0}
+        seen = set()
+
+        for branch_metadata in branches:
+            name = branch_metadata['branch_name']
+            seen.add(name)
+            fingerprint = branch_fingerprint(branch_metadata)
+            if stored.get(name) == fingerprint:
+                counts['unchanged'] += 1
+                continue
+            with conn:
+                conn.execute('DELETE FROM branches WHERE name = ?', (name,))
+                _insert_branch(conn, branch_metadata, fingerprint)
+            counts['written'] += 1
+
+        with conn:
+            if prune:
+                for name in set(stored) - seen:
+                    conn.execute('DELETE FROM branches WHERE name = ?', (name,))
+                    counts['removed'] += 1
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('generated_at', ?)", (generated_at,))
+    finally:
+        conn.close()
+    return counts
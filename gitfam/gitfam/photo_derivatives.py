@@ -0,0 +1,270 @@
+"""Web-sized copies of member photos for the generated website.
+
+Photos in ``photos/`` are often multi-megabyte scans. For the website every
+photo is resized to a few fixed widths and re-encoded as JPEG, so galleries
+load thumbnails and browsers pick a suitable size through ``srcset``.
+
+Derivatives are stored under ``.gitfam/cache/photos`` by the SHA-256 of the
+source photo and the target width, so a photo is only resized once no
+matter how often the site is rebuilt or where the photo is moved. Source
+hashes come from the media hash cache shared with ``gitfam media``.
+
+Resizing needs Pillow, which is optional; without it the site is built
+without photo galleries.
+"""
+
+import json
+import math
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional
+
+from .media_inventory import MediaHashCache, walk_files
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+DERIVATIVE_VERSION = 1
+DERIVATIVE_WIDTHS = (320, 640, 1280)
+JPEG_QUALITY = 82
+EXIF_ORIENTATION = 0x0112
+
+PHOTO_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+
+
+def derivative_name(sha256: str, width: int) -> str:
+    return f'{sha256}-{width}.jpg'
+
+
+def _sidecar_path(cache_dir: Path, sha256: str) -> Path:
+    return cache_dir / sha256[:2] / f'{sha256}.json'
+
+
+def load_sizes(cache_dir: Path, sha256: str) -> Optional[Dict[str, Any]]:
+    """The recorded derivatives of a source photo, or None if not generated yet."""
+    try:
+        sizes = json.loads(_sidecar_path(cache_dir, sha256).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if sizes.get('version') != DERIVATIVE_VERSION:
+        return None
+    return sizes
+
+
+def make_derivatives(source: str, sha256: str, cache_dir: str) -> Dict[str, Any]:
+    """Resize one photo to every target width; runs in a pool worker.
+
+    Widths larger than the photo are not upscaled: the photo is stored once
+    at its own width instead. The result is also written next to the
+    derivatives, and records an ``error`` for photos Pillow cannot read so
+    they are not retried on every build.
+    """
+    cache_dir = Path(cache_dir)
+    sizes = {'version': DERIVATIVE_VERSION, 'sizes': []}
+    try:
+        with Image.open(source) as image:
+            # Let the JPEG decoder scale down large scans while decoding,
+            # keeping at least the largest target width once rotated upright
+            rotated = image.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8)
+            scale = (image.height if rotated else image.width) / DERIVATIVE_WIDTHS[-1]
+            if scale > 1:
+                image.draft('RGB', (math.ceil(image.width / scale), math.ceil(image.height / scale)))
+            image = ImageOps.exif_transpose(image)
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+
+            # Each size is resized from the previous, larger one
+            for width in sorted(DERIVATIVE_WIDTHS, reverse=True):
+                if image.width > width:
+                    image = image.resize((width, max(1, round(image.height * width / image.width))),
+                                         Image.LANCZOS)
+                elif sizes['sizes']:
+                    continue
+                target = cache_dir / sha256[:2] / derivative_name(sha256, width)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+                image.save(tmp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+                tmp_path.replace(target)
+                sizes['sizes'].insert(0, [width, image.width, image.height])
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        sizes = {'version': DERIVATIVE_VERSION, 'sizes': [], 'error': str(e)}
+
+    sidecar = _sidecar_path(cache_dir, sha256)
+    sidecar.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = sidecar.with_name(f'{sidecar.name}.{os.getpid()}.tmp')
+    tmp_path.write_text(json.dumps(sizes), encoding='utf-8')
+    tmp_path.replace(sidecar)
+    return sizes
+
+
+def photo_alt(name: str) -> str:
+    """Alt text from a photo file name, e.g. ``1965-navy-portrait.jpg``."""
+    stem = os.path.splitext(name)[0]
+    return stem.replace('-', ' ').replace('_', ' ').strip()
+
+
+class PhotoDerivatives:
+    """Generates photo derivatives for a build and copies them into the site.
+
+    ``build_branch`` hashes the photos of one branch's members and creates
+    missing derivatives; ``gallery`` then returns the template data for one
+    of those members' photos and copies their derivatives to ``photos/`` in
+    the output directory. Only the current branch's photo lists are kept, so
+    memory use does not grow with the archive; they are also saved under
+    ``.gitfam/cache/photos/branches`` for builds that skip unchanged
+    branches. ``close`` saves the hash cache and stops the resize workers.
+    """
+
+    def __init__(self, families_path: Path, output_path: Path, jobs: int = 1):
+        self.families_path = families_path
+        self.output_path = output_path
+        self.jobs = jobs
+        self.cache_dir = families_path.parent / '.gitfam' / 'cache' / 'photos'
+        self.hash_cache = MediaHashCache(families_path.parent / '.gitfam' / 'cache' / 'media')
+        self.available = Image is not None
+        self.photos: Dict[str, List[tuple]] = {}
+        self.hashes: Dict[str, str] = {}
+        self.found = 0
+        self.generated = 0
+        self.copied = 0
+        self._used = set()
+        self._executor = None
+
+    def build_branch(self, name: str, members: Iterable[Dict[str, Any]], rescan: bool = True) -> int:
+        """Hash the photos of a branch's members and resize the ones not in the cache yet.
+
+        ``members`` are index records or template data, anything with
+        ``profile_path`` and ``has_photos``. Hashing and resizing run in
+        ``jobs`` threads and processes. The photos found are recorded per
+        branch; with ``rescan=False`` that record is used instead of walking
+        the photo folders again, for branches known not to have changed.
+        Returns the number of photos resized.
+        """
+        self.photos = {}
+        self.hashes = {}
+        if not self.available:
+            return 0
+
+        listing_path = self.cache_dir / 'branches' / f'{name}.json'
+        if not rescan:
+            try:
+                listing = json.loads(listing_path.read_text(encoding='utf-8'))
+                self.photos = listing['photos']
+                self.hashes = listing['hashes']
+                self.found += len(self.hashes)
+                return 0
+            except (OSError, ValueError, KeyError):
+                pass
+
+        files = []
+        for member in members:
+            if not member['has_photos']:
+                continue
+            photos_path = Path(member['profile_path']).parent / 'photos'
+            photos = []
+            for rel_parts, entry in walk_files(str(photos_path)):
+                if os.path.splitext(entry.name)[1].lower() not in PHOTO_EXTENSIONS:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                path = (photos_path / '/'.join(rel_parts)).as_posix()
+                photos.append((path, entry.name))
+                files.append((path, stat.st_size, stat.st_mtime_ns))
+            if photos:
+                self.photos[member['profile_path']] = photos
+
+        self.hashes = self.hash_cache.hash_files(files, jobs=self.jobs)
+        self.found += len(self.hashes)
+        listing_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = listing_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'photos': self.photos, 'hashes': self.hashes}), encoding='utf-8')
+        tmp_path.replace(listing_path)
+
+        # One job per distinct photo, however many members share it
+        pending = {}
+        for path, sha256 in self.hashes.items():
+            if sha256 not in pending and load_sizes(self.cache_dir, sha256) is None:
+                pending[sha256] = path
+
+        if self.jobs <= 1 or len(pending) <= 1:
+            for sha256, path in pending.items():
+                make_derivatives(path, sha256, str(self.cache_dir))
+        else:
+            # One pool for the whole build rather than one per branch
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+            futures = [self._executor.submit(make_derivatives, path, sha256, str(self.cache_dir))
+                       for sha256, path in pending.items()]
+            for future in futures:
+                future.result()
+
+        self.generated += len(pending)
+        return len(pending)
+
+    def close(self):
+        """Save the hash cache and stop the resize workers."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.hash_cache.save()
+
+    def gallery(self, member: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Template data for a member's photos, paths relative to the site root."""
+        gallery = []
+        for path, name in self.photos.get(member['profile_path'], []):
+            sha256 = self.hashes.get(path)
+            sizes = load_sizes(self.cache_dir, sha256) if sha256 else None
+            if not sizes or not sizes['sizes']:
+                continue
+
+            variants = []
+            for width, actual_width, actual_height in sizes['sizes']:
+                variants.append({
+                    'path': self._publish(sha256, width),
+                    'width': actual_width,
+                    'height': actual_height
+                })
+            gallery.append({
+                'alt': photo_alt(name),
+                'src': variants[0]['path'],
+                'width': variants[0]['width'],
+                'height': variants[0]['height'],
+                'full': variants[-1]['path'],
+                'sizes': variants
+            })
+        return gallery
+
+    def _publish(self, sha256: str, width: int) -> str:
+        """Copy a derivative into the site unless it is already there."""
+        rel_path = f'photos/{sha256[:2]}/{derivative_name(sha256, width)}'
+        if rel_path not in self._used:
+            self._used.add(rel_path)
+            target = self.output_path / rel_path
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self.cache_dir / sha256[:2] / derivative_name(sha256, width), target)
+                self.copied += 1
+        return rel_path
+
+    def remove_unused(self) -> int:
+        """Delete derivatives in the site that no page refers to anymore."""
+        photos_dir = self.output_path / 'photos'
+        if not photos_dir.exists():
+            return 0
+
+        removed = 0
+        for shard in os.scandir(photos_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if f'photos/{shard.name}/{entry.name}' not in self._used:
+                    os.unlink(entry.path)
+                    removed += 1
+        return removed
@@ -0,0 +1,329 @@
+"""Local preview server for the generated website.
+
+``gitfam serve`` combines three pieces:
+
+- ``ChangeWatcher`` reports changed files below a set of directories. It
+  uses watchdog (inotify on Linux, FSEvents on macOS) when it is
+  installed, and otherwise compares ``(mtime_ns, size)`` snapshots taken
+  every poll interval.
+- ``PreviewHandler`` serves the output directory, answers ``Range``
+  requests so videos can be seeked, and adds a small live-reload script to
+  every HTML page it sends. The files on disk are not modified.
+- ``ReloadNotifier`` wakes every open ``/__gitfam/events`` stream (a
+  server-sent events connection) so browsers reload after a rebuild.
+"""
+
+import io
+import os
+import re
+import threading
+import time
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+EVENTS_PATH = '/__gitfam/events'
+
+RELOAD_SCRIPT = b"""<script>
+(function () {
+    var source = new EventSource('/__gitfam/events');
+    source.onmessage = function (event) {
+        if (event.data === 'reload') { window.location.reload(); }
+    };
+})();
+</script>
+"""
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_INTERVAL = 15
+
+_RANGE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+def ignored(name: str) -> bool:
+    """Hidden files and editor temporaries, which never affect the site."""
+    return name.startswith('.') or name.endswith(('~', '.swp', '.swx', '.tmp'))
+
+
+class ReloadNotifier:
+    """A version counter that event streams wait on."""
+
+    def __init__(self):
+        self.version = 0
+        self._condition = threading.Condition()
+
+    def notify(self):
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, version: int, timeout: float) -> int:
+        """Block until the version moves past ``version`` or ``timeout`` passes."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive ``(start, end)`` of a single-range ``Range`` header.
+
+    Returns None for headers this server does not handle, which are then
+    answered with the whole file, and ``(size, size)`` for a range that
+    starts past the end of the file.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    start, end = match.groups()
+    if not start:
+        # bytes=-N is the last N bytes
+        length = int(end)
+        return (max(size - length, 0), size - 1) if length else (size, size)
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size:
+        return (size, size)
+    if end < start:
+        return None
+    return (start, end)
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    """Static file handler with byte ranges, live reload and quiet logging."""
+
+    notifier: ReloadNotifier = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def end_headers(self):
+        # A preview should always show the latest build
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def do_GET(self):
+        if self.path == EVENTS_PATH:
+            self.stream_events()
+            return
+        super().do_GET()
+
+    def stream_events(self):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        version = self.notifier.version
+        try:
+            while True:
+                current = self.notifier.wait(version, KEEPALIVE_INTERVAL)
+                if current != version:
+                    version = current
+                    self.wfile.write(b'data: reload\n\n')
+                else:
+                    self.wfile.write(b': keep-alive\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split('?', 1)[0].endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if not os.path.isfile(path):
+            # Directory redirects, listings and 404s
+            return super().send_head()
+
+        if path.endswith('.html'):
+            return self.send_html(path)
+
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        size = os.fstat(f.fileno()).st_size
+
+        byte_range = parse_range(self.headers.get('Range', ''), size)
+        if byte_range is None:
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', self.guess_type(path))
+            self.send_header('Content-Length', str(size))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.end_headers()
+            self.remaining = None
+            return f
+
+        start, end = byte_range
+        if start >= size:
+            f.close()
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+
+        f.seek(start)
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        self.remaining = end - start + 1
+        return f
+
+    def send_html(self, path: str):
+        """Send a page with the live-reload script added before ``</body>``."""
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        position = content.rfind(b'</body>')
+        if position == -1:
+            position = len(content)
+        content = content[:position] + RELOAD_SCRIPT + content[position:]
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.remaining = None
+        return io.BytesIO(content)
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, 'remaining', None)
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        try:
+            while remaining > 0:
+                block = source.read(min(64 * 1024, remaining))
+                if not block:
+                    break
+                outputfile.write(block)
+                remaining -= len(block)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(directory: Path, host: str, port: int, notifier: ReloadNotifier) -> ThreadingHTTPServer:
+    """Serve ``directory`` from a background thread; returns the running server."""
+    handler = partial(type('BoundPreviewHandler', (PreviewHandler,), {'notifier': notifier}),
+                      directory=str(directory))
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def snapshot(roots: List[Path]) -> Dict[str, Tuple[int, int]]:
+    """``(mtime_ns, size)`` of every visible file below ``roots``."""
+    files = {}
+    stack = [str(root) for root in roots if root.exists()]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if ignored(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            stat = entry.stat()
+                            files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return files
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    def __init__(self, watcher: 'ChangeWatcher'):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type in ('opened', 'closed_no_write'):
+            return
+        for path in (getattr(event, 'src_path', ''), getattr(event, 'dest_path', '')):
+            # Directory events matter too: moving a member folder in or out
+            # may not report the files inside it
+            if path and not ignored(os.path.basename(path)):
+                self.watcher.record(path)
+
+
+class ChangeWatcher:
+    """Collects paths of changed files (and, with watchdog, directories) below ``roots``."""
+
+    def __init__(self, roots: List[Path], poll_interval: float = 1.0):
+        self.roots = [root for root in roots if root.exists()]
+        self.poll_interval = poll_interval
+        self.uses_watchdog = Observer is not None
+        self._changed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._observer = None
+        self._snapshot = None
+
+    def start(self):
+        if self.uses_watchdog:
+            self._observer = Observer()
+            handler = _WatchdogHandler(self)
+            for root in self.roots:
+                self._observer.schedule(handler, str(root), recursive=True)
+            self._observer.start()
+        else:
+            self._snapshot = snapshot(self.roots)
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+
+    def record(self, path: str):
+        with self._lock:
+            self._changed.add(path)
+
+    def _poll(self):
+        current = snapshot(self.roots)
+        previous = self._snapshot
+        self._snapshot = current
+        changed = {path for path, signature in current.items() if previous.get(path) != signature}
+        changed.update(path for path in previous if path not in current)
+        if changed:
+            with self._lock:
+                self._changed.update(changed)
+
+    def wait_for_changes(self, settle: float = 0.3) -> Set[str]:
+        """Block until files change, then until they have been quiet for ``settle`` seconds."""
+        while True:
+            if not self.uses_watchdog:
+                self._poll()
+            with self._lock:
+                pending = bool(self._changed)
+            if pending:
+                break
+            time.sleep(self.poll_interval if not self.uses_watchdog else 0.1)
+
+        # Editors often write a file in several steps
+        while True:
+            with self._lock:
+                count = len(self._changed)
+            time.sleep(settle)
+            if not self.uses_watchdog:
+                self._poll()
+            with self._lock:
+                if len(self._changed) == count:
+                    changed, self._changed = self._changed, set()
+                    return changed
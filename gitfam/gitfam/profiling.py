@@ -0,0 +1,139 @@
+"""Per-phase timings and counters for ``gitfam --profile``.
+
+Code marks the work it does with ``phase('name')`` blocks and ``count``
+calls. Both do nothing until ``start`` is called, so they can stay in hot
+paths. Phases nest: a phase's self time excludes the phases opened inside
+it, which separates, say, Markdown rendering from the Jinja template that
+called it.
+
+Only the calling process is measured; pages rendered in worker processes
+with ``--jobs`` are timed as a whole by the parent.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+_profiler = None
+
+
+class Profiler:
+    """Collected phase totals, counters and trace events of one run.
+
+    Phase totals take constant memory; one trace event per phase call is
+    only kept when ``trace`` is set, since long builds open millions of
+    phases.
+    """
+
+    def __init__(self, trace: bool = False):
+        self.origin = time.perf_counter()
+        self.counters: Counter = Counter()
+        # name -> [calls, wall, self wall, cpu]
+        self.phases: Dict[str, List[float]] = {}
+        self.trace = trace
+        self.events: List[Dict] = []
+        self.stack: List[List[float]] = []
+
+
+def start(trace: bool = False) -> Profiler:
+    """Turn profiling on for the rest of the process, recording trace events if ``trace``."""
+    global _profiler
+    _profiler = Profiler(trace)
+    return _profiler
+
+
+def enabled() -> bool:
+    return _profiler is not None
+
+
+def count(name: str, amount: int = 1):
+    """Add ``amount`` to a counter."""
+    if _profiler is not None:
+        _profiler.counters[name] += amount
+
+
+@contextmanager
+def phase(name: str):
+    """Time the enclosed block as ``name``."""
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+
+    # [time spent in nested phases]
+    frame = [0.0]
+    profiler.stack.append(frame)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        profiler.stack.pop()
+        if profiler.stack:
+            profiler.stack[-1][0] += wall
+
+        totals = profiler.phases.setdefault(name, [0, 0.0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += wall
+        totals[2] += wall - frame[0]
+        totals[3] += cpu
+        if profiler.trace:
+            profiler.events.append({
+                'name': name, 'cat': 'gitfam', 'ph': 'X',
+                'ts': round((wall_start - profiler.origin) * 1e6, 1), 'dur': round(wall * 1e6, 1),
+                'pid': os.getpid(), 'tid': threading.get_ident(),
+                'args': {'cpu_ms': round(cpu * 1e3, 3)}
+            })
+
+
+def summary_tables(profiler: Profiler):
+    """Phase and counter tables, phases ordered by self time."""
+    from rich.table import Table
+
+    phases = Table(title="Profile", show_header=True)
+    phases.add_column("Phase", style="cyan")
+    phases.add_column("Calls", justify="right")
+    phases.add_column("Wall (s)", justify="right")
+    phases.add_column("Self (s)", justify="right")
+    phases.add_column("CPU (s)", justify="right")
+    for name, (calls, wall, self_wall, cpu) in sorted(profiler.phases.items(), key=lambda item: -item[1][2]):
+        phases.add_row(name, str(calls), f"{wall:.3f}", f"{self_wall:.3f}", f"{cpu:.3f}")
+
+    counters = Table(show_header=True)
+    counters.add_column("Counter", style="cyan")
+    counters.add_column("Value", justify="right")
+    for name, value in sorted(profiler.counters.items()):
+        counters.add_row(name, f"{value:,}")
+    return phases, counters
+
+
+def write_trace(profiler: Profiler, path: Path):
+    """Write phases as Chrome trace events, readable by chrome://tracing and Perfetto."""
+    end = round((time.perf_counter() - profiler.origin) * 1e6, 1)
+    events = sorted(profiler.events, key=lambda event: event['ts'])
+    events.append({'name': 'counters', 'cat': 'gitfam', 'ph': 'C', 'ts': end, 'pid': os.getpid(),
+                   'tid': threading.get_ident(), 'args': dict(profiler.counters)})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def report(profiler: Profiler, trace_path: Path = None):
+    """Print the summary to stderr and write the trace file, if one was asked for."""
+    from rich.console import Console
+
+    console = Console(stderr=True)
+    phases, counters = summary_tables(profiler)
+    console.print()
+    console.print(phases)
+    if profiler.counters:
+        console.print(counters)
+    if trace_path:
+        write_trace(profiler, trace_path)
+        console.print(f"[dim]Trace written to {trace_path} (open in chrome://tracing or ui.perfetto.dev)[/dim]")
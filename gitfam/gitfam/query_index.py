@@ -0,0 +1,261 @@
+"""Field indexes behind ``gitfam query``.
+
+A query is a list of filters that must all match, for example::
+
+    born:1880..1920 place:ohio has:videos interviews:>=2 rel:spouse_of
+
+Every branch gets its own set of indexes built from the frontmatter in the
+family index: sorted birth years and interview counts for range lookups,
+and maps from lowercased birth place, relationship type and media kind to
+the members that have them. The indexes are stored under
+``.gitfam/cache/query`` and only rebuilt for branches whose family index
+record changed, so a query costs a few set intersections per branch.
+"""
+
+import bisect
+import pickle
+import re
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from .family_index import FamilyIndex
+from .search_index import birth_year
+
+INDEX_VERSION = 1
+
+FILTERS = {
+    'born': 'birth year, e.g. born:1900, born:1880..1920, born:..1850 or born:>=1900',
+    'place': 'text contained in the birth place, e.g. place:ohio',
+    'branch': 'branch name, e.g. branch:smith-california',
+    'has': 'available media: has:photos or has:videos',
+    'interviews': 'number of interviews, e.g. interviews:0, interviews:>=2 or interviews:1..3',
+    'rel': 'relationship type, e.g. rel:spouse_of'
+}
+
+MEDIA_KINDS = ('photos', 'videos')
+
+_COMPARISON = re.compile(r'(<=|>=|<|>)(-?\d+)')
+_RANGE = re.compile(r'(-?\d+)?\.\.(-?\d+)?')
+
+
+def parse_range(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """Inclusive ``(low, high)`` bounds of a number, ``a..b`` range or comparison."""
+    match = _COMPARISON.fullmatch(text)
+    if match:
+        operator, number = match.group(1), int(match.group(2))
+        return {
+            '<': (None, number - 1),
+            '<=': (None, number),
+            '>': (number + 1, None),
+            '>=': (number, None)
+        }[operator]
+
+    match = _RANGE.fullmatch(text)
+    if match and (match.group(1) or match.group(2)):
+        low, high = match.groups()
+        return (int(low) if low else None, int(high) if high else None)
+
+    try:
+        number = int(text)
+    except ValueError:
+        raise ValueError(f"'{text}' is not a number or range")
+    return (number, number)
+
+
+def parse_query(terms: List[str]) -> List[Tuple[str, Any]]:
+    """Turn ``field:value`` terms into ``(field, value)`` filters.
+
+    Raises ``ValueError`` with a message for the user on unknown fields or
+    malformed values.
+    """
+    filters = []
+    for term in terms:
+        field, separator, value = term.partition(':')
+        field = field.lower()
+        if not separator or not value:
+            raise ValueError(f"'{term}' is not a filter; use field:value")
+        if field not in FILTERS:
+            raise ValueError(f"Unknown filter '{field}'; use one of {', '.join(FILTERS)}")
+
+        if field in ('born', 'interviews'):
+            filters.append((field, parse_range(value)))
+        elif field == 'has':
+            value = value.lower()
+            if value not in MEDIA_KINDS:
+                raise ValueError(f"has: takes {' or '.join(MEDIA_KINDS)}, not '{value}'")
+            filters.append((field, value))
+        elif field == 'branch':
+            filters.append((field, value))
+        else:
+            filters.append((field, value.lower()))
+    return filters
+
+
+def build_branch_index(branch: Dict[str, Any]) -> Dict[str, Any]:
+    """Indexes over the members of one family index branch record."""
+    members = []
+    years = []
+    interview_counts = []
+    places: Dict[str, List[int]] = {}
+    relationships: Dict[str, List[int]] = {}
+    media: Dict[str, List[int]] = {kind: [] for kind in MEDIA_KINDS}
+
+    for record in branch['members'].values():
+        if record.get('error'):
+            continue
+        frontmatter = record['frontmatter']
+        member_id = len(members)
+
+        interviews = frontmatter.get('interviews') or []
+        interview_count = len(interviews) if isinstance(interviews, list) else 0
+        birth_place = str(frontmatter.get('birth_place') or '')
+        members.append({
+            'slug': record['slug'],
+            'branch': branch['name'],
+            'name': str(frontmatter.get('name', record['slug'])),
+            'birth_date': str(frontmatter.get('birth_date') or ''),
+            'birth_place': birth_place,
+            'interviews': interview_count,
+            'has_photos': record['has_photos'],
+            'has_videos': record['has_videos']
+        })
+
+        year = birth_year(frontmatter.get('birth_date'))
+        if year:
+            years.append((int(year), member_id))
+        interview_counts.append((interview_count, member_id))
+        if birth_place:
+            places.setdefault(birth_place.lower(), []).append(member_id)
+
+        rel_types = set()
+        for rel in frontmatter.get('relationships') or []:
+            if isinstance(rel, dict) and rel.get('type'):
+                rel_types.add(str(rel['type']).lower())
+        for rel_type in rel_types:
+            relationships.setdefault(rel_type, []).append(member_id)
+
+        for kind in MEDIA_KINDS:
+            if record[f'has_{kind}']:
+                media[kind].append(member_id)
+
+    years.sort()
+    interview_counts.sort()
+    return {
+        'members': members,
+        'years': ([year for year, _ in years], [member_id for _, member_id in years]),
+        'interviews': ([count for count, _ in interview_counts], [member_id for _, member_id in interview_counts]),
+        'places': places,
+        'relationships': relationships,
+        'media': media
+    }
+
+
+def _range_ids(sorted_index: Tuple[List[int], List[int]], low: Optional[int], high: Optional[int]) -> Set[int]:
+    keys, ids = sorted_index
+    start = 0 if low is None else bisect.bisect_left(keys, low)
+    end = len(keys) if high is None else bisect.bisect_right(keys, high)
+    return set(ids[start:end])
+
+
+def match_branch(branch_index: Dict[str, Any], filters: List[Tuple[str, Any]]) -> List[int]:
+    """Ids of the members of one branch that pass every filter, in slug order."""
+    matches: Optional[Set[int]] = None
+    for field, value in filters:
+        if field == 'born':
+            ids = _range_ids(branch_index['years'], *value)
+        elif field == 'interviews':
+            ids = _range_ids(branch_index['interviews'], *value)
+        elif field == 'place':
+            # There are far fewer distinct places than members
+            ids = set()
+            for place, place_ids in branch_index['places'].items():
+                if value in place:
+                    ids.update(place_ids)
+        elif field == 'rel':
+            ids = set(branch_index['relationships'].get(value, ()))
+        elif field == 'has':
+            ids = set(branch_index['media'][value])
+        else:
+            continue
+
+        matches = ids if matches is None else matches & ids
+        if not matches:
+            return []
+
+    if matches is None:
+        return list(range(len(branch_index['members'])))
+    return sorted(matches)
+
+
+class QueryIndex:
+    """Per-branch field indexes, persisted next to the family index."""
+
+    def __init__(self, families_path: Path = Path('families'), cache_dir: Path = None):
+        self.families_path = families_path
+        self.cache_dir = cache_dir or families_path.parent / '.gitfam' / 'cache' / 'query'
+        self.branches: Dict[str, Dict[str, Any]] = {}
+        self.rebuilt = 0
+        self._load()
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / 'index.pickle'
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return
+        if isinstance(stored, dict) and stored.get('version') == INDEX_VERSION:
+            self.branches = stored['branches']
+
+    def save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'branches': self.branches}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(self.cache_path)
+
+    def refresh(self, index: FamilyIndex) -> 'QueryIndex':
+        """Rebuild the indexes of branches whose family index record changed.
+
+        The family index rewrites a branch's stored record whenever any of
+        its members changes, so the record's size and mtime tell whether the
+        indexes built from it are still current.
+        """
+        names = index.branch_names()
+        changed = False
+        for name in set(self.branches) - set(names):
+            del self.branches[name]
+            changed = True
+
+        for name in names:
+            loaded = name in index.branches
+            branch = index.branch(name)
+            signature = index.stored_signature(name)
+            stored = self.branches.get(name)
+            if stored is None or signature is None or stored['signature'] != signature:
+                self.branches[name] = {'signature': signature, 'index': build_branch_index(branch)}
+                self.rebuilt += 1
+                changed = True
+            if not loaded:
+                index.release(name)
+
+        if changed:
+            self.save()
+        return self
+
+    def search(self, filters: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """Members of every branch that pass all filters, by branch and slug."""
+        branch_names = sorted(self.branches)
+        for field, value in filters:
+            if field == 'branch':
+                branch_names = [name for name in branch_names if name == value]
+
+        results = []
+        for name in branch_names:
+            branch_index = self.branches[name]['index']
+            members = branch_index['members']
+            results += [members[member_id] for member_id in match_branch(branch_index, filters)]
+        return results
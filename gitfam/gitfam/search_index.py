@@ -0,0 +1,351 @@
+"""Client-side search index for the generated website.
+
+Members are indexed by name, birth place, birth year and the words of their
+profile. The index is written as many small JSON files so the browser only
+downloads what a query needs:
+
+- ``search/terms/<shard>.json`` maps every term sharing a two-character
+  prefix to its postings, ``[[doc id, weight], ...]`` by descending weight.
+- ``search/docs/<n>.json`` holds the display fields and page paths of members
+  ``n * DOC_SHARD_SIZE`` to ``(n + 1) * DOC_SHARD_SIZE - 1``.
+- ``search/meta.json`` records the shard layout.
+
+Per-member terms are cached per branch under ``.gitfam/cache/search`` and
+only recomputed when a member's profile changed, and the postings of each
+shard are cached as well, so a build only rewrites the shards that changed
+members' terms fall into.
+"""
+
+import json
+import os
+import pickle
+import re
+import shutil
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Callable, Optional
+
+from .profiling import count
+from .site_output import write_if_changed
+
+INDEX_VERSION = 3
+DOC_SHARD_SIZE = 500
+MAX_TEXT_WEIGHT = 5
+
+# Pending posting changes that trigger a flush to the shard caches in low-memory builds
+FLUSH_POSTINGS = 200_000
+
+FIELD_WEIGHTS = {
+    'name': 20,
+    'place': 8,
+    'year': 8
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'had', 'has', 'have', 'he',
+    'her', 'his', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'she', 'that', 'the', 'their', 'they',
+    'this', 'to', 'was', 'we', 'were', 'with'
+}
+
+_SPLIT = re.compile(r'[\W_]+')
+_SHARD_NAME = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercase, accent-folded words of ``text``; mirrors ``tokenize`` in search.js."""
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return [token for token in _SPLIT.split(text) if len(token) > 1 and token not in STOPWORDS]
+
+
+def shard_name(token: str) -> str:
+    """File name of the term shard holding ``token``; mirrors ``shardName`` in search.js."""
+    prefix = token[:2]
+    if _SHARD_NAME.fullmatch(prefix):
+        return prefix
+    return 'u' + '-'.join(f'{ord(char):x}' for char in prefix)
+
+
+def birth_year(birth_date: Any) -> str:
+    """The year of a frontmatter birth date, or an empty string."""
+    year = str(birth_date or '').split('-')[0]
+    return year if year.isdigit() else ''
+
+
+def member_terms(member: Dict[str, Any], body: str) -> Dict[str, int]:
+    """Weighted search terms of one member."""
+    terms: Dict[str, int] = {}
+    for token in tokenize(body):
+        terms[token] = min(terms.get(token, 0) + 1, MAX_TEXT_WEIGHT)
+
+    fields = {
+        'name': member.get('name', ''),
+        'place': member.get('birth_place') or '',
+        'year': birth_year(member.get('birth_date'))
+    }
+    for field, value in fields.items():
+        for token in tokenize(value):
+            terms[token] = terms.get(token, 0) + FIELD_WEIGHTS[field]
+    return terms
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def _load_pickle(path: Path, default: Any = None) -> Any:
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return default
+
+
+def _save_pickle(path: Path, value: Any):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+
+
+class SearchIndex:
+    """Incrementally maintained inverted index of site members.
+
+    Call ``add_branch`` for every branch of the build, then ``write`` once.
+    The cache holds each branch's members in its own file and the postings
+    of each output shard in their own file, so neither is ever loaded for
+    the whole archive at once. A changed member becomes a set of posting
+    changes; only the shards those touch are updated and rewritten. Doc ids
+    are kept stable across builds.
+
+    Pending changes are applied to the shard caches in ``write``, or as
+    soon as they exceed ``FLUSH_POSTINGS`` with ``low_memory``, which keeps
+    memory use flat even on a first build.
+    """
+
+    def __init__(self, cache_dir: Path, low_memory: bool = False):
+        self.cache_dir = cache_dir
+        self.low_memory = low_memory
+        self.updated = 0
+        self.state = self._load_state()
+        self._seen = set()
+        # shard -> term -> doc id -> weight, or None to remove the posting
+        self._terms: Dict[str, Dict[str, Dict[int, Optional[int]]]] = {}
+        # doc shard -> doc id -> doc, or None to remove it
+        self._docs: Dict[int, Dict[int, Optional[list]]] = {}
+        self._branches: Dict[str, Dict[str, Any]] = {}
+        self._pending = 0
+        self._touched_terms = set()
+        self._touched_docs = set()
+
+    def _load_state(self) -> Dict[str, Any]:
+        state = _load_pickle(self.cache_dir / 'state.pickle')
+        if isinstance(state, dict) and state.get('version') == INDEX_VERSION and not state['dirty']:
+            return state
+
+        # Missing, outdated or left behind by an interrupted build: start over
+        for subdir in ('branches', 'terms', 'docs'):
+            shutil.rmtree(self.cache_dir / subdir, ignore_errors=True)
+        for name in ('terms.pickle', 'state.pickle'):
+            (self.cache_dir / name).unlink(missing_ok=True)
+        return {'version': INDEX_VERSION, 'next_id': 0, 'members': 0, 'token': None, 'dirty': False}
+
+    def add_branch(self, name: str, members: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], str],
+                   load_body: Callable[[Dict[str, Any]], str]):
+        """Index the members of a branch, reusing cached terms of members whose key is unchanged.
+
+        ``key(member)`` must change whenever the member's indexed fields or
+        profile change; ``load_body`` is only called when it did. Members of
+        the branch that are not passed are removed from the index.
+        """
+        self._seen.add(name)
+        stored = _load_pickle(self._branch_path(name), {})
+        entries = {}
+        changed = False
+        for member in members:
+            slug = member['slug']
+            member_key = key(member)
+            old = stored.pop(slug, None)
+            if old is not None and old['key'] == member_key:
+                entries[slug] = old
+                continue
+
+            if old is not None:
+                doc_id = old['id']
+            else:
+                doc_id = self.state['next_id']
+                self.state['next_id'] += 1
+            entry = {
+                'key': member_key,
+                'id': doc_id,
+                'doc': [
+                    slug,
+                    str(member.get('name', slug)),
+                    member.get('branch', ''),
+                    birth_year(member.get('birth_date')),
+                    str(member.get('birth_place') or ''),
+                    member.get('url') or f'members/{slug}.html'
+                ],
+                'terms': member_terms(member, load_body(member))
+            }
+            self._replace(old, entry)
+            entries[slug] = entry
+            changed = True
+            self.updated += 1
+
+        for old in stored.values():
+            self._replace(old, None)
+            changed = True
+
+        if changed:
+            # Saved after the postings it produced, see _flush
+            self._branches[name] = entries
+            if self.low_memory and self._pending > FLUSH_POSTINGS:
+                self._flush()
+
+    def keep_branch(self, name: str) -> bool:
+        """Keep the cached members of a branch known not to have changed, without loading them.
+
+        Returns False if the branch has no cached members, in which case it
+        has to be added with ``add_branch``.
+        """
+        if not self._branch_path(name).exists():
+            return False
+        self._seen.add(name)
+        return True
+
+    def _branch_path(self, name: str) -> Path:
+        return self.cache_dir / 'branches' / f'{name}.pickle'
+
+    def _replace(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]):
+        """Queue the posting changes that turn member entry ``old`` into ``new``."""
+        if old is not None:
+            for term in old['terms']:
+                self._terms.setdefault(shard_name(term), {}).setdefault(term, {})[old['id']] = None
+            self._docs.setdefault(old['id'] // DOC_SHARD_SIZE, {})[old['id']] = None
+            self._pending += len(old['terms'])
+            self.state['members'] -= 1
+        if new is not None:
+            for term, weight in new['terms'].items():
+                self._terms.setdefault(shard_name(term), {}).setdefault(term, {})[new['id']] = weight
+            self._docs.setdefault(new['id'] // DOC_SHARD_SIZE, {})[new['id']] = new['doc']
+            self._pending += len(new['terms'])
+            self.state['members'] += 1
+
+    def _flush(self):
+        """Apply pending changes to the shard caches, then save the branches they came from.
+
+        The state is marked dirty first, so a build interrupted before
+        ``write`` finishes leaves a cache that is discarded rather than one
+        whose branches and shards disagree.
+        """
+        if not self._terms and not self._docs and not self._branches:
+            return
+        if not self.state['dirty']:
+            self.state['dirty'] = True
+            _save_pickle(self.cache_dir / 'state.pickle', self.state)
+
+        for name, changes in self._terms.items():
+            path = self.cache_dir / 'terms' / f'{name}.pickle'
+            shard = _load_pickle(path, {})
+            for term, postings in changes.items():
+                current = shard.setdefault(term, {})
+                for doc_id, weight in postings.items():
+                    if weight is None:
+                        current.pop(doc_id, None)
+                    else:
+                        current[doc_id] = weight
+                if not current:
+                    del shard[term]
+            self._save_or_remove(path, shard)
+            self._touched_terms.add(name)
+
+        for number, changes in self._docs.items():
+            path = self.cache_dir / 'docs' / f'{number}.pickle'
+            shard = _load_pickle(path, {})
+            for doc_id, doc in changes.items():
+                if doc is None:
+                    shard.pop(doc_id, None)
+                else:
+                    shard[doc_id] = doc
+            self._save_or_remove(path, shard)
+            self._touched_docs.add(number)
+
+        for name, entries in self._branches.items():
+            self._save_or_remove(self._branch_path(name), entries)
+
+        count('search postings flushed', self._pending)
+        self._terms = {}
+        self._docs = {}
+        self._branches = {}
+        self._pending = 0
+
+    @staticmethod
+    def _save_or_remove(path: Path, value: Dict):
+        if value:
+            _save_pickle(path, value)
+        else:
+            path.unlink(missing_ok=True)
+
+    def write(self, output_path: Path) -> int:
+        """Write the changed index shards under ``output_path/search``.
+
+        Branches not added in this build are dropped. Every shard is written
+        when the output directory was last written from a different cache
+        state, for example after it was deleted. Returns the number of files
+        written; files whose content is unchanged are left alone.
+        """
+        branches_dir = self.cache_dir / 'branches'
+        if branches_dir.exists():
+            for path in branches_dir.glob('*.pickle'):
+                if path.stem not in self._seen:
+                    for old in _load_pickle(path, {}).values():
+                        self._replace(old, None)
+                    self._branches[path.stem] = {}
+        self._flush()
+
+        search_dir = output_path / 'search'
+        try:
+            token = json.loads((search_dir / 'meta.json').read_text(encoding='utf-8')).get('token')
+        except (OSError, ValueError, AttributeError):
+            token = None
+        in_sync = token is not None and token == self.state['token']
+
+        term_names = sorted(path.stem for path in (self.cache_dir / 'terms').glob('*.pickle'))
+        doc_numbers = sorted(int(path.stem) for path in (self.cache_dir / 'docs').glob('*.pickle'))
+        written = 0
+        for name in term_names:
+            if in_sync and name not in self._touched_terms:
+                continue
+            shard = _load_pickle(self.cache_dir / 'terms' / f'{name}.pickle', {})
+            terms = {term: sorted(([doc_id, weight] for doc_id, weight in postings.items()),
+                                  key=lambda posting: (-posting[1], posting[0]))
+                     for term, postings in shard.items()}
+            written += write_if_changed(search_dir / 'terms' / f'{name}.json', _dumps(terms))
+        for number in doc_numbers:
+            if in_sync and number not in self._touched_docs:
+                continue
+            docs = _load_pickle(self.cache_dir / 'docs' / f'{number}.pickle', {})
+            written += write_if_changed(search_dir / 'docs' / f'{number}.json',
+                                        _dumps({str(doc_id): doc for doc_id, doc in docs.items()}))
+
+        current = {f'terms/{name}.json' for name in term_names} | {f'docs/{number}.json' for number in doc_numbers}
+        for subdir in ('terms', 'docs'):
+            for path in (search_dir / subdir).glob('*.json'):
+                if f'{subdir}/{path.name}' not in current:
+                    path.unlink()
+                    written += 1
+
+        if not in_sync or self._touched_terms or self._touched_docs:
+            self.state['token'] = os.urandom(8).hex()
+        written += write_if_changed(search_dir / 'meta.json', _dumps({
+            'version': INDEX_VERSION,
+            'doc_shard_size': DOC_SHARD_SIZE,
+            'members': self.state['members'],
+            'shards': term_names,
+            'token': self.state['token']
+        }))
+        self.state['dirty'] = False
+        _save_pickle(self.cache_dir / 'state.pickle', self.state)
+        return written
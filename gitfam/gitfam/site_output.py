@@ -0,0 +1,139 @@
+"""Writing the generated website for deployment.
+
+Every output file is written through ``write_if_changed``, which leaves a
+file alone when its bytes are the same and otherwise replaces it atomically,
+so a file's mtime only moves when its content does and rsync- or git-based
+deploys upload only what changed.
+
+``generate-website --deploy`` adds three things on top:
+
+- static assets get a content hash in their name (``search.<hash>.js``) so
+  they can be served with a long cache lifetime
+- HTML, CSS, JavaScript and JSON files get precompressed ``.gz`` siblings,
+  and ``.br`` siblings when the brotli package is installed
+- ``.gitfam-deploy.json`` lists the paths added, modified and removed by
+  the build, found by comparing the output directory before and after it
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEPLOY_MANIFEST_NAME = '.gitfam-deploy.json'
+
+COMPRESSIBLE_SUFFIXES = ('.html', '.css', '.js', '.json')
+
+# Quality 11 is several times slower for a few percent smaller files
+BROTLI_QUALITY = 9
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """Atomically write ``content`` to ``path`` unless it already holds it.
+
+    Returns True if the file was written.
+    """
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_bytes(content)
+    tmp_path.replace(path)
+    return True
+
+
+def fingerprinted_name(name: str, content: bytes) -> str:
+    """``search.js`` as ``search.<first 10 hex digits of its SHA-256>.js``."""
+    stem, dot, suffix = name.rpartition('.')
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    return f'{stem}.{digest}.{suffix}' if dot else f'{name}.{digest}'
+
+
+def snapshot(output_path: Path) -> Dict[str, Tuple[int, int]]:
+    """``(mtime_ns, size)`` of every visible file, keyed by its path relative to ``output_path``."""
+    files = {}
+    stack = [('', str(output_path))]
+    while stack:
+        prefix, directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    rel_path = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((rel_path + '/', entry.path))
+                    else:
+                        stat = entry.stat()
+                        files[rel_path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            continue
+    return files
+
+
+def compare_snapshots(before: Dict[str, tuple], after: Dict[str, tuple]) -> Dict[str, List[str]]:
+    """Sorted lists of the ``added``, ``modified`` and ``removed`` paths."""
+    return {
+        'added': sorted(path for path in after if path not in before),
+        'modified': sorted(path for path in after if path in before and before[path] != after[path]),
+        'removed': sorted(path for path in before if path not in after)
+    }
+
+
+def compression_formats() -> List[str]:
+    """Suffixes of the precompressed siblings that can be written here."""
+    return ['.gz', '.br'] if brotli is not None else ['.gz']
+
+
+def compress(content: bytes, suffix: str) -> bytes:
+    if suffix == '.gz':
+        # A fixed timestamp keeps the output identical for identical input
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    return brotli.compress(content, quality=BROTLI_QUALITY)
+
+
+def precompress(output_path: Path, files: Dict[str, tuple], changed: set) -> int:
+    """Write compressed siblings of changed or new text files and drop orphaned ones.
+
+    ``files`` is a snapshot of the output directory and ``changed`` the paths
+    that changed in this build. Returns the number of files written or removed.
+    """
+    formats = compression_formats()
+    all_formats = ('.gz', '.br')
+    count = 0
+    for rel_path in files:
+        if rel_path.endswith(all_formats):
+            # A page or asset that was removed, or brotli that was uninstalled
+            source = rel_path[:-3]
+            if source not in files or rel_path[-3:] not in formats:
+                os.unlink(output_path / rel_path)
+                count += 1
+            continue
+        if not rel_path.endswith(COMPRESSIBLE_SUFFIXES):
+            continue
+
+        missing = [suffix for suffix in formats if rel_path + suffix not in files]
+        if rel_path not in changed and not missing:
+            continue
+        content = (output_path / rel_path).read_bytes()
+        for suffix in formats:
+            count += write_if_changed(output_path / (rel_path + suffix), compress(content, suffix))
+    return count
+
+
+def write_deploy_manifest(output_path: Path, changes: Dict[str, List[str]], generated_at: str):
+    """Record the paths this build changed, for deploy scripts to upload or delete."""
+    manifest = {'generated_at': generated_at, **changes}
+    tmp_path = output_path / f'{DEPLOY_MANIFEST_NAME}.tmp'
+    tmp_path.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    tmp_path.replace(output_path / DEPLOY_MANIFEST_NAME)
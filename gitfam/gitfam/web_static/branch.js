@@ -0,0 +1,101 @@
+/* GitFam branch page infinite scroll.
+ *
+ * Long branches are split into pages by gitfam/commands/build_web.py, each
+ * with a JSON file of its member cards. When the end of the member grid
+ * comes into view the next page's JSON is fetched and its cards appended,
+ * so readers can keep scrolling; without JavaScript the page links work.
+ * The cards built here must match the ones in branch.html.
+ */
+(function () {
+    'use strict';
+
+    function badge(className, text) {
+        var span = document.createElement('span');
+        span.className = 'badge ' + className;
+        span.textContent = text;
+        return span;
+    }
+
+    function memberCard(root, member) {
+        var card = document.createElement('a');
+        card.className = 'member-card';
+        card.href = root + member.url;
+
+        var name = document.createElement('div');
+        name.className = 'member-name';
+        name.textContent = member.name;
+        card.appendChild(name);
+
+        var info = document.createElement('div');
+        info.className = 'member-info';
+        [member.birth_date ? 'Born: ' + member.birth_date : '', member.birth_place].filter(Boolean)
+            .forEach(function (text) {
+                var line = document.createElement('div');
+                line.textContent = text;
+                info.appendChild(line);
+            });
+        card.appendChild(info);
+
+        var badges = document.createElement('div');
+        badges.style.marginTop = '0.75rem';
+        if (member.interviews) {
+            badges.appendChild(badge('badge-interview',
+                member.interviews + ' Interview' + (member.interviews !== 1 ? 's' : '')));
+        }
+        if (member.has_photos) {
+            badges.appendChild(badge('badge-photos', 'Photos'));
+        }
+        if (member.has_videos) {
+            badges.appendChild(badge('badge-videos', 'Videos'));
+        }
+        card.appendChild(badges);
+        return card;
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var grid = document.querySelector('.member-grid[data-next]');
+        if (!grid || !('IntersectionObserver' in window)) {
+            return;
+        }
+
+        var root = grid.dataset.root || '';
+        var next = grid.dataset.next;
+        var pagination = document.querySelector('.pagination');
+        var sentinel = document.createElement('div');
+        grid.parentNode.insertBefore(sentinel, grid.nextSibling);
+        var loading = false;
+
+        var observer = new IntersectionObserver(function (entries) {
+            if (!entries[0].isIntersecting || loading || !next) {
+                return;
+            }
+            loading = true;
+            fetch(next)
+                .then(function (response) {
+                    if (!response.ok) {
+                        throw new Error(response.status);
+                    }
+                    return response.json();
+                })
+                .then(function (page) {
+                    page.members.forEach(function (member) {
+                        grid.appendChild(memberCard(root, member));
+                    });
+                    next = page.next_json ? root + page.next_json : null;
+                    if (pagination) {
+                        // The page links would now skip the cards loaded so far
+                        pagination.style.display = 'none';
+                    }
+                    if (!next) {
+                        observer.disconnect();
+                    }
+                    loading = false;
+                })
+                .catch(function () {
+                    // Leave the page links for the reader to follow
+                    observer.disconnect();
+                });
+        }, {rootMargin: '600px'});
+        observer.observe(sentinel);
+    });
+})();
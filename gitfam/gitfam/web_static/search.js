@@ -0,0 +1,143 @@
+/* GitFam member search.
+ *
+ * Reads the sharded index written by gitfam/search_index.py: only the term
+ * shards for the words typed and the doc shards of the top results are
+ * downloaded. tokenize() and shardName() must match the Python side.
+ */
+(function () {
+    'use strict';
+
+    var STOPWORDS = new Set([
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'had', 'has', 'have', 'he',
+        'her', 'his', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'she', 'that', 'the', 'their', 'they',
+        'this', 'to', 'was', 'we', 'were', 'with'
+    ]);
+    var MAX_RESULTS = 50;
+    var script = document.currentScript;
+    var base = (script && script.dataset.base) || '';
+    var requests = {};
+
+    function tokenize(text) {
+        return text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '')
+            .split(/[^\p{L}\p{N}]+/u)
+            .filter(function (token) { return Array.from(token).length > 1 && !STOPWORDS.has(token); });
+    }
+
+    function shardName(token) {
+        var prefix = Array.from(token).slice(0, 2).join('');
+        if (/^[a-z0-9]+$/.test(prefix)) {
+            return prefix;
+        }
+        return 'u' + Array.from(prefix).map(function (char) { return char.codePointAt(0).toString(16); }).join('-');
+    }
+
+    function fetchJSON(path) {
+        if (!requests[path]) {
+            requests[path] = fetch(base + path)
+                .then(function (response) { return response.ok ? response.json() : {}; })
+                .catch(function () { return {}; });
+        }
+        return requests[path];
+    }
+
+    async function scoreToken(token) {
+        var shard = await fetchJSON('search/terms/' + shardName(token) + '.json');
+        var scores = new Map();
+        Object.keys(shard).forEach(function (term) {
+            if (!term.startsWith(token)) {
+                return;
+            }
+            var boost = term === token ? 2 : 1;
+            shard[term].forEach(function (posting) {
+                scores.set(posting[0], (scores.get(posting[0]) || 0) + posting[1] * boost);
+            });
+        });
+        return scores;
+    }
+
+    async function search(query) {
+        var tokens = tokenize(query);
+        if (!tokens.length) {
+            return [];
+        }
+
+        var meta = await fetchJSON('search/meta.json');
+        var perToken = await Promise.all(tokens.map(scoreToken));
+        var scores = perToken.reduce(function (combined, tokenScores) {
+            var next = new Map();
+            combined.forEach(function (score, id) {
+                if (tokenScores.has(id)) {
+                    next.set(id, score + tokenScores.get(id));
+                }
+            });
+            return next;
+        });
+
+        var top = Array.from(scores).sort(function (a, b) { return b[1] - a[1] || a[0] - b[0]; }).slice(0, MAX_RESULTS);
+        var shardSize = meta.doc_shard_size || 500;
+        var docs = await Promise.all(top.map(function (entry) {
+            return fetchJSON('search/docs/' + Math.floor(entry[0] / shardSize) + '.json');
+        }));
+        return top.map(function (entry, i) { return docs[i][entry[0]]; }).filter(Boolean);
+    }
+
+    function renderResults(container, results, query) {
+        container.textContent = '';
+        if (!query.trim()) {
+            return;
+        }
+        if (!results.length) {
+            var empty = document.createElement('p');
+            empty.className = 'member-info';
+            empty.textContent = 'No family members match "' + query + '".';
+            container.appendChild(empty);
+            return;
+        }
+        results.forEach(function (doc) {
+            var card = document.createElement('a');
+            card.className = 'member-card';
+            card.href = base + (doc[5] || 'members/' + doc[0] + '.html');
+            var name = document.createElement('div');
+            name.className = 'member-name';
+            name.textContent = doc[1];
+            var info = document.createElement('div');
+            info.className = 'member-info';
+            info.textContent = [doc[3] ? 'Born ' + doc[3] : '', doc[4], doc[2].replace(/-/g, ' ')]
+                .filter(Boolean).join(' · ');
+            card.appendChild(name);
+            card.appendChild(info);
+            container.appendChild(card);
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var input = document.getElementById('search-input');
+        var container = document.getElementById('search-results');
+        if (!input || !container) {
+            return;
+        }
+
+        var latest = 0;
+        var timer = null;
+        function run() {
+            var query = input.value;
+            var ticket = ++latest;
+            search(query).then(function (results) {
+                if (ticket === latest) {
+                    renderResults(container, results, query);
+                }
+            });
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(run, 150);
+        });
+
+        var initial = new URLSearchParams(window.location.search).get('q');
+        if (initial) {
+            input.value = initial;
+            run();
+        }
+    });
+})();
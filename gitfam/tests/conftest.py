@@ -0,0 +1,22 @@
+"""Shared fixtures: small archives written to a temporary project directory."""
+
+import pytest
+import yaml
+
+
+def write_member(root, branch, slug, body='', **frontmatter):
+    """Write ``families/<branch>/members/<slug>/profile.md`` and return the member folder."""
+    member = root / 'families' / branch / 'members' / slug
+    member.mkdir(parents=True, exist_ok=True)
+    frontmatter.setdefault('name', slug.replace('-', ' ').title())
+    text = '---\n' + yaml.safe_dump(frontmatter, sort_keys=False) + '---\n\n' + body
+    (member / 'profile.md').write_text(text, encoding='utf-8')
+    return member
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """An empty project directory, made the working directory."""
+    (tmp_path / 'families').mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
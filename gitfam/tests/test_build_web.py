@@ -0,0 +1,101 @@
+"""Incremental website builds: page keys, re-rendering, stale page removal and videos."""
+
+from pathlib import Path
+
+from gitfam.build_manifest import hash_input, page_key, remove_stale_pages
+from gitfam.commands.build_web import generate_static_site
+
+from conftest import write_member
+
+
+def build(**options):
+    return generate_static_site(Path('web'), **options)
+
+
+def test_page_key_depends_on_every_part():
+    assert page_key('a', {'x': 1}) == page_key('a', {'x': 1})
+    assert page_key('a', {'x': 1}) != page_key('a', {'x': 2})
+    assert page_key('a', 'b') != page_key('b', 'a')
+
+
+def test_hash_input_reuses_fingerprint_of_unchanged_file(tmp_path):
+    path = tmp_path / 'profile.md'
+    path.write_text('one', encoding='utf-8')
+    first = hash_input(path)
+    assert hash_input(path, first) is first
+
+    path.write_text('three', encoding='utf-8')
+    assert hash_input(path, first)['sha256'] != first['sha256']
+
+
+def test_remove_stale_pages_deletes_pages_and_empty_directories(tmp_path):
+    (tmp_path / 'members' / 'ab').mkdir(parents=True)
+    (tmp_path / 'members' / 'ab' / 'ab-old.html').write_text('old', encoding='utf-8')
+    (tmp_path / 'index.html').write_text('index', encoding='utf-8')
+
+    removed = remove_stale_pages(tmp_path, ['index.html', 'members/ab/ab-old.html'], ['index.html'])
+
+    assert removed == 1
+    assert not (tmp_path / 'members' / 'ab').exists()
+    assert (tmp_path / 'index.html').exists()
+
+
+def test_unchanged_archive_renders_nothing(project):
+    write_member(project, 'smith', 'john-smith-1900', birth_date=1900)
+    assert build()['rendered']
+    assert build()['rendered'] == []
+
+
+def test_profile_edit_renders_only_affected_pages(project):
+    write_member(project, 'smith', 'john-smith-1900', birth_date=1900)
+    write_member(project, 'smith', 'mary-smith-1902', birth_date=1902)
+    build()
+
+    write_member(project, 'smith', 'john-smith-1900', body='Worked on the railways.', birth_date=1900)
+    assert build()['rendered'] == ['members/john-smith-1900.html']
+    assert 'railways' in (project / 'web' / 'members' / 'john-smith-1900.html').read_text(encoding='utf-8')
+
+
+def test_incremental_build_removes_pages_of_removed_members(project):
+    write_member(project, 'smith', 'john-smith-1900')
+    member = write_member(project, 'smith', 'mary-smith-1902')
+    build()
+
+    (member / 'profile.md').unlink()
+    member.rmdir()
+    build()
+
+    assert not (project / 'web' / 'members' / 'mary-smith-1902.html').exists()
+
+
+def test_full_build_removes_pages_of_removed_members(project):
+    write_member(project, 'smith', 'john-smith-1900')
+    member = write_member(project, 'smith', 'mary-smith-1902')
+    build()
+
+    (member / 'profile.md').unlink()
+    member.rmdir()
+    result = build(full=True)
+
+    assert 'members/john-smith-1900.html' in result['rendered']
+    assert not (project / 'web' / 'members' / 'mary-smith-1902.html').exists()
+
+
+def test_videos_are_only_published_on_request(project):
+    member = write_member(project, 'smith', 'john-smith-1900')
+    (member / 'interviews' / 'videos').mkdir(parents=True)
+    (member / 'interviews' / 'videos' / 'childhood.mp4').write_bytes(b'video')
+    page = project / 'web' / 'members' / 'john-smith-1900.html'
+    published = project / 'web' / 'videos' / 'john-smith-1900' / 'childhood.mp4'
+
+    build()
+    assert not (project / 'web' / 'videos').exists()
+    assert '<video' not in page.read_text(encoding='utf-8')
+
+    assert 'members/john-smith-1900.html' in build(videos=True)['rendered']
+    assert published.read_bytes() == b'video'
+    assert 'videos/john-smith-1900/childhood.mp4' in page.read_text(encoding='utf-8')
+
+    assert 'members/john-smith-1900.html' in build()['rendered']
+    assert not published.parent.exists()
+    assert '<video' not in page.read_text(encoding='utf-8')
@@ -0,0 +1,119 @@
+"""Content-defined chunking and the pack/unpack round trip of the media store."""
+
+import io
+import random
+
+import pytest
+
+from gitfam import chunk_store
+from gitfam.chunk_store import ChunkStore, pack_file, pointer_path_for, read_pointer, unpack_file
+
+
+def random_bytes(size, seed=0):
+    return random.Random(seed).randbytes(size)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Boundaries every few hundred bytes instead of every megabyte, so tests stay fast."""
+    monkeypatch.setattr(chunk_store, '_BOUNDARY_SHIFT', 64 - 8)
+    monkeypatch.setattr(chunk_store, 'MIN_CHUNK_SIZE', 64)
+    monkeypatch.setattr(chunk_store, 'MAX_CHUNK_SIZE', 1024)
+
+
+def candidates_by_block(find, data, block_size):
+    state = {'hash': 0}
+    history = b''
+    found = []
+    for start in range(0, len(data), block_size):
+        block = data[start:start + block_size]
+        found += [start + offset for offset in find(block, history, state)]
+        history = (history + block)[-chunk_store.WINDOW_SIZE:]
+    return found
+
+
+def test_numpy_and_python_find_the_same_boundaries(small_chunks):
+    pytest.importorskip('numpy')
+    data = random_bytes(50_000)
+    expected = candidates_by_block(chunk_store._boundary_candidates_python, data, 50_000)
+    assert expected
+    for block_size in (50_000, 4096, 100, 10):
+        assert candidates_by_block(chunk_store._boundary_candidates_numpy, data, block_size) == expected
+        assert candidates_by_block(chunk_store._boundary_candidates_python, data, block_size) == expected
+
+
+def test_chunks_rebuild_the_stream_within_size_limits(small_chunks):
+    data = random_bytes(40_000) + bytes(5000)
+    chunks = list(chunk_store.iter_chunks(io.BytesIO(data), read_size=777))
+
+    assert b''.join(chunks) == data
+    assert all(len(chunk) <= chunk_store.MAX_CHUNK_SIZE for chunk in chunks)
+    assert all(len(chunk) >= chunk_store.MIN_CHUNK_SIZE for chunk in chunks[:-1])
+
+
+def test_chunks_do_not_depend_on_read_size_or_implementation(small_chunks, monkeypatch):
+    data = random_bytes(30_000)
+    expected = list(chunk_store.iter_chunks(io.BytesIO(data), read_size=len(data)))
+    assert list(chunk_store.iter_chunks(io.BytesIO(data), read_size=333)) == expected
+
+    monkeypatch.setattr(chunk_store, 'boundary_candidates', chunk_store._boundary_candidates_python)
+    assert list(chunk_store.iter_chunks(io.BytesIO(data), read_size=1000)) == expected
+
+
+def test_inserted_bytes_only_change_nearby_chunks(small_chunks):
+    data = random_bytes(30_000)
+    original = set(chunk_store.iter_chunks(io.BytesIO(data)))
+    edited = list(chunk_store.iter_chunks(io.BytesIO(b'new intro' + data)))
+
+    shared = sum(len(chunk) for chunk in edited if chunk in original)
+    assert shared > len(data) * 0.9
+
+
+def test_pack_and_unpack_round_trip(small_chunks, tmp_path):
+    store = ChunkStore(tmp_path / 'media-store')
+    video = tmp_path / 'interview.mp4'
+    data = random_bytes(20_000)
+    video.write_bytes(data)
+
+    packed = pack_file(store, video)
+    pointer_path = pointer_path_for(video)
+    assert not video.exists()
+    assert packed['size'] == len(data) and packed['new_bytes'] == len(data)
+    assert read_pointer(pointer_path)['name'] == 'interview.mp4'
+
+    unpacked = unpack_file(store, pointer_path)
+    assert video.read_bytes() == data
+    assert unpacked['size'] == len(data)
+    assert not pointer_path.exists()
+
+
+def test_packing_a_copy_stores_no_new_bytes(small_chunks, tmp_path):
+    store = ChunkStore(tmp_path / 'media-store')
+    data = random_bytes(20_000)
+    for name in ('a.mp4', 'b.mp4'):
+        (tmp_path / name).write_bytes(data)
+
+    pack_file(store, tmp_path / 'a.mp4')
+    assert pack_file(store, tmp_path / 'b.mp4')['new_bytes'] == 0
+
+
+def test_unpack_refuses_a_corrupted_chunk(small_chunks, tmp_path):
+    store = ChunkStore(tmp_path / 'media-store')
+    video = tmp_path / 'interview.mp4'
+    video.write_bytes(random_bytes(5000))
+    pack_file(store, video)
+    pointer_path = pointer_path_for(video)
+
+    chunk_id = read_pointer(pointer_path)['chunks'][0][0]
+    store.chunk_path(chunk_id).write_bytes(b'damaged')
+
+    with pytest.raises(ValueError, match='corrupted'):
+        unpack_file(store, pointer_path)
+    assert pointer_path.exists()
+    assert not video.exists()
+
+
+def test_read_pointer_ignores_other_files(tmp_path):
+    path = tmp_path / 'notes.gitfam-media'
+    path.write_text('just some text\n', encoding='utf-8')
+    assert read_pointer(path) is None
@@ -0,0 +1,104 @@
+"""Relationship graph: inverse edges, lineage walks, generations and the tree command."""
+
+from rich.tree import Tree
+
+from gitfam.commands.family_tree import _add_lineage
+from gitfam.family_graph import FamilyGraph
+from gitfam.family_index import load_family_index
+
+from conftest import write_member
+
+
+def chain_graph(length):
+    """``m0`` is the parent of ``m1``, which is the parent of ``m2``, and so on."""
+    graph = FamilyGraph()
+    for number in range(length):
+        graph.add_member(f'm{number}', f'Member {number}', 'line')
+    for number in range(1, length):
+        graph.add_relationship(f'm{number}', 'child_of', f'm{number - 1}')
+    return graph
+
+
+def test_relationships_are_stored_in_both_directions():
+    graph = FamilyGraph()
+    for slug in ('john', 'mary', 'anna'):
+        graph.add_member(slug, slug.title(), 'smith')
+    graph.add_relationship('anna', 'child_of', 'John')
+    graph.add_relationship('john', 'spouse_of', 'mary')
+
+    assert graph.parents('anna') == ['john']
+    assert graph.children('john') == ['anna']
+    assert graph.edges['mary']['spouse_of'] == ['john']
+
+
+def test_unknown_people_are_kept_as_unresolved():
+    graph = FamilyGraph()
+    graph.add_member('anna', 'Anna', 'smith')
+    graph.add_relationship('anna', 'child_of', 'Someone Else')
+
+    assert graph.parents('anna') == []
+    assert graph.relatives('anna') == [{'type': 'child_of', 'slug': None, 'name': 'Someone Else', 'branch': None}]
+
+
+def test_walks_respect_depth():
+    graph = chain_graph(5)
+    assert graph.ancestors('m4') == [('m3', 1), ('m2', 2), ('m1', 3), ('m0', 4)]
+    assert graph.descendants('m0', max_depth=2) == [('m1', 1), ('m2', 2)]
+
+
+def test_generations_follow_the_deepest_parent():
+    graph = chain_graph(3)
+    graph.add_member('x', 'X', 'other')
+    graph.add_relationship('x', 'child_of', 'm0')
+    graph.add_relationship('x', 'child_of', 'm2')
+
+    assert graph.generations() == {'m0': 0, 'm1': 1, 'm2': 2, 'x': 3}
+
+
+def test_cycles_and_their_descendants_have_no_generation():
+    graph = chain_graph(2)
+    graph.add_member('child', 'Child', 'line')
+    graph.add_relationship('m0', 'child_of', 'm1')
+    graph.add_relationship('child', 'child_of', 'm1')
+
+    assert graph.generations() == {'m0': None, 'm1': None, 'child': None}
+
+
+def test_duplicate_slug_keeps_the_first_members_relationships(project):
+    write_member(project, 'a-branch', 'john', name='John')
+    write_member(project, 'a-branch', 'parent', name='Parent')
+    write_member(project, 'b-branch', 'john', name='Other John', relationships=[{'type': 'child_of', 'person': 'parent'}])
+
+    graph = FamilyGraph.from_index(load_family_index(project / 'families'))
+
+    assert graph.members['john']['branch'] == 'a-branch'
+    assert graph.duplicates == ['john']
+    assert graph.parents('john') == []
+
+
+def test_tree_of_a_lineage_deeper_than_the_recursion_limit():
+    graph = chain_graph(3000)
+    root = Tree('root')
+    _add_lineage(graph, root, 'm0', graph.children, None, {'m0'})
+
+    depth = 0
+    node = root
+    while node.children:
+        node = node.children[0]
+        depth += 1
+    assert depth == 2999
+
+
+def test_tree_stops_at_depth_and_marks_repeated_members():
+    graph = chain_graph(4)
+    graph.add_member('x', 'X', 'line')
+    graph.add_relationship('x', 'child_of', 'm0')
+    graph.add_relationship('m1', 'child_of', 'x')
+    root = Tree('root')
+    _add_lineage(graph, root, 'm0', graph.children, 2, {'m0'})
+
+    first, second = root.children
+    assert 'shown above' not in str(first.label)
+    assert [len(first.children), len(second.children)] == [1, 1]
+    assert 'shown above' in str(second.children[0].label)
+    assert first.children[0].children == []
@@ -0,0 +1,111 @@
+"""GEDCOM and CSV import into member profiles, and GEDCOM export read back in."""
+
+from pathlib import Path
+
+from gitfam.commands.export import export_archive
+from gitfam.commands.import_members import import_members
+from gitfam.frontmatter import read_frontmatter
+from gitfam.genealogy import iter_gedcom_records, read_gedcom
+
+GEDCOM = """0 HEAD
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME John /Smith/
+1 SEX M
+1 BIRT
+2 DATE 12 MAR 1901
+2 PLAC Columbus, Ohio
+1 DEAT
+2 DATE 1970
+2 PLAC Dayton, Ohio
+0 @I2@ INDI
+1 NAME Mary /Jones/
+1 SEX F
+1 BIRT
+2 DATE 1903
+0 @I3@ INDI
+1 NAME Anna /Smith/
+1 BIRT
+2 DATE 4 JUL 1930
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 MARR
+2 DATE 1928
+0 TRLR
+"""
+
+
+def imported_profiles(project, source, text):
+    (project / 'families' / 'smith').mkdir()
+    (project / source).write_text(text, encoding='utf-8')
+    assert import_members(Path(source), 'smith')
+    members = project / 'families' / 'smith' / 'members'
+    return {path.name: read_frontmatter(path / 'profile.md') for path in sorted(members.iterdir())}
+
+
+def test_gedcom_import_writes_profiles(project):
+    profiles = imported_profiles(project, 'family.ged', GEDCOM)
+
+    assert sorted(profiles) == ['anna-smith-1930', 'john-smith-1901', 'mary-jones-1903']
+    john = profiles['john-smith-1901']
+    assert john['name'] == 'John Smith'
+    assert str(john['birth_date']) == '1901-03-12'
+    assert john['birth_place'] == 'Columbus, Ohio'
+    assert {'type': 'spouse_of', 'person': 'mary-jones-1903'} in john['relationships']
+    assert {'type': 'parent_of', 'person': 'anna-smith-1930'} in john['relationships']
+
+
+def test_import_keeps_sex_when_the_source_has_it(project):
+    profiles = imported_profiles(project, 'family.ged', GEDCOM)
+
+    assert profiles['john-smith-1901']['sex'] == 'M'
+    assert profiles['mary-jones-1903']['sex'] == 'F'
+    assert 'sex' not in profiles['anna-smith-1930']
+
+
+def test_csv_import_keeps_sex(project):
+    profiles = imported_profiles(project, 'relatives.csv', (
+        "id,given_name,surname,gender,birth_date,father\n"
+        "1,Otto,Berg,male,1880,\n"
+        "2,Ilse,Berg,Female,1910,1\n"
+        "3,Kim,Berg,,1940,2\n"
+    ))
+
+    assert profiles['otto-berg-1880']['sex'] == 'M'
+    assert profiles['ilse-berg-1910']['sex'] == 'F'
+    assert 'sex' not in profiles['kim-berg-1940']
+
+    # mary-jones sorts before walter-smith, so the wife is the first partner by slug
+def test_exported_gedcom_reads_back(project):
+    # Walter sorts after Alice, so the wife is the first partner by slug
+    imported_profiles(project, 'family.ged', GEDCOM.replace('John /Smith/', 'Walter /Smith/'))
+    assert export_archive(output='export.ged')
+
+    with open(project / 'export.ged', encoding='utf-8') as stream:
+        records = list(iter_gedcom_records(stream))
+    header = records[0]
+    assert header['tag'] == 'HEAD'
+    gedc = next(node for node in header['children'] if node['tag'] == 'GEDC')
+    assert [(node['tag'], node['value']) for node in gedc['children']] == [
+        ('VERS', '5.5.1'), ('FORM', 'LINEAGE-LINKED')]
+
+    with open(project / 'export.ged', encoding='utf-8') as stream:
+        people, family_count, warnings = read_gedcom(stream)
+    assert family_count == 1 and warnings == []
+    by_name = {person['name']: person for person in people.values()}
+    assert sorted(by_name) == ['Anna Smith', 'Mary Jones', 'Walter Smith']
+
+    walter, mary, anna = by_name['Walter Smith'], by_name['Mary Jones'], by_name['Anna Smith']
+    assert (walter['sex'], mary['sex'], anna['sex']) == ('M', 'F', '')
+    assert walter['birth_date'] == '1901-03-12'
+    assert walter['birth_place'] == 'Columbus, Ohio'
+    assert anna['birth_date'] == '1930-07-04'
+    assert {'date': '1970', 'event': 'Died in Dayton, Ohio'} in walter['events']
+    assert walter['spouses'] == [mary['id']]
+    assert sorted(anna['parents']) == sorted([walter['id'], mary['id']])
+
+    family = next(record for record in records if record['tag'] == 'FAM')
+    roles = {node['tag']: people[node['value']]['name'] for node in family['children']}
+    assert roles == {'HUSB': 'Walter Smith', 'WIFE': 'Mary Jones', 'CHIL': 'Anna Smith'}
@@ -0,0 +1,75 @@
+"""SQLite metadata export: reusing, upgrading and refusing existing files."""
+
+import sqlite3
+
+import pytest
+
+from gitfam.metadata_db import SCHEMA_VERSION, open_database, write_database
+
+
+def branch(name, members=()):
+    return {
+        'branch_name': name,
+        'statistics': {'total_members': len(members), 'total_interviews': 0, 'members_with_photos': 0,
+                       'members_with_videos': 0, 'birth_year_range': {'earliest': 1900, 'latest': 1900}},
+        'members': [{'slug': slug, 'name': slug.title(), 'birth_date': '1900', 'birth_place': 'Ohio',
+                     'current_residence': None, 'has_photos': False, 'has_videos': False, 'interviews': [],
+                     'relationships': [], 'major_events': []} for slug in members]
+    }
+
+
+def test_only_changed_branches_are_written(tmp_path):
+    path = tmp_path / 'family.db'
+    assert write_database(path, [branch('smith', ['john']), branch('jones')], 'now')['written'] == 2
+
+    counts = write_database(path, [branch('smith', ['john', 'mary'])], 'now')
+    assert counts == {'written': 1, 'unchanged': 0, 'removed': 1}
+    conn = sqlite3.connect(str(path))
+    assert conn.execute('SELECT slug FROM members ORDER BY slug').fetchall() == [('john',), ('mary',)]
+
+
+def test_other_files_are_left_alone(tmp_path):
+    path = tmp_path / 'family.ged'
+    path.write_text('0 HEAD\n0 TRLR\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='not an SQLite database'):
+        open_database(path)
+    assert path.read_text(encoding='utf-8') == '0 HEAD\n0 TRLR\n'
+
+
+def test_unrelated_sqlite_databases_are_left_alone(tmp_path):
+    path = tmp_path / 'other.db'
+    conn = sqlite3.connect(str(path))
+    with conn:
+        conn.execute('CREATE TABLE notes (text TEXT)')
+        conn.execute("INSERT INTO notes VALUES ('keep me')")
+    conn.close()
+
+    with pytest.raises(ValueError, match='not a gitfam metadata database'):
+        open_database(path)
+    assert sqlite3.connect(str(path)).execute('SELECT text FROM notes').fetchall() == [('keep me',)]
+
+
+def test_newer_exports_are_left_alone(tmp_path):
+    path = tmp_path / 'family.db'
+    conn = sqlite3.connect(str(path))
+    with conn:
+        conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+        conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION + 1),))
+    conn.close()
+
+    with pytest.raises(ValueError):
+        open_database(path)
+
+
+def test_older_exports_are_recreated(tmp_path):
+    path = tmp_path / 'family.db'
+    conn = sqlite3.connect(str(path))
+    with conn:
+        conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+        conn.execute("INSERT INTO meta VALUES ('schema_version', '0')")
+        conn.execute('CREATE TABLE old_members (slug TEXT)')
+    conn.close()
+
+    conn = open_database(path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert 'old_members' not in tables and 'members' in tables
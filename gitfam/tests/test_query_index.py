@@ -0,0 +1,122 @@
+"""Query filters: range and term parsing, per-branch matching and the persisted index."""
+
+import pytest
+
+from gitfam.family_index import load_family_index
+from gitfam.query_index import QueryIndex, build_branch_index, match_branch, parse_query, parse_range
+
+from conftest import write_member
+
+
+@pytest.mark.parametrize('text, bounds', [
+    ('1900', (1900, 1900)),
+    ('1880..1920', (1880, 1920)),
+    ('..1850', (None, 1850)),
+    ('1900..', (1900, None)),
+    ('<1900', (None, 1899)),
+    ('<=1900', (None, 1900)),
+    ('>2', (3, None)),
+    ('>=2', (2, None)),
+    ('-50..-10', (-50, -10))
+])
+def test_parse_range(text, bounds):
+    assert parse_range(text) == bounds
+
+
+@pytest.mark.parametrize('text', ['..', 'abc', '19x0', '=>2', '1..2..3', ''])
+def test_parse_range_rejects_other_text(text):
+    with pytest.raises(ValueError):
+        parse_range(text)
+
+
+def test_parse_query():
+    filters = parse_query(['born:1880..1920', 'Place:Ohio', 'branch:Smith-Ohio', 'has:Videos',
+                           'interviews:>=2', 'rel:Spouse_Of'])
+
+    assert filters == [
+        ('born', (1880, 1920)),
+        ('place', 'ohio'),
+        ('branch', 'Smith-Ohio'),
+        ('has', 'videos'),
+        ('interviews', (2, None)),
+        ('rel', 'spouse_of')
+    ]
+
+
+@pytest.mark.parametrize('term', ['born', 'born:', 'age:40', 'has:audio', 'born:soon'])
+def test_parse_query_rejects_bad_terms(term):
+    with pytest.raises(ValueError):
+        parse_query([term])
+
+
+def record(slug, has_photos=False, has_videos=False, error=None, **frontmatter):
+    return {'slug': slug, 'frontmatter': frontmatter, 'has_photos': has_photos,
+            'has_videos': has_videos, 'error': error}
+
+
+@pytest.fixture
+def branch_index():
+    members = [
+        record('anna', birth_date='1885-03-02', birth_place='Columbus, Ohio',
+               interviews=[{'date': '2019-01-01'}, {'date': '2020-01-01'}],
+               relationships=[{'type': 'spouse_of', 'person': 'Carl'}], has_videos=True),
+        record('bert', birth_date='1921', birth_place='Dayton, Ohio', has_photos=True),
+        record('carl', birth_date='about 1880', birth_place='Bremen',
+               relationships=[{'type': 'spouse_of', 'person': 'Anna'}, {'type': 'Child_Of', 'person': 'Otto'}]),
+        record('dora', interviews=[{'date': '2021-05-05'}]),
+        record('emil', error='unreadable profile')
+    ]
+    return build_branch_index({'name': 'smith', 'members': {member['slug']: member for member in members}})
+
+
+def matching_slugs(branch_index, *terms):
+    members = branch_index['members']
+    return [members[member_id]['slug'] for member_id in match_branch(branch_index, parse_query(list(terms)))]
+
+
+def test_unreadable_profiles_are_left_out(branch_index):
+    assert [member['slug'] for member in branch_index['members']] == ['anna', 'bert', 'carl', 'dora']
+
+
+def test_match_branch_with_one_filter(branch_index):
+    assert matching_slugs(branch_index) == ['anna', 'bert', 'carl', 'dora']
+    # Only dates starting with a year have one to match
+    assert matching_slugs(branch_index, 'born:1880..1900') == ['anna']
+    assert matching_slugs(branch_index, 'born:>1900') == ['bert']
+    assert matching_slugs(branch_index, 'place:ohio') == ['anna', 'bert']
+    assert matching_slugs(branch_index, 'interviews:0') == ['bert', 'carl']
+    assert matching_slugs(branch_index, 'interviews:>=1') == ['anna', 'dora']
+    assert matching_slugs(branch_index, 'rel:child_of') == ['carl']
+    assert matching_slugs(branch_index, 'has:photos') == ['bert']
+
+
+def test_match_branch_intersects_filters(branch_index):
+    assert matching_slugs(branch_index, 'rel:spouse_of', 'place:ohio') == ['anna']
+    assert matching_slugs(branch_index, 'born:..1950', 'has:videos', 'interviews:2') == ['anna']
+    assert matching_slugs(branch_index, 'place:ohio', 'born:<1850') == []
+    assert matching_slugs(branch_index, 'rel:parent_of') == []
+
+
+def test_search_filters_branches_and_rebuilds_only_changed_ones(project):
+    write_member(project, 'smith', 'anna', birth_date='1885', birth_place='Ohio')
+    write_member(project, 'smith', 'bert', birth_date='1921', birth_place='Ohio')
+    write_member(project, 'jones', 'cora', birth_date='1890', birth_place='Ohio')
+    families = project / 'families'
+
+    query_index = QueryIndex(families).refresh(load_family_index(families))
+    assert query_index.rebuilt == 2
+
+    def search(*terms):
+        return [(member['branch'], member['slug']) for member in query_index.search(parse_query(list(terms)))]
+
+    assert search('born:..1900') == [('jones', 'cora'), ('smith', 'anna')]
+    assert search('born:..1900', 'branch:smith') == [('smith', 'anna')]
+    assert search('branch:nobody') == []
+
+    write_member(project, 'smith', 'bert', birth_date='1899-05-01', birth_place='Ohio')
+    query_index = QueryIndex(families).refresh(load_family_index(families))
+    assert query_index.rebuilt == 1
+    assert search('born:..1900') == [('jones', 'cora'), ('smith', 'anna'), ('smith', 'bert')]
+
+    query_index = QueryIndex(families).refresh(load_family_index(families))
+    assert query_index.rebuilt == 0
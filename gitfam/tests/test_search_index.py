@@ -0,0 +1,148 @@
+"""Search index: terms, shard layout and incremental, per-shard updates."""
+
+import json
+
+import pytest
+
+from gitfam import search_index
+from gitfam.search_index import SearchIndex, member_terms, shard_name, tokenize
+
+
+def member(slug, name, body='', branch='smith', **fields):
+    return {'slug': slug, 'name': name, 'branch': branch, 'body': body, 'url': f'members/{slug}.html', **fields}
+
+
+def add(index, branch, members):
+    index.add_branch(branch, members, lambda m: f"{m['name']}|{m['body']}", lambda m: m['body'])
+
+
+def read_index(output_path):
+    """``{term: [slug, ...]}`` and the meta file of a written index."""
+    search_dir = output_path / 'search'
+    docs = {}
+    for path in (search_dir / 'docs').glob('*.json'):
+        docs.update(json.loads(path.read_text(encoding='utf-8')))
+    terms = {}
+    for path in (search_dir / 'terms').glob('*.json'):
+        for term, postings in json.loads(path.read_text(encoding='utf-8')).items():
+            terms[term] = [docs[str(doc_id)][0] for doc_id, _ in postings]
+    return terms, json.loads((search_dir / 'meta.json').read_text(encoding='utf-8'))
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / 'cache', tmp_path / 'web'
+
+
+def test_tokenize_folds_case_and_accents_and_drops_stopwords():
+    assert tokenize('The Müller family of São Paulo') == ['muller', 'family', 'sao', 'paulo']
+
+
+def test_shard_names_are_safe_file_names():
+    assert shard_name('smith') == 'sm'
+    assert shard_name('1900') == '19'
+    assert shard_name('łódź') == 'u142-f3'
+
+
+def test_name_outweighs_profile_text():
+    terms = member_terms({'name': 'Anna Smith', 'birth_date': '1900-01-02'}, 'anna ' * 10)
+    assert terms == {'anna': search_index.MAX_TEXT_WEIGHT + 20, 'smith': 20, '1900': 8}
+
+
+def test_postings_are_ordered_by_weight(paths):
+    cache_dir, output_path = paths
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('mary', 'Mary', 'railway'), member('john', 'John Railway')])
+    index.write(output_path)
+
+    terms, meta = read_index(output_path)
+    assert terms['railway'] == ['john', 'mary']
+    assert meta['members'] == 2
+
+
+def test_unchanged_build_writes_nothing(paths):
+    cache_dir, output_path = paths
+    for expected in (True, False):
+        index = SearchIndex(cache_dir)
+        add(index, 'smith', [member('john', 'John Smith', 'farmer')])
+        assert bool(index.write(output_path)) == expected
+        assert index.updated == (1 if expected else 0)
+
+
+def test_edit_rewrites_only_touched_shards(paths):
+    cache_dir, output_path = paths
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('john', 'John Smith', 'farmer'), member('mary', 'Mary Smith', 'teacher')])
+    index.write(output_path)
+    teacher = output_path / 'search' / 'terms' / 'te.json'
+    before = teacher.stat().st_mtime_ns
+
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('john', 'John Smith', 'blacksmith'), member('mary', 'Mary Smith', 'teacher')])
+    index.write(output_path)
+
+    terms, _ = read_index(output_path)
+    assert 'farmer' not in terms
+    assert terms['blacksmith'] == ['john']
+    assert teacher.stat().st_mtime_ns == before
+    assert not (output_path / 'search' / 'terms' / 'fa.json').exists()
+
+
+def test_removed_members_and_branches_leave_the_index(paths):
+    cache_dir, output_path = paths
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('john', 'John Smith'), member('mary', 'Mary Smith')])
+    add(index, 'jones', [member('ann', 'Ann Jones', branch='jones')])
+    index.write(output_path)
+
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('john', 'John Smith')])
+    index.write(output_path)
+
+    terms, meta = read_index(output_path)
+    assert terms['smith'] == ['john']
+    assert 'jones' not in terms and 'mary' not in terms
+    assert meta['members'] == 1
+
+
+def test_deleted_output_is_written_again_in_full(paths):
+    cache_dir, output_path = paths
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('john', 'John Smith', 'farmer')])
+    index.write(output_path)
+    expected = read_index(output_path)[0]
+
+    (output_path / 'search' / 'terms' / 'fa.json').unlink()
+    (output_path / 'search' / 'meta.json').unlink()
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('john', 'John Smith', 'farmer')])
+    index.write(output_path)
+
+    assert read_index(output_path)[0] == expected
+
+
+def test_low_memory_flushes_give_the_same_index(paths, tmp_path, monkeypatch):
+    cache_dir, output_path = paths
+    members = [member(f'm{number}', f'Member {number}', f'word{number} shared') for number in range(50)]
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', members)
+    index.write(output_path)
+
+    monkeypatch.setattr(search_index, 'FLUSH_POSTINGS', 5)
+    index = SearchIndex(tmp_path / 'low-memory-cache', low_memory=True)
+    for start in range(0, 50, 10):
+        add(index, f'branch-{start}', members[start:start + 10])
+    index.write(tmp_path / 'low-memory-web')
+
+    assert read_index(tmp_path / 'low-memory-web')[0] == read_index(output_path)[0]
+
+
+def test_cache_of_an_interrupted_build_is_discarded(paths):
+    cache_dir, output_path = paths
+    index = SearchIndex(cache_dir)
+    add(index, 'smith', [member('john', 'John Smith')])
+    index._flush()
+
+    index = SearchIndex(cache_dir)
+    assert index.state['members'] == 0
+    assert not (cache_dir / 'branches').exists()
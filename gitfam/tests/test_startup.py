@@ -0,0 +1,62 @@
+"""CLI startup must stay fast and must not import libraries only other commands use."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+# Best of several runs of `gitfam --help`; override on slow machines
+STARTUP_BUDGET_MS = float(os.environ.get('GITFAM_STARTUP_BUDGET_MS', 200))
+
+HEAVY_MODULES = ['jinja2', 'markdown', 'pygments', 'questionary', 'prompt_toolkit', 'numpy', 'PIL', 'yaml']
+
+
+def environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get('PYTHONPATH')]))
+    return env
+
+
+def loaded_heavy_modules(args, cwd):
+    """Heavy modules in ``sys.modules`` after running ``gitfam <args>`` in a fresh interpreter."""
+    code = (
+        "import sys\n"
+        "from gitfam.cli import main\n"
+        f"main({args!r}, standalone_mode=False)\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules), file=sys.stderr)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], env=environment(), cwd=cwd,
+                            capture_output=True, text=True, check=True)
+    return result.stderr.strip().splitlines()[-1].split() if result.stderr.strip() else []
+
+
+@pytest.fixture
+def project(tmp_path):
+    member = tmp_path / 'families' / 'smith' / 'members' / 'john-smith-1900'
+    member.mkdir(parents=True)
+    (member / 'profile.md').write_text('---\nname: John Smith\nbirth_date: 1900\n---\n', encoding='utf-8')
+    return tmp_path
+
+
+def test_help_within_budget(tmp_path):
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'gitfam.cli', '--help'], env=environment(), cwd=tmp_path,
+                       capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    assert best * 1000 <= STARTUP_BUDGET_MS, f"gitfam --help took {best * 1000:.0f} ms"
+
+
+def test_help_imports_nothing_heavy(tmp_path):
+    assert loaded_heavy_modules(['--help'], tmp_path) == []
+
+
+def test_metadata_imports_only_yaml(project):
+    loaded = loaded_heavy_modules(['metadata', '--format', 'json', '-o', '-'], project)
+    assert [name for name in loaded if name != 'yaml'] == []
@@ -0,0 +1,95 @@
+"""Archive verification: statuses of plain files and of recordings packed into the media store."""
+
+import os
+
+import pytest
+
+from gitfam.checksum_manifest import read_checksums
+from gitfam.chunk_store import STORE_DIR, ChunkStore, pack_file, read_pointer
+from gitfam.commands.verify import classify, verify_archive
+
+from conftest import write_member
+
+
+@pytest.fixture
+def member(project):
+    member_path = write_member(project, 'smith', 'john-smith-1900')
+    (member_path / 'photos').mkdir()
+    (member_path / 'photos' / 'portrait.jpg').write_bytes(b'jpeg data')
+    (member_path / 'interviews' / 'videos').mkdir(parents=True)
+    (member_path / 'interviews' / 'videos' / 'talk.mp4').write_bytes(os.urandom(4096))
+    return member_path
+
+
+def pack(project, member_path):
+    store = ChunkStore(project / STORE_DIR)
+    pack_file(store, member_path / 'interviews' / 'videos' / 'talk.mp4')
+    pointer = read_pointer(member_path / 'interviews' / 'videos' / 'talk.mp4.gitfam-media')
+    return store, pointer
+
+
+def test_classify():
+    assert classify(None, 'a', False, False) == 'new'
+    assert classify('a', 'a', True, True) == 'ok'
+    assert classify('a', 'b', True, False) == 'modified'
+    assert classify('a', 'b', True, True) == 'corrupted'
+    assert classify('a', 'b', False, False) == 'corrupted'
+
+
+def test_new_files_are_recorded_and_then_ok(member):
+    assert verify_archive()
+    assert set(read_checksums(member)) == {'profile.md', 'photos/portrait.jpg', 'interviews/videos/talk.mp4'}
+    assert verify_archive()
+
+
+def test_missing_and_silently_changed_files_fail(member):
+    verify_archive()
+    photo = member / 'photos' / 'portrait.jpg'
+    stat = photo.stat()
+    photo.write_bytes(b'jpeg dat4')
+    os.utime(photo, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    # Unchanged size and mtime: only a deep run reads the file again
+    assert verify_archive()
+    assert not verify_archive(deep=True)
+
+    verify_archive(update=True)
+    photo.unlink()
+    assert not verify_archive()
+
+
+def test_packed_recording_stands_in_for_the_original(member, project):
+    verify_archive()
+    recorded = read_checksums(member)['interviews/videos/talk.mp4']
+    _, pointer = pack(project, member)
+
+    assert pointer['sha256'] == recorded
+    assert verify_archive()
+    assert verify_archive(deep=True)
+    assert 'interviews/videos/talk.mp4.gitfam-media' not in read_checksums(member)
+    assert read_checksums(member)['interviews/videos/talk.mp4'] == recorded
+
+
+def test_packed_before_first_verify_records_the_recordings_checksum(member, project):
+    _, pointer = pack(project, member)
+    assert verify_archive()
+    assert read_checksums(member)['interviews/videos/talk.mp4'] == pointer['sha256']
+
+
+def test_damaged_chunk_is_found_with_deep(member, project):
+    verify_archive()
+    store, pointer = pack(project, member)
+    chunk_path = store.chunk_path(pointer['chunks'][0][0])
+    data = bytearray(chunk_path.read_bytes())
+    data[0] ^= 0xff
+    chunk_path.write_bytes(bytes(data))
+
+    assert verify_archive()
+    assert not verify_archive(deep=True)
+
+
+def test_missing_chunk_fails_even_with_update(member, project):
+    store, pointer = pack(project, member)
+    store.chunk_path(pointer['chunks'][0][0]).unlink()
+
+    assert not verify_archive()
+    assert not verify_archive(update=True)